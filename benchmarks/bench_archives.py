@@ -0,0 +1,121 @@
+"""Reading runs straight out of .zip / .tar.gz archives vs. extracted run folders.
+
+Builds one tree of run folders (results.json plus a few log files each) and archives
+every run as .zip and as .tar.gz into two more trees. For each tree it reports the
+disk usage, a cold run-index scan (which locates results.json in every archive), and
+the latency and throughput of reading every run's results.json (text, not parsed)
+through run_archive with the member offsets cached, against opening each archive with
+zipfile/tarfile and searching for the member on every read.
+
+Usage: python -m benchmarks.bench_archives [--runs 100] [--tests 5000] [--extra-files 20]
+"""
+import argparse
+import os
+import shutil
+import tarfile
+import tempfile
+import time
+import zipfile
+
+import run_archive
+from benchmarks.synthetic import make_telemetry_tree
+from results_cache import parse_results_file
+from run_index import RunIndex
+
+LOG_LINE = "2025-03-01 12:00:00 INFO step finished without errors\n"
+
+
+def tree_bytes(root):
+    return sum(entry.stat().st_size if entry.is_file() else tree_bytes(entry.path) for entry in os.scandir(root))
+
+
+def archive_tree(source, target, kind, extra_files):
+    os.makedirs(target)
+    for run in sorted(os.listdir(source)):
+        folder = os.path.join(source, run)
+        if kind == "zip":
+            with zipfile.ZipFile(os.path.join(target, run + ".zip"), "w", zipfile.ZIP_DEFLATED) as zip_file:
+                for name in sorted(os.listdir(folder)):
+                    zip_file.write(os.path.join(folder, name), f"{run}/{name}")
+        else:
+            with tarfile.open(os.path.join(target, run + ".tar.gz"), "w:gz") as tar_file:
+                tar_file.add(folder, arcname=run)
+
+
+def naive_read(path):
+    """The no-cache alternative: open the archive and search for results.json on every read."""
+    if path.endswith(".zip"):
+        with zipfile.ZipFile(path) as zip_file:
+            name = next(name for name in zip_file.namelist() if name.endswith("/results.json"))
+            with zip_file.open(name) as member:
+                return member.read().decode("utf-8")
+    with tarfile.open(path, "r:gz") as tar_file:
+        member = next(info for info in tar_file if info.name.endswith("/results.json"))
+        return tar_file.extractfile(member).read().decode("utf-8")
+
+
+def cached_read(path):
+    with run_archive.open_results(path) as file:
+        return file.read()
+
+
+def read_all(read, paths):
+    latencies = []
+    for path in paths:
+        start = time.perf_counter()
+        records = read(path)
+        latencies.append(time.perf_counter() - start)
+        assert records, path
+    latencies.sort()
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=100)
+    parser.add_argument("--tests", type=int, default=5000, help="tests per run")
+    parser.add_argument("--extra-files", type=int, default=20, help="log files per run folder")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_archives_")
+    try:
+        folders = os.path.join(workdir, "folders")
+        make_telemetry_tree(folders, args.runs, args.tests)
+        for run in os.listdir(folders):
+            for index in range(args.extra_files):
+                with open(os.path.join(folders, run, f"step_{index:03d}.log"), "w", encoding="utf-8") as log_file:
+                    log_file.write(LOG_LINE * 200)
+        roots = {"folders": folders}
+        for kind in ("zip", "tar.gz"):
+            roots[kind] = os.path.join(workdir, kind)
+            archive_tree(folders, roots[kind], kind, args.extra_files)
+        os.environ["TELEMETRY_CACHE_DIR"] = os.path.join(workdir, "cache")
+
+        json_bytes = sum(os.path.getsize(os.path.join(folders, run, "results.json")) for run in os.listdir(folders))
+        expected = {run: parse_results_file(os.path.join(folders, run, "results.json")) for run in os.listdir(folders)}
+        print(f"{args.runs} runs x {args.tests} tests | results.json total {json_bytes / 1e6:.1f} MB")
+        for kind, root in roots.items():
+            index = RunIndex(root, os.path.join(workdir, f"index_{kind.replace('.', '_')}.json"))
+            start = time.perf_counter()
+            runs = index.latest(args.runs)
+            scan = time.perf_counter() - start
+            assert len(runs) == args.runs, (kind, len(runs))
+            paths = [index.results_path(run) for run in runs]
+            assert all(parse_results_file(path) == expected[run] for run, path in zip(runs, paths)), kind
+
+            cases = [("cached offsets", cached_read)]
+            if kind != "folders":
+                archives = [run_archive.split_results_path(path)[0] for path in paths]
+                cases.append(("open + search", lambda path, by_path=dict(zip(paths, archives)): naive_read(by_path[path])))
+            for name, read in cases:
+                latencies = read_all(read, paths)
+                total = sum(latencies)
+                print(f"{kind:<8}| {tree_bytes(root) / 1e6:7.1f} MB on disk | index scan {scan * 1000:8.1f} ms"
+                      f" | {name:<15}| p50 {latencies[len(latencies) // 2] * 1000:7.2f} ms"
+                      f" | {json_bytes / total / 1e6:7.1f} MB/s")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
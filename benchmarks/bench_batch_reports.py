@@ -0,0 +1,105 @@
+"""Many reports at once: one batch process vs. one cold generate_html_report process per report.
+
+Builds 'roots' telemetry roots and 'jobs' report jobs spread over them, each with
+its own number of builds (so the jobs' runs overlap heavily). Then it times:
+
+  independent  every job in its own process with its own empty cache (separate CI jobs today)
+  batch        every job in one --batch process, starting with an empty cache
+  unique input loading each distinct run once (the floor for the batch's loading)
+
+and prints the totals with the bytes the jobs select against the bytes they really
+need, and the batch's per-job timings.
+
+Usage: python -m benchmarks.bench_batch_reports [--roots 5] [--runs 30] [--tests 5000] [--jobs 50]
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import make_telemetry_tree
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# ✅ The runs the jobs select (as generate_batch_reports does, with the default regression baseline): selected and unique bytes, then load the unique ones
+UNIQUE_SCRIPT = """
+import json, sys, time
+from parallel_loader import imap_ordered
+from records_cache import load_records_cached
+from run_archive import stat_results
+from run_index import get_run_index
+selected = []
+for job in json.load(open(sys.argv[1], encoding="utf-8")):
+    index = get_run_index(job["root"])
+    selected += [index.results_path(run) for run in index.latest(job["builds"])]
+unique = sorted(set(selected))
+print(sum(stat_results(path).st_size for path in selected), sum(stat_results(path).st_size for path in unique))
+start = time.perf_counter()
+for _ in imap_ordered(load_records_cached, unique):
+    pass
+print(time.perf_counter() - start)
+"""
+
+
+def run(args, cache_dir, capture=False):
+    env = dict(os.environ, TELEMETRY_CACHE_DIR=cache_dir)
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, *args], cwd=REPO_DIR, env=env, check=True,
+                               stdout=subprocess.PIPE if capture else subprocess.DEVNULL, text=True)
+    return time.perf_counter() - start, completed.stdout
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--roots", type=int, default=5)
+    parser.add_argument("--runs", type=int, default=30, help="runs per root")
+    parser.add_argument("--tests", type=int, default=5000, help="tests per run")
+    parser.add_argument("--jobs", type=int, default=50)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_batch_reports_")
+    try:
+        roots = [os.path.join(workdir, f"root_{number}") for number in range(args.roots)]
+        for number, root in enumerate(roots):
+            make_telemetry_tree(root, args.runs, args.tests, seed=number)
+        jobs = [{"root": roots[number % args.roots], "builds": 3 + number // args.roots % 5,
+                 "output": os.path.join(workdir, "reports", f"report_{number}.html")}
+                for number in range(args.jobs)]
+        jobs_path = os.path.join(workdir, "jobs.json")
+        with open(jobs_path, "w", encoding="utf-8") as jobs_file:
+            json.dump(jobs, jobs_file)
+
+        independent = 0.0
+        for number, job in enumerate(jobs):
+            job_path = os.path.join(workdir, f"job_{number}.json")
+            with open(job_path, "w", encoding="utf-8") as job_file:
+                json.dump([dict(job, output=job["output"] + ".independent.html")], job_file)
+            seconds, _ = run(["generate_html_report.py", "--batch", job_path],
+                             os.path.join(workdir, f"cache_independent_{number}"))
+            independent += seconds
+
+        batch, output = run(["generate_html_report.py", "--batch", jobs_path],
+                            os.path.join(workdir, "cache_batch"), capture=True)
+        _, unique = run(["-c", UNIQUE_SCRIPT, jobs_path], os.path.join(workdir, "cache_unique"), capture=True)
+        sizes, unique_seconds = unique.splitlines()
+        selected_bytes, unique_bytes = map(int, sizes.split())
+
+        lines = output.splitlines()
+        print("\n".join(lines[:3] + (["..."] if len(lines) > 4 else []) + lines[-1:]))
+        print(f"{args.jobs} reports over {args.roots} roots x {args.runs} runs x {args.tests} tests"
+              f" | results.json read by the jobs (with the regression baseline): {selected_bytes / 1e6:.0f} MB,"
+              f" of which unique {unique_bytes / 1e6:.0f} MB")
+        print(f"independent cold processes {independent:8.2f} s")
+        print(f"one batch process          {batch:8.2f} s  ({independent / batch:.1f}x faster)")
+        print(f"unique input, loaded once  {float(unique_seconds):8.2f} s  (the floor for loading; the rest of the batch is building and rendering the reports)")
+        reports = [job["output"] for job in jobs]
+        assert all(open(path, "rb").read() == open(path + ".independent.html", "rb").read() for path in reports)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
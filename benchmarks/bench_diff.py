@@ -0,0 +1,63 @@
+"""Build-to-build diff: server-side /api/diff vs. downloading both runs through /api/telemetry.
+
+Generates two runs of a large suite and compares response size (identity and gzip) and
+time of /api/diff against /api/telemetry?limit=2, then times diff_builds alone with
+numpy and with the pure-Python fallback.
+
+Usage: python -m benchmarks.bench_diff [--tests 100000]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from benchmarks.synthetic import make_telemetry_tree, run_folder_name
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tests", type=int, default=100000)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_diff_")
+    try:
+        root = os.path.join(workdir, "telemetry_data")
+        make_telemetry_tree(root, 2, args.tests)
+        os.environ["TELEMETRY_DATA_PATH"] = root
+        os.environ["TELEMETRY_CACHE_DIR"] = os.path.join(workdir, "cache")
+        import build_diff
+        import read_latest_folder as server
+
+        base, head = run_folder_name(0), run_folder_name(1)
+        client = server.app.test_client()
+        for name, path in (("/api/telemetry", "/api/telemetry?limit=2"),
+                           ("/api/diff", f"/api/diff?base={base}&head={head}")):
+            server.response_cache.clear()
+            server.results_cache.clear()
+            start = time.perf_counter()
+            identity = client.get(path, headers={"Accept-Encoding": "identity"})
+            cold = time.perf_counter() - start
+            gzipped = client.get(path, headers={"Accept-Encoding": "gzip"})
+            assert identity.status_code == 200, identity.status_code
+            print(f"{name:<15} | {len(identity.data) / 1024:9.1f} KB | gzip {len(gzipped.data) / 1024:8.1f} KB"
+                  f" | cold {cold * 1000:8.1f} ms")
+
+        load = lambda folder: server.results_cache.load(os.path.join(root, folder, "results.json"))
+        diff_input = build_diff.load_build_diff(head, base, load)
+        backends = [("numpy", build_diff.np)] if build_diff.np is not None else []
+        backends.append(("pure python", None))
+        for name, module in backends:
+            build_diff.np = module
+            best = float("inf")
+            for _ in range(3):
+                start = time.perf_counter()
+                changes, summary = build_diff.diff_builds(diff_input)
+                best = min(best, time.perf_counter() - start)
+            print(f"diff_builds {name:<11} | {args.tests} tests | {len(changes)} changed | {best * 1000:8.1f} ms")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
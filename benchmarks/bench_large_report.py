@@ -0,0 +1,75 @@
+"""File size, generation time and time-to-interactive of the table vs. the large (virtualized) report.
+
+Time-to-interactive is the time from navigation start to the first animation frame
+after the load event (all inline scripts run, first rows and chart drawn). It is
+measured in headless Chromium through Playwright when that is installed
+(pip install playwright && playwright install chromium), with the Chart.js CDN
+scripts replaced by a stub; otherwise only size and generation time are reported.
+
+Usage: python -m benchmarks.bench_large_report [--sizes 5000 20000 50000 100000] [--builds 5]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from benchmarks.bench_report_writer import make_matrix, make_test_cases
+from generate_html_report import write_large_report, write_report
+
+CHART_STUB = "window.Chart = function () { this.destroy = function () {}; }; Chart.register = function () {};"
+
+
+def open_browser():
+    try:
+        from playwright.sync_api import sync_playwright
+    except ImportError:
+        return None, None
+    playwright = sync_playwright().start()
+    browser = playwright.chromium.launch()
+    return playwright, browser
+
+
+def time_to_interactive(browser, path):
+    page = browser.new_page()
+    page.route("https://cdn.jsdelivr.net/**",
+               lambda route: route.fulfill(body=CHART_STUB, content_type="application/javascript"))
+    page.goto("file://" + path, wait_until="load", timeout=600000)
+    elapsed = page.evaluate("new Promise(resolve => requestAnimationFrame(() => resolve(performance.now())))")
+    page.close()
+    return elapsed / 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5000, 20000, 50000, 100000])
+    parser.add_argument("--builds", type=int, default=5)
+    args = parser.parse_args()
+
+    playwright, browser = open_browser()
+    if browser is None:
+        print("(Playwright not installed: time-to-interactive is skipped)")
+    workdir = tempfile.mkdtemp(prefix="bench_large_report_")
+    try:
+        for size in args.sizes:
+            matrix = make_matrix(*make_test_cases(size, args.builds))
+            for name, write in (("table", write_report), ("large", write_large_report)):
+                path = os.path.join(workdir, f"{name}_{size}.html")
+                start = time.perf_counter()
+                with open(path, "w", encoding="utf-8") as output:
+                    write(output, matrix)
+                generation = time.perf_counter() - start
+                line = (f"{size:>7} tests | {name:<5} | {os.path.getsize(path) / 1e6:7.1f} MB"
+                        f" | generated in {generation:6.2f} s")
+                if browser is not None:
+                    line += f" | time-to-interactive {time_to_interactive(browser, path):7.2f} s"
+                print(line)
+    finally:
+        if browser is not None:
+            browser.close()
+            playwright.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
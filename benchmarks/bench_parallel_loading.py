@@ -0,0 +1,57 @@
+"""Throughput of loading many run folders: sequential vs. thread pool vs. process pool.
+
+Network-share latency is emulated with --latency-ms of sleep per file (0 = local disk only).
+
+Usage: python -m benchmarks.bench_parallel_loading [--folders 40] [--tests 20000] [--latency-ms 30]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from benchmarks.synthetic import make_flat_tree
+from parallel_loader import imap_ordered
+from results_stream import load_records
+
+
+def slow_load_records(path):
+    """load_records plus an emulated per-file I/O latency (module-level for the process pool)."""
+    time.sleep(float(os.getenv("BENCH_LATENCY_MS", "0")) / 1000)
+    return load_records(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--folders", type=int, default=40)
+    parser.add_argument("--tests", type=int, default=20000)
+    parser.add_argument("--latency-ms", type=float, default=30)
+    parser.add_argument("--workers", type=int, nargs="+", default=[4, 8, 16])
+    args = parser.parse_args()
+    os.environ["BENCH_LATENCY_MS"] = str(args.latency_ms)
+
+    workdir = tempfile.mkdtemp(prefix="bench_parallel_")
+    try:
+        make_flat_tree(workdir, args.folders, args.tests)
+        paths = sorted(os.path.join(workdir, folder, "results.json") for folder in os.listdir(workdir))
+        total_mb = sum(os.path.getsize(path) for path in paths) / 1024 / 1024
+        print(f"{len(paths)} folders, {total_mb:.1f} MB, {args.latency_ms:g} ms emulated latency per file")
+
+        expected = None
+        configurations = [("sequential", 1, False)]
+        configurations += [(f"threads x{workers}", workers, False) for workers in args.workers]
+        configurations += [(f"processes x{os.cpu_count()}", os.cpu_count() or 1, True)]
+        for label, workers, use_processes in configurations:
+            start = time.perf_counter()
+            loaded = list(imap_ordered(slow_load_records, paths, workers, use_processes=use_processes))
+            elapsed = time.perf_counter() - start
+            if expected is None:
+                expected = loaded
+            assert loaded == expected, "parallel loading changed the output order"
+            print(f"{label:<16} {elapsed:7.2f} s   {len(paths) / elapsed:7.1f} folders/s   {total_mb / elapsed:7.1f} MB/s")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
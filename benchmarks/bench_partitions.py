@@ -0,0 +1,116 @@
+"""Run-index scan cost on a flat root vs. the same runs in YYYY/MM/DD partitions.
+
+For each history size, builds a flat root of timestamp-named runs ('--per-day' a day),
+copies it and migrates the copy with partition_runs. For both layouts it times the
+latest runs from a cold index, the latest runs right after a new run lands (the
+steady state of a busy server: the directory holding new runs keeps changing) and a
+date-range query over the last day, and counts the directories each one lists.
+With partitions, only the last two costs should stay flat as the history grows.
+
+Usage: python -m benchmarks.bench_partitions [--sizes 10000 50000] [--per-day 24] [--limit 3]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import run_index
+from partition_runs import partition_runs
+from run_index import RunIndex, run_name_time
+
+START = datetime(2020, 1, 1)
+
+
+def make_runs(root, count, per_day):
+    step = timedelta(days=1) / per_day
+    names = [(START + index * step).strftime(run_index.RUN_NAME_FORMAT) for index in range(count)]
+    for name in names:
+        os.makedirs(os.path.join(root, name))
+        with open(os.path.join(root, name, "results.json"), "w", encoding="utf-8") as results_file:
+            results_file.write("[]")
+    return names
+
+
+class ScandirCounter:
+    """Counts os.scandir calls made by the run index (directories listed)."""
+
+    def __init__(self):
+        self.calls = 0
+        self._scandir = os.scandir
+
+    def __call__(self, path):
+        self.calls += 1
+        return self._scandir(path)
+
+
+def timed(func):
+    counter = ScandirCounter()
+    run_index.os.scandir = counter
+    try:
+        start = time.perf_counter()
+        result = func()
+        return time.perf_counter() - start, counter.calls, result
+    finally:
+        run_index.os.scandir = counter._scandir
+
+
+def bench_layout(name, root, manifest, names, per_day, limit, new_run_dir):
+    cold, cold_dirs, latest = timed(lambda: RunIndex(root, manifest).latest(limit))
+    assert latest == names[::-1][:limit], (name, latest)
+
+    index = RunIndex(root, manifest)
+    index.latest(limit)
+    added = []
+    for round_ in range(5):
+        next_time = START + (len(names) + round_) * (timedelta(days=1) / per_day)
+        added.append(next_time.strftime(run_index.RUN_NAME_FORMAT))
+        folder = os.path.join(new_run_dir(next_time), added[-1])
+        os.makedirs(folder)
+        with open(os.path.join(folder, "results.json"), "w", encoding="utf-8") as results_file:
+            results_file.write("[]")
+        busy, busy_dirs, latest = timed(lambda: index.latest(limit))
+        assert latest[0] == added[-1], (name, latest)
+
+    since = run_name_time(added[-1]) - 86400
+    ranged, ranged_dirs, runs = timed(lambda: index.page(1000, since=since)[0])
+    assert len(runs) == per_day + 1, (name, len(runs))
+    print(f"{len(names):>8} runs | {name:<11} | cold {cold * 1000:9.1f} ms ({cold_dirs:>5} dirs)"
+          f" | new run {busy * 1000:8.2f} ms ({busy_dirs:>3} dirs)"
+          f" | last day {ranged * 1000:8.2f} ms ({ranged_dirs:>3} dirs)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 50000])
+    parser.add_argument("--per-day", type=int, default=24, help="runs per day")
+    parser.add_argument("--limit", type=int, default=3)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_partitions_")
+    os.environ["TELEMETRY_CACHE_DIR"] = os.path.join(workdir, "cache")
+    try:
+        for size in args.sizes:
+            flat = os.path.join(workdir, f"flat_{size}")
+            partitioned = os.path.join(workdir, f"partitioned_{size}")
+            names = make_runs(flat, size, args.per_day)
+            shutil.copytree(flat, partitioned)
+            start = time.perf_counter()
+            partition_runs(partitioned)
+            migration = time.perf_counter() - start
+            time.sleep(2.1)  # ✅ Let directory mtimes leave the racy window so warm refreshes can trust them
+
+            bench_layout("flat", flat, os.path.join(workdir, f"flat_{size}.json"),
+                         names, args.per_day, args.limit, lambda run_time: flat)
+            bench_layout("partitioned", partitioned, os.path.join(workdir, f"partitioned_{size}.json"),
+                         names, args.per_day, args.limit,
+                         lambda run_time: os.path.join(partitioned, run_time.strftime("%Y"),
+                                                       run_time.strftime("%m"), run_time.strftime("%d")))
+            print(f"{size:>8} runs | migrated in {migration:.2f} s")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
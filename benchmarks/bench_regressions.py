@@ -0,0 +1,64 @@
+"""Time the regression analysis on a synthetic tests × builds DurationMatrix.
+
+Durations are noisy around a per-test mean, with ~3% FAIL/N/A cells and a known
+set of slowed-down tests in the newest build; the benchmark checks they are found.
+
+Usage: python -m benchmarks.bench_regressions [--tests 50000] [--builds 200]
+"""
+import argparse
+import random
+import time
+from array import array
+
+import regressions
+from benchmarks.synthetic import run_folder_name
+from duration_matrix import STATUS_NA, DurationMatrix
+
+
+def make_matrix(tests, builds, slowed, seed=0):
+    rng = random.Random(seed)
+    matrix = DurationMatrix([run_folder_name(b) for b in range(builds)])
+    matrix.test_ids = [f"TC_{i:06d}" for i in range(tests)]
+    matrix.row_of = {test_id: row for row, test_id in enumerate(matrix.test_ids)}
+    matrix.descriptions = ["Synthetic test case"]
+    matrix.description_of = array("I", bytes(4 * tests))
+    values = array("d")
+    for row in range(tests):
+        mean = 0.5 + (row % 100) / 20
+        cells = [round(rng.gauss(mean, mean * 0.02), 2) for _ in range(builds)]
+        if row < slowed:
+            cells[0] = round(mean * 1.5, 2)
+        for build in range(builds):
+            if rng.random() < 0.03:
+                cells[build] = float("nan")
+        values.extend(cells)
+    matrix.values = values
+    matrix.status = bytearray(STATUS_NA if value != value else 0 for value in values)
+    return matrix
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tests", type=int, default=50000)
+    parser.add_argument("--builds", type=int, default=200)
+    parser.add_argument("--slowed", type=int, default=500)
+    args = parser.parse_args()
+
+    matrix = make_matrix(args.tests, args.builds, args.slowed)
+    window = args.builds - 1
+    backends = [("numpy", regressions.np)] if regressions.np is not None else []
+    backends.append(("pure python", None))
+    for name, module in backends:
+        regressions.np = module
+        best = float("inf")
+        for _ in range(3):
+            start = time.perf_counter()
+            found = regressions.detect_regressions(matrix, window)
+            best = min(best, time.perf_counter() - start)
+        missed = args.slowed - sum(1 for regression in found if regression["row"] < args.slowed)
+        print(f"{args.tests} tests × {args.builds} builds | {name:<11} | {best * 1000:8.1f} ms"
+              f" | {len(found)} flagged, {missed} of {args.slowed} slowed tests missed")
+
+
+if __name__ == "__main__":
+    main()
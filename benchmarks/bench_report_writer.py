@@ -0,0 +1,135 @@
+"""Generation time and peak RSS of the streaming report writer vs. in-memory string building.
+
+Each (mode, size) pair runs in a fresh subprocess. "peak RSS growth" is the increase
+in peak RSS during rendering, on top of the already-aggregated input. The legacy
+mode renders the original page (embedded testCaseData JSON); the table part of
+both outputs must be identical.
+
+Usage: python -m benchmarks.bench_report_writer [--sizes 10000 100000 500000] [--builds 5]
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import run_folder_name
+
+
+def make_test_cases(tests, builds):
+    folders = [run_folder_name(b) for b in range(builds)]
+    test_cases = {}
+    for i in range(tests):
+        results = {}
+        for b, folder in enumerate(folders):
+            if (i + b) % 23 == 0:
+                continue  # ✅ Leave some cells N/A
+            results[folder] = "$ assertion failed" if (i + b) % 17 == 0 else f"{((i * 7 + b) % 500) / 100:.2f} sec"
+        test_cases[f"TC_{i:07d}"] = {"Description": f"Synthetic test case {i}", "Results": results}
+    return folders, test_cases
+
+
+def make_matrix(folders, test_cases):
+    from duration_matrix import DurationMatrix
+
+    matrix = DurationMatrix(folders)
+    for test_id, test_info in test_cases.items():
+        for build, folder in enumerate(folders):
+            if folder in test_info["Results"]:
+                matrix.add_record(build, {"ID": test_id, "description": test_info["Description"],
+                                          "Duration": test_info["Results"][folder]})
+        if not test_info["Results"]:
+            matrix.add_record(0, {"ID": test_id, "description": test_info["Description"]})
+    return matrix
+
+
+def legacy_cell(result):
+    if result == "N/A":
+        return "<td style='color: red;'>✗ N/A</td>"
+    elif result.startswith("$"):
+        return "<td style='color: red;'>✗ FAIL</td>"
+    return f"<td style='color: green;'>✔ {result}</td>"
+
+
+def legacy_render(folders, test_cases):
+    """The original approach: grow one html_content string, then write it at the end."""
+    import generate_html_report as report
+
+    folder_labels, chart_labels = report.format_folder_labels(folders)
+    html_content = report.REPORT_HEAD + report.TABLE_HEAD
+    for label in folder_labels:
+        html_content += f"<th>{label}</th>"
+    html_content += "</tr>"
+    test_case_data = []
+    for test_id, test_info in test_cases.items():
+        test_case_data.append({"id": test_id, "description": test_info["Description"],
+                               "results": test_info["Results"]})
+    for case in test_case_data:
+        html_content += f"<tr><td>{case['id']}</td><td>{case['description']}</td>"
+        for folder in folders:
+            html_content += legacy_cell(case["results"].get(folder, "N/A"))
+        html_content += "</tr>"
+    html_content += report.TABLE_TAIL + report.SCRIPT_HEAD + "        const testCaseData = " + json.dumps(test_case_data)
+    html_content += f""";
+        const folders = {json.dumps(folders)};
+        const folderLabels = {json.dumps(folder_labels)};
+        const chartLabels={json.dumps(chart_labels)};
+"""
+    html_content += report.CHART_SCRIPT + report.TABLE_SCRIPT + report.REPORT_END
+    return html_content
+
+
+def child(mode, tests, builds, path):
+    import generate_html_report as report
+
+    folders, test_cases = make_test_cases(tests, builds)
+    matrix = make_matrix(folders, test_cases) if mode == "streaming" else None
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    with open(path, "w", encoding="utf-8") as output:
+        if mode == "legacy":
+            output.write(legacy_render(folders, test_cases))
+        else:
+            report.write_report(output, matrix)
+    elapsed = time.perf_counter() - start
+    growth_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline_kb
+    print(json.dumps({"seconds": elapsed, "rss_growth_mb": growth_kb / 1024, "bytes": os.path.getsize(path)}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 500000])
+    parser.add_argument("--builds", type=int, default=5)
+    parser.add_argument("--child", nargs=4, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        mode, tests, builds, path = args.child
+        child(mode, int(tests), int(builds), path)
+        return
+
+    with tempfile.TemporaryDirectory(prefix="bench_writer_") as workdir:
+        for tests in args.sizes:
+            for mode in ("legacy", "streaming"):
+                path = os.path.join(workdir, f"{mode}_{tests}.html")
+                output = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.bench_report_writer", "--child",
+                     mode, str(tests), str(args.builds), path],
+                    check=True, capture_output=True, text=True,
+                ).stdout
+                result = json.loads(output)
+                print(f"{tests:>8} rows | {mode:<9} | {result['seconds']:7.2f} s | peak RSS growth "
+                      f"{result['rss_growth_mb']:8.1f} MB | {result['bytes'] / 1024 / 1024:7.1f} MB written")
+            with open(os.path.join(workdir, f"legacy_{tests}.html"), "rb") as legacy_file, \
+                    open(os.path.join(workdir, f"streaming_{tests}.html"), "rb") as streaming_file:
+                table_end = "<script>"
+                legacy_html = legacy_file.read().decode("utf-8")
+                streaming_html = streaming_file.read().decode("utf-8")
+                assert legacy_html[:legacy_html.index(table_end)] == streaming_html[:streaming_html.index(table_end)], \
+                    "streaming table differs"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Compare the persistent run index with the original full directory scan.
+
+Usage: python -m benchmarks.bench_run_index [--sizes 1000 10000 100000] [--limit 3]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from benchmarks.synthetic import make_flat_tree
+from run_index import RunIndex
+
+
+def legacy_latest_folders(root, limit):
+    """The original os.listdir + per-folder stat + full sort implementation."""
+    folders = []
+    if not os.path.exists(root):
+        return []
+    for folder in os.listdir(root):
+        folder_path = os.path.join(root, folder)
+        results_file = os.path.join(folder_path, "results.json")
+        if os.path.isdir(folder_path) and os.path.exists(results_file):
+            creation_time = os.path.getctime(folder_path)
+            modification_time = os.path.getmtime(folder_path)
+            file_modification_time = os.path.getmtime(results_file)
+            modification_time = max(modification_time, file_modification_time)
+            latest_time = max(creation_time, modification_time)
+            folders.append((folder, latest_time))
+    latest_folders = sorted(folders, key=lambda x: x[1], reverse=True)[:limit]
+    return [folder[0] for folder in latest_folders]
+
+
+def timed(func, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_size(size, limit, workdir):
+    root = os.path.join(workdir, f"telemetry_{size}")
+    manifest = os.path.join(workdir, f"run_index_{size}.json")
+    make_flat_tree(root, size)
+    time.sleep(2.1)  # ✅ Let directory mtimes leave the racy window so warm refreshes can trust them
+
+    legacy = timed(lambda: legacy_latest_folders(root, limit))
+
+    start = time.perf_counter()
+    RunIndex(root, manifest_path=manifest).latest(limit)
+    cold = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = RunIndex(root, manifest_path=manifest)  # reloads the persisted manifest
+    latest = index.latest(limit)
+    reload = time.perf_counter() - start
+    assert latest == legacy_latest_folders(root, limit), "run index disagrees with the legacy scan"
+
+    warm = timed(lambda: index.latest(limit))
+    print(f"{size:>8} folders | legacy scan {legacy * 1000:9.2f} ms | index cold {cold * 1000:9.2f} ms"
+          f" | manifest reload {reload * 1000:9.2f} ms | index warm {warm * 1000:8.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--limit", type=int, default=3)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_run_index_")
+    try:
+        for size in args.sizes:
+            bench_size(size, args.limit, workdir)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Long-history chart series: full history vs. LTTB-downsampled raw results vs. day/week rollups.
+
+Writes 'builds' runs of a few tests straight into a SQLite store, one every 'interval'
+seconds (run times can't be back-dated through folders), rebuilds the rollups, then
+times one test's history as /api/history returns it and as test_series returns it
+(raw, day, week, and raw over the latest RAW_SERIES_LIMIT builds), with the JSON
+size of each. Finally checks that LTTB keeps the
+spikes that picking every n-th point loses.
+
+Usage: python -m benchmarks.bench_series [--builds 50000] [--tests 20] [--points 500]
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+import time
+
+from downsample import lttb
+from telemetry_store import RAW_SERIES_LIMIT, TelemetryStore
+
+
+def fill_store(db_path, builds, tests, interval, seed=0):
+    """Every test's duration drifts slowly, steps up once and spikes rarely. Returns the first run's time."""
+    rng = random.Random(seed)
+    start = time.time() - builds * interval
+    connection = sqlite3.connect(db_path, isolation_level=None)
+    connection.execute("BEGIN")
+    connection.executemany("INSERT INTO tests (test_pk, test_id, description) VALUES (?, ?, ?)",
+                           [(test, f"TC_{test:06d}", f"Synthetic test case {test}") for test in range(tests)])
+    connection.executemany(
+        "INSERT INTO runs (run_id, folder, run_time, results_mtime_ns, results_size) VALUES (?, ?, ?, 0, 0)",
+        [(run, f"run_{run:07d}", start + run * interval) for run in range(builds)])
+    for test in range(tests):
+        rows = []
+        for run in range(builds):
+            value = 1.0 + test * 0.1 + run / builds + (0.5 if run > builds * 2 // 3 else 0.0) + rng.random() * 0.1
+            if rng.random() < 0.001:
+                value *= 5  # ✅ Spike
+            rows.append((test, start + run * interval, run, test, f"{value:.2f} sec", round(value, 2), 0))
+        connection.executemany(
+            "INSERT INTO results (test_pk, run_time, run_id, position, duration, value, status) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+    connection.execute("COMMIT")
+    connection.close()
+    return start
+
+
+def timed(func, rounds=5):
+    best, result = float("inf"), None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--builds", type=int, default=50000)
+    parser.add_argument("--tests", type=int, default=20)
+    parser.add_argument("--points", type=int, default=500)
+    parser.add_argument("--interval", type=float, default=1800, help="seconds between builds")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_series_")
+    try:
+        db_path = os.path.join(workdir, "telemetry.sqlite3")
+        store = TelemetryStore(os.path.join(workdir, "telemetry"), db_path)
+        first = fill_store(db_path, args.builds, args.tests, args.interval)
+        start = time.perf_counter()
+        store.rebuild_rollups()
+        print(f"{args.builds} builds x {args.tests} tests ({args.builds * args.interval / 86400:.0f} days)"
+              f" | rollups rebuilt in {time.perf_counter() - start:.2f} s")
+
+        test_id = "TC_000001"
+        cases = [("full history", lambda: store.test_history(test_id, limit=args.builds))]
+        cases += [(f"series {period}", lambda period=period: store.test_series(test_id, args.points, period))
+                  for period in ("raw", "day", "week")]
+        recent = first + max(args.builds - RAW_SERIES_LIMIT, 0) * args.interval
+        cases.append(("series recent", lambda: store.test_series(test_id, args.points, "raw", since=recent)))
+        for name, func in cases:
+            seconds, result = timed(func)
+            size = len(json.dumps(result, separators=(",", ":")))
+            count = len(result) if isinstance(result, list) else len(result["points"])
+            source = "" if isinstance(result, list) else f" ({result['period']}, from {result['total']})"
+            print(f"{name:<13} | {count:>6} points{source:<22} | {seconds * 1000:8.2f} ms | {size / 1024:8.1f} KB")
+
+        # ✅ Shape: LTTB vs. every n-th point over the raw values (below RAW_SERIES_LIMIT)
+        history = store.test_history(test_id, limit=min(args.builds, RAW_SERIES_LIMIT))[::-1]
+        xs = [entry["run_time"] for entry in history]
+        ys = [entry["value"] for entry in history]
+        spikes = {index for index, value in enumerate(ys) if value > 3 * (ys[index - 1] if index else value)}
+        seconds, kept = timed(lambda: lttb(xs, ys, args.points))
+        stride = set(range(0, len(xs), max(len(xs) // args.points, 1)))
+        print(f"lttb {len(xs)} -> {len(kept)} points in {seconds * 1000:.2f} ms | spikes kept:"
+              f" lttb {len(spikes & set(kept))}/{len(spikes)}, every n-th {len(spikes & stride)}/{len(spikes)}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
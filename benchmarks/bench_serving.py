@@ -0,0 +1,124 @@
+"""Throughput and latency of the telemetry API under concurrent load, dev vs production serving.
+
+Starts the server in a subprocess on a synthetic tree for each serving configuration
+and fires requests at /api/telemetry from 'concurrency' client threads. Half of the
+requests ask for a single test (?test=...), so the mix includes cache-missing queries
+alongside the cached full response.
+
+Usage: python -m benchmarks.bench_serving [--folders 20] [--tests 2000] [--concurrency 1 16 64]
+"""
+import argparse
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+from benchmarks.synthetic import make_flat_tree
+
+CONFIGS = [
+    ("dev", "dev", 1, 1),
+    ("production 1×32", "production", 32, 1),
+    ("production 4×16", "production", 16, 4),
+]
+
+SERVER_SCRIPT = "import read_latest_folder as server; server.run_server('127.0.0.1', {port}, '{mode}', {threads}, {processes})"
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_ready(url, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url) as response:
+                response.read()
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"server did not start: {url}")
+
+
+def load_test(base_url, paths, concurrency, requests_per_client):
+    """Return (requests per second, sorted latencies in seconds, errors)."""
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+
+    def client(seed):
+        rng = random.Random(seed)
+        local = []
+        for _ in range(requests_per_client):
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(base_url + rng.choice(paths), timeout=60) as response:
+                    response.read()
+            except OSError as error:
+                with lock:
+                    errors.append(error)
+                continue
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    clients = [threading.Thread(target=client, args=(seed,)) for seed in range(concurrency)]
+    start = time.perf_counter()
+    for thread in clients:
+        thread.start()
+    for thread in clients:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return len(latencies) / elapsed, latencies, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--folders", type=int, default=20)
+    parser.add_argument("--tests", type=int, default=2000, help="tests per run")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--requests", type=int, default=50, help="requests per client thread")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_serving_")
+    try:
+        root = os.path.join(workdir, "telemetry_data")
+        make_flat_tree(root, args.folders, args.tests)
+        env = dict(os.environ, TELEMETRY_DATA_PATH=root, TELEMETRY_CACHE_DIR=os.path.join(workdir, "cache"))
+        rng = random.Random(0)
+        paths = ["/api/telemetry"] + [f"/api/telemetry?test=TC_{rng.randrange(args.tests):06d}" for _ in range(200)]
+        paths = ["/api/telemetry"] * len(paths) + paths
+
+        for name, mode, threads, processes in CONFIGS:
+            port = free_port()
+            server = subprocess.Popen(
+                [sys.executable, "-c", SERVER_SCRIPT.format(port=port, mode=mode, threads=threads, processes=processes)],
+                env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            )
+            try:
+                base_url = f"http://127.0.0.1:{port}"
+                wait_ready(base_url + "/api/telemetry")
+                for concurrency in args.concurrency:
+                    rps, latencies, errors = load_test(base_url, paths, concurrency, args.requests)
+                    p50 = latencies[len(latencies) // 2] * 1000 if latencies else float("nan")
+                    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000 if latencies else float("nan")
+                    print(f"{name:<16} | {concurrency:>4} clients | {rps:9.1f} req/s | p50 {p50:8.2f} ms"
+                          f" | p99 {p99:8.2f} ms | errors {len(errors)}")
+            finally:
+                server.terminate()
+                server.wait(timeout=30)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Startup time of the telemetry server: process start to first successful response.
+
+Starts the server in a fresh subprocess (headless) on a synthetic tree and polls
+every 10 ms, timing the first 200 from /healthz (ready) and from /api/telemetry
+(first data), with and without the background warm-up. Each configuration is
+repeated and the median is reported.
+
+Usage: python -m benchmarks.bench_startup [--folders 20] [--tests 5000] [--repeat 5]
+"""
+import argparse
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from benchmarks.synthetic import make_flat_tree
+
+SERVER_SCRIPT = "import read_latest_folder as server; server.run_server('127.0.0.1', {port})"
+POLL_SECONDS = 0.01
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def first_success(url, start, timeout=60):
+    """Seconds from 'start' until 'url' first answers 200."""
+    while time.perf_counter() - start < timeout:
+        try:
+            with urllib.request.urlopen(url) as response:
+                response.read()
+                if response.status == 200:
+                    return time.perf_counter() - start
+        except OSError:
+            pass
+        time.sleep(POLL_SECONDS)
+    raise RuntimeError(f"no response from {url}")
+
+
+def measure(env, path, warm_up):
+    port = free_port()
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-c", SERVER_SCRIPT.format(port=port)],
+        env=dict(env, WARM_UP="1" if warm_up else "0"),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        return first_success(f"http://127.0.0.1:{port}{path}", start)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--folders", type=int, default=20)
+    parser.add_argument("--tests", type=int, default=5000, help="tests per run")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_startup_")
+    try:
+        root = os.path.join(workdir, "telemetry_data")
+        make_flat_tree(root, args.folders, args.tests)
+        for warm_up in (False, True):
+            for path in ("/healthz", "/api/telemetry"):
+                timings = []
+                for attempt in range(args.repeat):
+                    # ✅ A fresh cache dir per start: measures a cold start, not the on-disk caches
+                    env = dict(os.environ, TELEMETRY_DATA_PATH=root,
+                               TELEMETRY_CACHE_DIR=os.path.join(workdir, f"cache_{warm_up}_{path.strip('/')}_{attempt}"))
+                    timings.append(measure(env, path, warm_up))
+                timings.sort()
+                print(f"warm-up {'on ' if warm_up else 'off'} | first 200 from {path:<15} | median "
+                      f"{timings[len(timings) // 2] * 1000:8.1f} ms | min {timings[0] * 1000:8.1f} ms")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
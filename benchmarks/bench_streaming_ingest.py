@@ -0,0 +1,96 @@
+"""Peak memory and time of results.json ingestion: json.load vs the streaming parser.
+
+Builds one synthetic results.json of roughly --size-mb megabytes (default 1024) with
+--tests records, each carrying a log payload that the report does not use, then
+aggregates it in a fresh subprocess per mode and reports peak RSS.
+
+Usage: python -m benchmarks.bench_streaming_ingest [--size-mb 1024] [--tests 300000]
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def write_large_results(path, size_mb, tests):
+    """Write a results.json of about 'size_mb' MB without holding it in memory."""
+    log_size = max(0, size_mb * 1024 * 1024 // tests - 120)
+    log_line = ("x" * 79 + "\n") * (log_size // 80 + 1)
+    with open(path, "w", encoding="utf-8") as results_file:
+        results_file.write("[\n")
+        for i in range(tests):
+            record = {
+                "ID": f"TC_{i:07d}",
+                "description": f"Synthetic test case {i % 5000}",
+                "Duration": "$ assertion failed" if i % 17 == 0 else f"{(i % 500) / 100 + 0.01:.2f} sec",
+                "log": log_line[:log_size],
+            }
+            results_file.write(("," if i else "") + json.dumps(record) + "\n")
+        results_file.write("]\n")
+
+
+def aggregate_json_load(path):
+    """The original pipeline: json.load the whole file, then copy into test_cases."""
+    with open(path, "r") as file:
+        data = {"run": json.load(file)}
+    test_cases = {}
+    for folder, build_data in data.items():
+        for test in build_data:
+            test_id = test.get("ID", "Unknown")
+            if test_id not in test_cases:
+                test_cases[test_id] = {"Description": test.get("description", "No Description"), "Results": {}}
+            test_cases[test_id]["Results"][folder] = test.get("Duration", "N/A")
+    return test_cases
+
+
+def aggregate_stream(path):
+    from results_stream import intern_value, iter_results
+
+    test_cases = {}
+    for test in iter_results(path):
+        test_id = intern_value(test.get("ID", "Unknown"))
+        if test_id not in test_cases:
+            test_cases[test_id] = {"Description": intern_value(test.get("description", "No Description")),
+                                   "Results": {}}
+        test_cases[test_id]["Results"]["run"] = test.get("Duration", "N/A")
+    return test_cases
+
+
+def child(mode, path):
+    start = time.perf_counter()
+    test_cases = (aggregate_stream if mode == "stream" else aggregate_json_load)(path)
+    elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # KiB on Linux
+    print(json.dumps({"mode": mode, "seconds": elapsed, "peak_rss_mb": peak_kb / 1024, "tests": len(test_cases)}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=1024)
+    parser.add_argument("--tests", type=int, default=300000)
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(*args.child)
+        return
+
+    with tempfile.TemporaryDirectory(prefix="bench_ingest_") as workdir:
+        path = os.path.join(workdir, "results.json")
+        write_large_results(path, args.size_mb, args.tests)
+        print(f"results.json: {os.path.getsize(path) / 1024 / 1024:,.0f} MB, {args.tests:,} records")
+        for mode in ("json_load", "stream"):
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_streaming_ingest", "--child", mode, path],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            result = json.loads(output)
+            print(f"{mode:<10} {result['seconds']:8.2f} s   peak RSS {result['peak_rss_mb']:9.1f} MB"
+                  f"   {result['tests']:,} unique tests")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Latency and bytes on the wire for /api/telemetry, before and after response caching.
+
+Usage: python -m benchmarks.bench_telemetry_response [--tests 20000] [--requests 20]
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+from benchmarks.synthetic import make_flat_tree
+
+
+def measure(client, requests, headers=None):
+    latencies = []
+    size = 0
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = client.get("/api/telemetry", headers=headers or {})
+        latencies.append(time.perf_counter() - start)
+        size = len(response.data)
+    return statistics.median(latencies), size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tests", type=int, default=20000, help="test entries per results.json")
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_response_")
+    os.environ["TELEMETRY_DATA_PATH"] = os.path.join(workdir, "telemetry_data")
+    os.environ["TELEMETRY_CACHE_DIR"] = os.path.join(workdir, "cache")
+    try:
+        make_flat_tree(os.environ["TELEMETRY_DATA_PATH"], 5, args.tests)
+        import read_latest_folder as api
+
+        @api.app.route("/bench/legacy-telemetry")
+        def legacy_telemetry():
+            # ✅ The original handler: re-read every results.json and jsonify per request
+            result = {}
+            for folder in api.get_latest_folders():
+                with open(os.path.join(api.TELEMETRY_DATA_PATH, folder, "results.json"), "r") as file:
+                    result[folder] = json.load(file)
+            return api.jsonify({"folders": list(result.keys()), "data": result})
+
+        client = api.app.test_client()
+        rows = []
+        legacy = []
+        for _ in range(args.requests):
+            start = time.perf_counter()
+            response = client.get("/bench/legacy-telemetry")
+            legacy.append(time.perf_counter() - start)
+        rows.append(("before (jsonify per request)", statistics.median(legacy), len(response.data)))
+
+        rows.append(("after, identity", *measure(client, args.requests)))
+        rows.append(("after, gzip", *measure(client, args.requests, {"Accept-Encoding": "gzip, br"})))
+        etag = client.get("/api/telemetry", headers={"Accept-Encoding": "gzip, br"}).headers["ETag"]
+        rows.append(("after, If-None-Match (304)",
+                     *measure(client, args.requests, {"Accept-Encoding": "gzip, br", "If-None-Match": etag})))
+
+        for label, latency, size in rows:
+            print(f"{label:<32} p50 {latency * 1000:9.2f} ms   {size:>12,} bytes")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Ingest throughput and per-test history latency of the SQLite telemetry store.
+
+Builds a tree of 'builds' runs, ingests it cold, then adds a few runs and ingests
+again (incremental), and times the history of single tests across all builds
+against the equivalent scan over every results.json.
+
+Usage: python -m benchmarks.bench_telemetry_store [--builds 1000] [--tests 500]
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from benchmarks.synthetic import make_flat_tree, make_results, run_folder_name
+from telemetry_store import TelemetryStore
+
+
+def scan_history(root, test_id):
+    """The folder-scanning alternative: open every results.json and pick one test."""
+    history = []
+    for folder in sorted(os.listdir(root), reverse=True):
+        with open(os.path.join(root, folder, "results.json"), "r", encoding="utf-8") as file:
+            for record in json.load(file):
+                if record.get("ID") == test_id:
+                    history.append((folder, record.get("Duration")))
+    return history
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--builds", type=int, default=1000)
+    parser.add_argument("--tests", type=int, default=500, help="tests per run")
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_telemetry_store_")
+    try:
+        root = os.path.join(workdir, "telemetry")
+        make_flat_tree(root, args.builds, args.tests)
+        store = TelemetryStore(root, os.path.join(workdir, "telemetry.sqlite3"))
+        rows = args.builds * args.tests
+
+        start = time.perf_counter()
+        ingested = store.ingest()
+        cold = time.perf_counter() - start
+        print(f"cold ingest   {ingested:>6} runs, {rows:>9} rows | {cold:7.2f} s | {rows / cold:>10,.0f} rows/s")
+
+        start = time.perf_counter()
+        store.ingest()
+        print(f"no-op ingest  {(time.perf_counter() - start) * 1000:9.2f} ms")
+
+        for index in range(args.builds, args.builds + 3):
+            folder_path = os.path.join(root, run_folder_name(index))
+            os.makedirs(folder_path)
+            with open(os.path.join(folder_path, "results.json"), "w", encoding="utf-8") as results_file:
+                json.dump(make_results(args.tests, seed=index), results_file)
+        start = time.perf_counter()
+        ingested = store.ingest()
+        print(f"incremental   {ingested:>6} runs | {(time.perf_counter() - start) * 1000:9.2f} ms")
+
+        rng = random.Random(0)
+        test_ids = [f"TC_{rng.randrange(args.tests):06d}" for _ in range(args.queries)]
+        latencies = []
+        for test_id in test_ids:
+            start = time.perf_counter()
+            history = store.test_history(test_id, limit=args.builds + 3)
+            latencies.append(time.perf_counter() - start)
+            assert len(history) == args.builds + 3, "history is missing builds"
+        latencies.sort()
+        print(f"history ({args.builds + 3} builds) | p50 {latencies[len(latencies) // 2] * 1000:7.2f} ms"
+              f" | max {latencies[-1] * 1000:7.2f} ms")
+
+        start = time.perf_counter()
+        scan_history(root, test_ids[0])
+        print(f"folder scan for one test      | {(time.perf_counter() - start) * 1000:9.2f} ms")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
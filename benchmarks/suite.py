@@ -0,0 +1,286 @@
+"""End-to-end benchmark suite: times each stage of the tool on a synthetic telemetry tree.
+
+Generates a realistic tree (see benchmarks.synthetic) for the chosen profile, then runs
+every stage in a fresh subprocess so each starts cold and its peak RSS is its own:
+
+  latest_folders  read_latest_folder.get_latest_folders: cold run index, then warm
+  telemetry_data  read_latest_folder.get_telemetry_data for the latest runs: cold, then cached
+  html_report     generate_html_report: cold, then an unchanged regeneration
+  api             /api/telemetry on a headless server: first request, then sequential and
+                  concurrent latency (p50/p99), and /healthz
+
+Results are written as JSON ('--output'). With '--baseline', timings and memory are
+compared against an earlier results file and the exit status is 1 if any metric got
+worse by more than '--tolerance' (and by more than a small absolute amount).
+
+Usage: python -m benchmarks.suite [--profile small|medium|large] [--output bench_results.json]
+                                  [--baseline previous.json] [--tolerance 0.25]
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from datetime import datetime, timezone
+
+from benchmarks.synthetic import make_telemetry_tree
+
+try:
+    import resource
+except ImportError:  # ✅ Windows: memory is not reported
+    resource = None
+
+RESULTS_VERSION = 1
+PROFILES = {
+    "small": {"folders": 20, "tests": 1000, "file_size_kb": 0},
+    "medium": {"folders": 100, "tests": 10000, "file_size_kb": 0},
+    "large": {"folders": 200, "tests": 50000, "file_size_kb": 20000},
+}
+STAGES = ["latest_folders", "telemetry_data", "html_report", "api"]
+# Metrics compared against a baseline: lower is better. Differences below these are noise.
+MIN_DELTA_SECONDS = 0.005
+MIN_DELTA_MB = 5
+API_REQUESTS = 200
+API_CONCURRENCY = 8
+SERVER_SCRIPT = "import read_latest_folder as server; server.run_server('127.0.0.1', {port})"
+
+
+def peak_rss_mb():
+    """Peak RSS of this process so far, in MB (None where the resource module is missing)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / 1024 / (1024 if sys.platform == "darwin" else 1), 1)  # ✅ bytes on macOS, KB elsewhere
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return round(time.perf_counter() - start, 6)
+
+
+def best_of(func, repeat):
+    return min(timed(func) for _ in range(repeat))
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def stage_latest_folders(root, workdir, repeat):
+    import read_latest_folder as server
+
+    return {
+        "cold_s": timed(lambda: server.get_latest_folders(3)),
+        "warm_s": best_of(lambda: server.get_latest_folders(3), repeat),
+    }
+
+
+def stage_telemetry_data(root, workdir, repeat):
+    import read_latest_folder as server
+
+    folders = server.get_latest_folders(3)
+    return {
+        "cold_s": timed(lambda: server.get_telemetry_data(folders)),
+        "warm_s": best_of(lambda: server.get_telemetry_data(folders), repeat),
+    }
+
+
+def stage_html_report(root, workdir, repeat):
+    import generate_html_report as report
+
+    report.TELEMETRY_DATA_PATH = root
+    report.REPORT_DIR = os.path.join(workdir, "html_report")
+    path = []
+    cold = timed(lambda: path.append(report.generate_html_report(open_browser=False)))
+    return {
+        "cold_s": cold,
+        "unchanged_s": best_of(lambda: report.generate_html_report(open_browser=False), repeat),
+        "report_mb": round(os.path.getsize(path[0]) / 1024 / 1024, 2),
+    }
+
+
+def stage_api(root, workdir, repeat):
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    base_url = f"http://127.0.0.1:{port}"
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-c", SERVER_SCRIPT.format(port=port)],
+        env=dict(os.environ, WARM_UP="0"), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+    def get(path):
+        request_start = time.perf_counter()
+        with urllib.request.urlopen(base_url + path, timeout=120) as response:
+            response.read()
+        return time.perf_counter() - request_start
+
+    try:
+        while True:
+            try:
+                get("/healthz")
+                break
+            except OSError:
+                if time.perf_counter() - start > 60:
+                    raise RuntimeError("server did not start")
+                time.sleep(0.01)
+        ready = time.perf_counter() - start
+        first = get("/api/telemetry")
+
+        sequential = sorted(get("/api/telemetry") for _ in range(API_REQUESTS))
+        concurrent = []
+        lock = threading.Lock()
+
+        def client():
+            latencies = [get("/api/telemetry") for _ in range(API_REQUESTS // API_CONCURRENCY)]
+            with lock:
+                concurrent.extend(latencies)
+
+        clients = [threading.Thread(target=client) for _ in range(API_CONCURRENCY)]
+        concurrent_start = time.perf_counter()
+        for thread in clients:
+            thread.start()
+        for thread in clients:
+            thread.join()
+        concurrent_elapsed = time.perf_counter() - concurrent_start
+        concurrent.sort()
+        healthz = sorted(get("/healthz") for _ in range(50))
+
+        server_peak = None
+        try:
+            with open(f"/proc/{server.pid}/status", "r") as status_file:  # ✅ Linux only
+                for line in status_file:
+                    if line.startswith("VmHWM:"):
+                        server_peak = round(int(line.split()[1]) / 1024, 1)
+        except OSError:
+            pass
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    return {
+        "ready_s": round(ready, 6),
+        "first_request_s": round(first, 6),
+        "p50_s": round(percentile(sequential, 0.5), 6),
+        "p99_s": round(percentile(sequential, 0.99), 6),
+        f"concurrent{API_CONCURRENCY}_p50_s": round(percentile(concurrent, 0.5), 6),
+        f"concurrent{API_CONCURRENCY}_p99_s": round(percentile(concurrent, 0.99), 6),
+        f"concurrent{API_CONCURRENCY}_rps": round(len(concurrent) / concurrent_elapsed, 1),
+        "healthz_p50_s": round(percentile(healthz, 0.5), 6),
+        "server_peak_rss_mb": server_peak,
+    }
+
+
+def run_stage(stage, root, workdir, repeat):
+    """Run one stage in this (fresh) process and print its metrics as JSON."""
+    if stage != "api":
+        import generate_html_report, read_latest_folder  # ✅ Imported first, so memory growth is the stage's own
+    baseline_mb = peak_rss_mb()
+    metrics = globals()[f"stage_{stage}"](root, workdir, repeat)
+    peak = peak_rss_mb()
+    if peak is not None and stage != "api":
+        metrics["peak_rss_mb"] = peak
+        metrics["rss_growth_mb"] = round(peak - baseline_mb, 1)
+    print(json.dumps(metrics))
+
+
+def compare(results, baseline, tolerance):
+    """Metrics that got worse than the baseline by more than 'tolerance' (relative): [(name, old, new)]."""
+    worse = []
+    for stage, metrics in results["stages"].items():
+        for name, value in metrics.items():
+            old = baseline.get("stages", {}).get(stage, {}).get(name)
+            if not isinstance(value, (int, float)) or not isinstance(old, (int, float)) or name.endswith("_rps"):
+                continue
+            floor = MIN_DELTA_SECONDS if name.endswith("_s") else MIN_DELTA_MB
+            if value > old * (1 + tolerance) and value - old > floor:
+                worse.append((f"{stage}.{name}", old, value))
+    return worse
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="small")
+    parser.add_argument("--folders", type=int, help="override the profile's run folder count")
+    parser.add_argument("--tests", type=int, help="override the profile's tests per run")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--repeat", type=int, default=5, help="repetitions of each warm measurement (best is kept)")
+    parser.add_argument("--output", default="bench_results.json", help="results file (default: %(default)s)")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown (default: %(default)s)")
+    parser.add_argument("--stage-child", nargs=3, metavar=("STAGE", "ROOT", "WORKDIR"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.stage_child:
+        stage, root, workdir = args.stage_child
+        run_stage(stage, root, workdir, args.repeat)
+        return
+
+    params = dict(PROFILES[args.profile])
+    if args.folders is not None:
+        params["folders"] = args.folders
+    if args.tests is not None:
+        params["tests"] = args.tests
+
+    workdir = tempfile.mkdtemp(prefix="bench_suite_")
+    try:
+        root = os.path.join(workdir, "telemetry_data")
+        start = time.perf_counter()
+        data_bytes = make_telemetry_tree(root, params["folders"], params["tests"],
+                                         record_bytes=params["file_size_kb"] * 1024 // params["tests"])
+        print(f"✅ Generated {params['folders']} runs × {params['tests']} tests "
+              f"({data_bytes / 1024 / 1024:.1f} MB) in {time.perf_counter() - start:.1f} s")
+
+        results = {
+            "version": RESULTS_VERSION,
+            "profile": args.profile,
+            "params": dict(params, data_mb=round(data_bytes / 1024 / 1024, 1)),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "stages": {},
+        }
+        for stage in args.stages:
+            stage_dir = os.path.join(workdir, "stages", stage)
+            os.makedirs(stage_dir)
+            # ✅ Fresh caches per stage, so every stage starts cold
+            env = dict(os.environ, TELEMETRY_DATA_PATH=root, TELEMETRY_CACHE_DIR=os.path.join(stage_dir, "cache"),
+                       TELEMETRY_DB=os.path.join(stage_dir, "telemetry.sqlite3"))
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.suite", "--repeat", str(args.repeat),
+                 "--stage-child", stage, root, stage_dir],
+                env=env, check=True, capture_output=True, text=True,
+            ).stdout
+            metrics = json.loads(output.strip().splitlines()[-1])
+            results["stages"][stage] = metrics
+            print(f"{stage:<15} " + " | ".join(f"{name} {value}" for name, value in metrics.items()))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    with open(args.output, "w", encoding="utf-8") as output_file:
+        json.dump(results, output_file, indent=2)
+    print(f"✅ Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        if baseline.get("params") != results["params"]:
+            print("⚠️ Baseline was measured with different parameters; comparing anyway")
+        worse = compare(results, baseline, args.tolerance)
+        for name, old, new in worse:
+            print(f"❌ {name}: {old} -> {new} ({(new / old - 1) * 100 if old else float('inf'):+.0f}%)")
+        if worse:
+            sys.exit(1)
+        print(f"✅ No metric worse than the baseline by more than {args.tolerance:.0%}")
+
+
+if __name__ == "__main__":
+    main()
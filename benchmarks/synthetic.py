@@ -0,0 +1,126 @@
+import argparse
+import json
+import os
+import random
+import time
+from datetime import datetime, timedelta
+
+
+def run_folder_name(index, start=datetime(2024, 1, 1)):
+    """Timestamp-style run folder name (%Y%m%d%H%M%S), one minute apart per index."""
+    return (start + timedelta(minutes=index)).strftime("%Y%m%d%H%M%S")
+
+
+def make_results(tests_per_run, seed=0):
+    """Build a results.json payload with 'tests_per_run' entries."""
+    results = []
+    for i in range(tests_per_run):
+        if (i + seed) % 17 == 0:
+            duration = "$ assertion failed"
+        else:
+            duration = f"{((i * 7 + seed * 13) % 500) / 100 + 0.01:.2f} sec"
+        results.append({"ID": f"TC_{i:06d}", "description": f"Synthetic test case {i}", "Duration": duration})
+    return results
+
+
+def make_flat_tree(root, folders, tests_per_run=1):
+    """Create 'folders' run folders under 'root', each with a results.json."""
+    os.makedirs(root, exist_ok=True)
+    for index in range(folders):
+        folder_path = os.path.join(root, run_folder_name(index))
+        os.makedirs(folder_path, exist_ok=True)
+        with open(os.path.join(folder_path, "results.json"), "w", encoding="utf-8") as results_file:
+            json.dump(make_results(tests_per_run, seed=index), results_file)
+
+
+# ✅ How the tool sees Duration values in the wild (all parse to the same number)
+DURATION_FORMATS = {
+    "sec": lambda seconds: f"{seconds:.2f} sec",
+    "s": lambda seconds: f"{seconds:.2f}s",
+    "string": lambda seconds: f"{seconds:.2f}",
+    "number": lambda seconds: round(seconds, 2),
+}
+FAILURE_MESSAGES = ["$ assertion failed", "$ timeout after 300 sec", "$ device not responding", "$ expected 200, got 500"]
+NA_VALUES = ["N/A", "", None]
+OUTPUT_LINE = "step completed without errors; "
+
+
+def make_realistic_results(tests_per_run, run_index=0, seed=0, fail_ratio=0.05, na_ratio=0.02,
+                           formats=("sec",), record_bytes=0):
+    """Build a results.json payload that looks like a real run.
+
+    Each test has a stable typical duration (log-normal across tests) with a few percent
+    of run-to-run noise. 'fail_ratio' / 'na_ratio' of the cells are failures ("$ ...")
+    or N/A (the string, empty, null or no Duration at all). Durations are written in
+    the given 'formats', picked per test. With 'record_bytes', each record gets an
+    "output" field padding it to about that many bytes of JSON.
+    """
+    test_rng = random.Random(seed)
+    run_rng = random.Random(f"{seed}:{run_index}")
+    results = []
+    for i in range(tests_per_run):
+        typical = test_rng.lognormvariate(0, 1)
+        style = formats[test_rng.randrange(len(formats))]
+        record = {"ID": f"TC_{i:06d}", "description": f"Synthetic test case {i}"}
+        roll = run_rng.random()
+        if roll < fail_ratio:
+            record["Duration"] = run_rng.choice(FAILURE_MESSAGES)
+        elif roll < fail_ratio + na_ratio:
+            value = run_rng.choice(NA_VALUES + ["missing"])
+            if value != "missing":
+                record["Duration"] = value
+        else:
+            record["Duration"] = DURATION_FORMATS[style](max(0.01, typical * run_rng.gauss(1, 0.03)))
+        if record_bytes:
+            padding = record_bytes - len(json.dumps(record)) - len(', "output": ""')
+            if padding > 0:
+                record["output"] = (OUTPUT_LINE * (padding // len(OUTPUT_LINE) + 1))[:padding]
+        results.append(record)
+    return results
+
+
+def make_telemetry_tree(root, folders, tests_per_run, seed=0, **options):
+    """Create 'folders' run folders under 'root' with realistic results.json files (see make_realistic_results).
+
+    Returns the total number of bytes written.
+    """
+    os.makedirs(root, exist_ok=True)
+    total = 0
+    for index in range(folders):
+        folder_path = os.path.join(root, run_folder_name(index))
+        os.makedirs(folder_path, exist_ok=True)
+        results_path = os.path.join(folder_path, "results.json")
+        with open(results_path, "w", encoding="utf-8") as results_file:
+            json.dump(make_realistic_results(tests_per_run, index, seed, **options), results_file)
+        total += os.path.getsize(results_path)
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic telemetry_data tree.")
+    parser.add_argument("root", help="directory to create the run folders in")
+    parser.add_argument("--folders", type=int, default=50, help="run folders (default: %(default)s)")
+    parser.add_argument("--tests", type=int, default=1000, help="tests per run (default: %(default)s)")
+    parser.add_argument("--fail-ratio", type=float, default=0.05, help="share of failed cells (default: %(default)s)")
+    parser.add_argument("--na-ratio", type=float, default=0.02, help="share of N/A cells (default: %(default)s)")
+    parser.add_argument("--formats", default="sec", help=f"comma-separated Duration formats: {', '.join(DURATION_FORMATS)}")
+    parser.add_argument("--file-size-kb", type=int, default=0,
+                        help="pad each results.json to about this size (default: no padding)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    formats = tuple(name for name in args.formats.split(",") if name)
+    unknown = [name for name in formats if name not in DURATION_FORMATS]
+    if unknown or not formats:
+        parser.error(f"unknown Duration format(s): {', '.join(unknown)}")
+    start = time.perf_counter()
+    total = make_telemetry_tree(
+        args.root, args.folders, args.tests, seed=args.seed, fail_ratio=args.fail_ratio, na_ratio=args.na_ratio,
+        formats=formats, record_bytes=args.file_size_kb * 1024 // max(args.tests, 1),
+    )
+    print(f"✅ {args.folders} runs × {args.tests} tests, {total / 1024 / 1024:.1f} MB in "
+          f"{time.perf_counter() - start:.1f} s: {args.root}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+import math
+
+try:
+    import numpy as np
+except ImportError:  # ✅ Optional: falls back to a pure-Python loop
+    np = None
+
+from duration_matrix import STATUS_FAIL, STATUS_NA, STATUS_PASS, DurationMatrix
+
+# A passing test counts as slower/faster only if its duration moved by at least MIN_DELTA
+# seconds and by at least MIN_RATIO of its base duration; smaller moves are noise.
+MIN_DELTA = 0.05
+MIN_RATIO = 0.10
+
+# Change kinds, in the order they are listed (most impactful first)
+CHANGE_KINDS = ("broken", "slower", "removed", "new", "status", "fixed", "faster")
+_BROKEN, _SLOWER, _REMOVED, _NEW, _STATUS, _FIXED, _FASTER = range(len(CHANGE_KINDS))
+STATUS_TEXT = {STATUS_PASS: "PASS", STATUS_FAIL: "FAIL", STATUS_NA: "N/A"}
+
+
+class BuildDiffInput:
+    """Two runs in one DurationMatrix (head in column 0, base in column 1) plus which tests each run had.
+
+    An N/A cell alone can't tell "the run reported N/A" from "the run didn't have the
+    test", so presence is tracked separately: rows below 'head_rows' came from the head
+    run, and 'in_base' marks which of those the base run also had (rows from
+    'head_rows' on exist only in the base run).
+    """
+
+    def __init__(self, head, base):
+        self.matrix = DurationMatrix([head, base])
+        self.head_rows = 0
+        self.in_base = bytearray()
+
+    def add_head(self, records):
+        for record in records:
+            self.matrix.add_record(0, record)
+        self.head_rows = len(self.matrix)
+        self.in_base = bytearray(self.head_rows)
+
+    def add_base(self, records):
+        row_of = self.matrix.row_of
+        for record in records:
+            row = row_of.get(record.get("ID", "Unknown"))
+            if row is not None and row < self.head_rows:
+                self.in_base[row] = 1
+            self.matrix.add_record(1, record)
+
+
+def load_build_diff(head, base, load):
+    """BuildDiffInput for two runs; 'load(folder)' returns a run's records (or None if it is gone)."""
+    diff_input = BuildDiffInput(head, base)
+    diff_input.add_head(load(head) or ())
+    diff_input.add_base(load(base) or ())
+    return diff_input
+
+
+def diff_builds(diff_input, min_delta=MIN_DELTA, min_ratio=MIN_RATIO):
+    """Changed tests between the base and head runs, most impactful first.
+
+    Returns (changes, summary). Each change is a dict with row, ID, description,
+    change (one of CHANGE_KINDS), base and head (the Duration shown, None if the run
+    didn't have the test), base_duration, head_duration, delta (seconds) and ratio
+    (head / base). 'summary' counts each kind, the unchanged tests and each run's tests.
+    """
+    if np is not None:
+        found = _diff_numpy(diff_input, min_delta, min_ratio)
+    else:
+        found = _diff_python(diff_input, min_delta, min_ratio)
+
+    matrix = diff_input.matrix
+    changes = []
+    summary = dict.fromkeys(CHANGE_KINDS, 0)
+    for row, kind in found:
+        summary[CHANGE_KINDS[kind]] += 1
+        head_present = row < diff_input.head_rows
+        base_present = not head_present or diff_input.in_base[row]
+        head_value = matrix.values[row * 2]
+        base_value = matrix.values[row * 2 + 1]
+        delta = head_value - base_value
+        changes.append({
+            "row": row,
+            "ID": matrix.test_ids[row],
+            "description": matrix.descriptions[matrix.description_of[row]],
+            "change": CHANGE_KINDS[kind],
+            "base": _shown(matrix, row * 2 + 1) if base_present else None,
+            "head": _shown(matrix, row * 2) if head_present else None,
+            "base_duration": None if math.isnan(base_value) else base_value,
+            "head_duration": None if math.isnan(head_value) else head_value,
+            "delta": None if math.isnan(delta) else round(delta, 6),
+            "ratio": round(head_value / base_value, 3) if base_value > 0 and not math.isnan(head_value) else None,
+        })
+    head_tests = diff_input.head_rows
+    base_tests = sum(diff_input.in_base) + len(matrix) - diff_input.head_rows
+    summary["unchanged"] = len(matrix) - len(changes)
+    summary["head_tests"] = head_tests
+    summary["base_tests"] = base_tests
+    return changes, summary
+
+
+def _shown(matrix, cell):
+    status = matrix.status[cell]
+    return matrix.texts[matrix.text_of[cell]] if status == STATUS_PASS else STATUS_TEXT[status]
+
+
+def _diff_numpy(diff_input, min_delta, min_ratio):
+    matrix = diff_input.matrix
+    rows = len(matrix)
+    values = np.frombuffer(matrix.values, dtype=np.float64).reshape(rows, 2)
+    status = np.frombuffer(matrix.status, dtype=np.uint8).reshape(rows, 2)
+    head_present = np.arange(rows) < diff_input.head_rows
+    base_present = np.ones(rows, dtype=bool)
+    base_present[:diff_input.head_rows] = np.frombuffer(diff_input.in_base, dtype=np.uint8).astype(bool)
+    both = head_present & base_present
+    head_status, base_status = status[:, 0], status[:, 1]
+    head_value, base_value = values[:, 0], values[:, 1]
+    delta = head_value - base_value
+
+    kind = np.full(rows, -1, dtype=np.int8)
+    kind[head_present & ~base_present] = _NEW
+    kind[~head_present & base_present] = _REMOVED
+    kind[both & (base_status == STATUS_PASS) & (head_status != STATUS_PASS)] = _BROKEN
+    kind[both & (base_status != STATUS_PASS) & (head_status == STATUS_PASS)] = _FIXED
+    kind[both & (base_status != STATUS_PASS) & (head_status != STATUS_PASS) & (base_status != head_status)] = _STATUS
+    with np.errstate(invalid="ignore"):
+        moved = (both & (base_status == STATUS_PASS) & (head_status == STATUS_PASS)
+                 & (np.abs(delta) >= min_delta) & (np.abs(delta) >= min_ratio * np.abs(base_value)))
+        kind[moved & (delta > 0)] = _SLOWER
+        kind[moved & (delta < 0)] = _FASTER
+
+    changed = np.flatnonzero(kind >= 0)
+    impact = _impact_numpy(kind[changed], head_value[changed], base_value[changed], delta[changed])
+    order = np.lexsort((changed, -impact, kind[changed]))
+    return [(int(changed[i]), int(kind[changed[i]])) for i in order]
+
+
+def _impact_numpy(kind, head_value, base_value, delta):
+    """Secondary sort key within a kind: seconds gained/lost, or the duration of the side that ran."""
+    impact = np.where((kind == _SLOWER) | (kind == _FASTER), np.abs(delta),
+                      np.where((kind == _NEW) | (kind == _FIXED), head_value, base_value))
+    return np.nan_to_num(impact, nan=0.0)
+
+
+def _diff_python(diff_input, min_delta, min_ratio):
+    matrix = diff_input.matrix
+    values, status = matrix.values, matrix.status
+    found = []
+    for row in range(len(matrix)):
+        head_present = row < diff_input.head_rows
+        base_present = not head_present or diff_input.in_base[row]
+        head_status, base_status = status[row * 2], status[row * 2 + 1]
+        head_value, base_value = values[row * 2], values[row * 2 + 1]
+        delta = head_value - base_value
+        if not base_present:
+            kind = _NEW
+        elif not head_present:
+            kind = _REMOVED
+        elif base_status == STATUS_PASS and head_status != STATUS_PASS:
+            kind = _BROKEN
+        elif base_status != STATUS_PASS and head_status == STATUS_PASS:
+            kind = _FIXED
+        elif base_status != STATUS_PASS:
+            if base_status == head_status:
+                continue
+            kind = _STATUS
+        elif abs(delta) >= min_delta and abs(delta) >= min_ratio * abs(base_value):
+            kind = _SLOWER if delta > 0 else _FASTER
+        else:
+            continue  # ✅ Also skips NaN deltas: a passing Duration without a number
+        if kind in (_SLOWER, _FASTER):
+            impact = abs(delta)
+        else:
+            impact = head_value if kind in (_NEW, _FIXED) else base_value
+        found.append((kind, -(0.0 if math.isnan(impact) else impact), row))
+    found.sort()
+    return [(row, kind) for kind, _, row in found]
@@ -0,0 +1,40 @@
+def lttb(xs, ys, threshold):
+    """Indexes of the points kept by Largest-Triangle-Three-Buckets downsampling to 'threshold' points.
+
+    xs must be sorted. The first and last points are always kept; from each of the
+    threshold - 2 buckets in between, the point forming the largest triangle with the
+    previously kept point and the average of the next bucket is kept, which preserves
+    peaks and the overall shape far better than taking every n-th point.
+    """
+    count = len(xs)
+    if threshold >= count:
+        return list(range(count))
+    if threshold < 3:
+        return [0, count - 1][:max(threshold, 0)]
+
+    kept = [0]
+    bucket_size = (count - 2) / (threshold - 2)
+    previous = 0
+    for bucket in range(threshold - 2):
+        start = int(bucket * bucket_size) + 1
+        end = int((bucket + 1) * bucket_size) + 1
+        # ✅ Average of the next bucket (the last point for the final bucket)
+        next_start = end
+        next_end = min(int((bucket + 2) * bucket_size) + 1, count)
+        if next_start >= next_end:
+            next_start, next_end = count - 1, count
+        span = next_end - next_start
+        average_x = sum(xs[next_start:next_end]) / span
+        average_y = sum(ys[next_start:next_end]) / span
+
+        previous_x, previous_y = xs[previous], ys[previous]
+        best, best_area = start, -1.0
+        for index in range(start, end):
+            area = abs((previous_x - average_x) * (ys[index] - previous_y)
+                       - (previous_x - xs[index]) * (average_y - previous_y))
+            if area > best_area:
+                best, best_area = index, area
+        kept.append(best)
+        previous = best
+    kept.append(count - 1)
+    return kept
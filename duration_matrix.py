@@ -0,0 +1,151 @@
+import math
+import re
+from array import array
+
+from results_stream import intern_value
+
+STATUS_PASS = 0
+STATUS_FAIL = 1  # Duration starts with "$"
+STATUS_NA = 2    # no result for the build (missing, "N/A" or null)
+
+# Leading number of a Duration string, as JavaScript's parseFloat reads it ("1.23 sec" -> 1.23).
+_LEADING_NUMBER = re.compile(r"\s*([+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)")
+
+
+def parse_duration(result):
+    """Return (status, value, text) for one raw Duration; value is NaN when nothing parses.
+
+    An empty Duration is a pass with empty text, as the table has always shown it ("✔ ").
+    """
+    if result is None or result == "N/A":
+        return STATUS_NA, math.nan, "N/A"
+    if isinstance(result, (int, float)) and not isinstance(result, bool):
+        return STATUS_PASS, float(result), str(result)
+    text = str(result)
+    if text.startswith("$"):
+        return STATUS_FAIL, math.nan, text
+    match = _LEADING_NUMBER.match(text)
+    return STATUS_PASS, float(match.group(1)) if match else math.nan, text
+
+
+class DurationMatrix:
+    """Columnar tests × builds view of the selected runs, parsed once at ingest.
+
+    Row-major over builds (cell = row * len(folders) + build):
+      values      -- array('d') of parsed durations, NaN where there is no number
+      status      -- bytearray of STATUS_* codes
+      text_of     -- array('I') of indexes into 'texts', the distinct Duration strings
+    Test IDs and descriptions are dictionary-encoded: 'test_ids' lists rows in
+    first-seen order and 'description_of' indexes into the distinct 'descriptions'.
+
+    With 'row_builds', only the first 'row_builds' builds add new tests; later builds
+    (e.g. a regression baseline that is not displayed) only fill in known rows.
+    """
+
+    def __init__(self, folders, row_builds=None):
+        self.folders = list(folders)
+        self.row_builds = len(self.folders) if row_builds is None else row_builds
+        self.test_ids = []
+        self.row_of = {}
+        self.descriptions = []
+        self.description_of = array("I")
+        self._description_index = {}
+        self.texts = ["N/A"]
+        self._text_index = {"N/A": 0}
+        self._parsed = {}  # raw Duration string -> (status, value, text index)
+        self.values = array("d")
+        self.status = bytearray()
+        self.text_of = array("I")
+
+    def __len__(self):
+        return len(self.test_ids)
+
+    def _row(self, test_id, description):
+        row = self.row_of.get(test_id)
+        if row is None:
+            row = self.row_of[test_id] = len(self.test_ids)
+            self.test_ids.append(test_id)
+            index = self._description_index.get(description)
+            if index is None:
+                index = self._description_index[description] = len(self.descriptions)
+                self.descriptions.append(description)
+            self.description_of.append(index)
+            builds = len(self.folders)
+            self.values.extend([math.nan] * builds)
+            self.status.extend([STATUS_NA] * builds)
+            self.text_of.extend([0] * builds)
+        return row
+
+    def add_record(self, build, record):
+        """Add one results.json record for build number 'build' (first description seen wins)."""
+        test_id = record.get("ID", "Unknown")
+        row = self.row_of.get(test_id)
+        if row is None:
+            if build >= self.row_builds:
+                return
+            row = self._row(intern_value(test_id), intern_value(record.get("description", "No Description")))
+        duration = record.get("Duration", "N/A")
+        # ✅ Suites repeat a small set of Duration strings: each distinct one is parsed once
+        parsed = self._parsed.get(duration) if type(duration) is str else None
+        if parsed is None:
+            status, value, text = parse_duration(duration)
+            text_index = self._text_index.get(text)
+            if text_index is None:
+                text_index = self._text_index[text] = len(self.texts)
+                self.texts.append(text)
+            parsed = (status, value, text_index)
+            if type(duration) is str:
+                self._parsed[duration] = parsed
+        cell = row * len(self.folders) + build
+        self.status[cell], self.values[cell], self.text_of[cell] = parsed
+
+    def drop_builds(self, keep):
+        """Keep only the build columns whose index is in 'keep' (e.g. folders whose results.json was gone)."""
+        keep = [build for build in range(len(self.folders)) if build in set(keep)]
+        if len(keep) == len(self.folders):
+            return
+        builds = len(self.folders)
+        cells = [row * builds + build for row in range(len(self.test_ids)) for build in keep]
+        self.values = array("d", (self.values[cell] for cell in cells))
+        self.status = bytearray(self.status[cell] for cell in cells)
+        self.text_of = array("I", (self.text_of[cell] for cell in cells))
+        self.folders = [self.folders[build] for build in keep]
+
+    def head(self, rows, row_builds=None):
+        """Copy of the matrix with only its first 'rows' tests.
+
+        Builds add their new tests in order, so the tests the first k builds add are the
+        first len(matrix) rows as of build k: head() of a matrix built with a larger
+        row_builds is the matrix a smaller row_builds would have built (with the Duration
+        strings indexed in a different order). Descriptions and Duration strings that
+        only the dropped rows use are left out.
+        """
+        matrix = DurationMatrix(self.folders, self.row_builds if row_builds is None else row_builds)
+        cells = rows * len(self.folders)
+        matrix.test_ids = self.test_ids[:rows]
+        matrix.row_of = {test_id: row for row, test_id in enumerate(matrix.test_ids)}
+        matrix.description_of = self.description_of[:rows]
+        # ✅ A description is added with the first row using it, so the kept rows use a prefix
+        matrix.descriptions = self.descriptions[:max(matrix.description_of, default=-1) + 1]
+        matrix._description_index = {description: index for index, description in enumerate(matrix.descriptions)}
+        matrix.values = self.values[:cells]
+        matrix.status = self.status[:cells]
+        if rows == len(self.test_ids):
+            used = range(len(self.texts))  # ✅ Every row: an exact copy
+        else:
+            used = sorted(set(self.text_of[:cells]) | {0})  # ✅ "N/A" stays at index 0
+        remap = {index: new_index for new_index, index in enumerate(used)}
+        matrix.texts = [self.texts[index] for index in used]
+        matrix._text_index = {text: index for index, text in enumerate(matrix.texts)}
+        matrix._parsed = {duration: (status, value, remap[index])
+                          for duration, (status, value, index) in self._parsed.items() if index in remap}
+        matrix.text_of = array("I", map(remap.__getitem__, self.text_of[:cells]))
+        return matrix
+
+    def row_cells(self, row):
+        """(status, value, text) for each build of one row."""
+        start = row * len(self.folders)
+        return [
+            (self.status[cell], self.values[cell], self.texts[self.text_of[cell]])
+            for cell in range(start, start + len(self.folders))
+        ]
@@ -1,70 +1,130 @@
+import argparse
+import html
 import os
 import json
-from datetime import datetime
+import re
+import time
+from datetime import datetime, timezone
 import webbrowser
 
+from build_diff import MIN_DELTA, MIN_RATIO, diff_builds, load_build_diff
+from duration_matrix import STATUS_FAIL, STATUS_NA, DurationMatrix, parse_duration
+from parallel_loader import LOADER_MODE, LOADER_WORKERS, imap_ordered
+from records_cache import iter_records_cached, load_records_cached
+from regressions import detect_regressions
+from report_manifest import ReportManifest
+from response_cache import fingerprint
+from run_archive import results_exist, stat_results
+from run_index import get_run_index
+from stage_metrics import StageMetrics
+from telemetry_store import PERIODS, SERIES_POINTS, get_telemetry_store
+
 # ✅ TELEMETRY DATA path for local execution
 TELEMETRY_DATA_PATH = os.path.join(os.getcwd(), "../", "telemetry_data")
 # ✅ TELEMETRY DATA path for local execution in Windows systems
 # TELEMETRY_DATA_PATH ="C:\\TTS_HOME\\bin\\invest\\src\\Results" 
 
-def get_latest_folders(limit=5):
-    """Get the latest 'limit' folders sorted by latest update time (only folders with results.json)."""
-    folders = []
+REPORT_DIR = "html_report"
+# ✅ Reports stream results.json by default, so memory follows the unique tests. Loading runs whole
+# on a pool only pays off on high-latency shares or with LOADER_MODE=process: opt in with > 1
+REPORT_LOADER_WORKERS = int(os.getenv("REPORT_LOADER_WORKERS", "1"))
+# Bump when the report output changes, so reports of unchanged runs are rebuilt once
+REPORT_FORMAT_VERSION = 1
 
-    if not os.path.exists(TELEMETRY_DATA_PATH):
-        return []  # Return an empty list if directory doesn't exist
+# ✅ Stage timings and counters of the last generate_html_report() call (printed with --timings)
+metrics = StageMetrics()
 
-    for folder in os.listdir(TELEMETRY_DATA_PATH):
-        folder_path = os.path.join(TELEMETRY_DATA_PATH, folder)
-        results_file = os.path.join(folder_path, "results.json")
+def regression_baseline(builds, regression_window):
+    """Baseline builds of a report of 'builds' runs: 'regression_window', or with None the
+    displayed runs after the newest, so no run beyond the displayed ones is read."""
+    return max(builds - 1, 0) if regression_window is None else regression_window
 
-        if os.path.isdir(folder_path) and os.path.exists(results_file):  # ✅ Check if results.json exists
-            creation_time = os.path.getctime(folder_path)  
-            modification_time = os.path.getmtime(folder_path)  
 
-            file_modification_time = os.path.getmtime(results_file)
-            modification_time = max(modification_time, file_modification_time)
+def get_latest_folders(limit=5, store=None):
+    """Get the latest 'limit' folders sorted by latest update time (only folders with results.json).
 
-            latest_time = max(creation_time, modification_time)
-            folders.append((folder, latest_time))
+    Backed by the persistent run index, so only new or changed folders are stat'ed.
+    With a TelemetryStore, the runs come from its history instead (including runs
+    whose folders have since been removed).
+    """
+    if store is not None:
+        return store.latest_runs(limit)
+    return get_run_index(TELEMETRY_DATA_PATH).latest(limit)
 
-    latest_folders = sorted(folders, key=lambda x: x[1], reverse=True)[:limit]
-    return [folder[0] for folder in latest_folders]
 
+def results_path(folder):
+    """Path of a run's results.json: in the run folder, or inside the run's archive (see run_archive)."""
+    return get_run_index(TELEMETRY_DATA_PATH).results_path(folder)
 
-def get_telemetry_data():
-    """Fetch telemetry data from latest valid folders (folders with results.json)."""
-    result = {}
-    latest_folders = get_latest_folders()
 
-    for folder in latest_folders:
-        file_path = os.path.join(TELEMETRY_DATA_PATH, folder, "results.json")
+def results_size(path):
+    """Size of a run's results.json, 0 if it is gone (an imap_ordered size_of)."""
+    try:
+        return stat_results(path).st_size
+    except OSError:
+        return 0
 
-        if os.path.exists(file_path):  # ✅ Check again before reading
-            with open(file_path, "r") as file:
-                result[folder] = json.load(file)
 
-    return {"folders": list(result.keys()), "data": result}  # ✅ Return only folders that have data
+def results_signatures(folders, paths):
+    """(folder, mtime_ns, size) of each run's results.json at 'paths', or (folder, None) if it is gone.
 
+    Stat'ed on every call, not taken from the run index, so a report's change key
+    always sees the files as they are now.
+    """
+    signatures = []
+    for folder, path in zip(folders, paths):
+        try:
+            results_stat = stat_results(path)
+            signatures.append((folder, results_stat.st_mtime_ns, results_stat.st_size))
+        except OSError:
+            signatures.append((folder, None))
+    return signatures
 
-def is_number(value):
-    """Check if the given value can be converted to a float."""
-    try:
-        float(value)
-        return True
-    except ValueError:
-        return False
 
+def get_duration_matrix(latest_folders=None, store=None, row_builds=None):
+    """Stream the latest folders' results.json into a DurationMatrix (tests × builds, parsed once).
 
-def generate_html_report():
-    """Generate an HTML report with interactive Chart.js visualization."""
-    telemetry_data = get_telemetry_data()
-    folders = telemetry_data["folders"]
-    data = telemetry_data["data"]
+    Runs are read through the local records cache, so only new or changed runs are
+    parsed, one record at a time (see results_stream): memory holds the matrix plus one
+    run's records. With REPORT_LOADER_WORKERS > 1 the folders are loaded whole,
+    concurrently, and merged in folder order, so the output is the same; the runs loaded
+    ahead are then bounded by LOADER_MAX_BYTES of results.json. Only folders that had a
+    results.json are kept as build columns. With a TelemetryStore the records are read
+    from SQLite rather than from the folders. 'row_builds' is passed on to DurationMatrix
+    (builds after it only extend known tests).
+    """
+    if latest_folders is None:
+        latest_folders = get_latest_folders(store=store)
+    file_paths = [results_path(folder) for folder in latest_folders]
 
-    # ✅ HTML Header and Table
-    html_content = """
+    if store is not None:
+        runs = (store.run_records(folder) for folder in latest_folders)
+    elif REPORT_LOADER_WORKERS > 1:
+        runs = imap_ordered(load_records_cached, file_paths, REPORT_LOADER_WORKERS,
+                            use_processes=LOADER_MODE == "process", size_of=results_size)
+    else:
+        runs = (iter_records_cached(path) for path in file_paths)
+
+    matrix = DurationMatrix(latest_folders, row_builds)
+    present = []
+    for build, records in enumerate(runs):
+        if records is None:
+            continue
+        present.append(build)
+        if store is None and metrics.enabled:
+            try:
+                metrics.count("bytes_read", stat_results(file_paths[build]).st_size)
+            except OSError:
+                pass
+        for test in records:
+            matrix.add_record(build, test)
+
+    matrix.drop_builds(present)
+    return matrix
+
+
+# ✅ Static parts of the report; rows and the embedded data are streamed in between
+REPORT_HEAD = """
     <!DOCTYPE html>
     <html lang="en">
     <head>
@@ -150,6 +210,14 @@ def generate_html_report():
         }
             .selected-row {
             background-color: #d8eafd !important;
+        }
+            .regression {
+            background-color: #fff1f0;
+        }
+            .regression-badge {
+            color: #c62828;
+            font-weight: bold;
+            margin-left: 6px;
         }
         /* Footer */
         .footer {
@@ -172,68 +240,15 @@ def generate_html_report():
       </div>
         <div class="container">
             <div class="table-container">
-                <table id="telemetryTable">
+"""
+
+TABLE_HEAD = """                <table id="telemetryTable">
                     <tr>
                         <th>ID</th>
                         <th>Description</th>
     """
 
-    test_cases = {}
-    for folder, build_data in data.items():
-        for test in build_data:
-            test_id = test.get("ID", "Unknown")
-            description = test.get("description", "No Description")
-            duration = test.get("Duration", "N/A")
-
-            if test_id not in test_cases:
-                test_cases[test_id] = {"Description": description, "Results": {}}
-            test_cases[test_id]["Results"][folder] = duration
-
-    # Format folders for table headers and chart labels
-    folder_labels = []
-    for folder in folders:
-        try:
-            dt = datetime.strptime(folder, "%Y%m%d%H%M%S")  # Try parsing as timestamp
-            formatted_folder = dt.strftime("%d %b, %I:%M %p")
-        except ValueError:
-            formatted_folder = folder  # Use original if format is incorrect
-        folder_labels.append(f"Test ({formatted_folder})")
-    
-       # Format labels for chart (Test 1, Test 2, ...)
-    chart_labels = []
-    for i, _ in enumerate(folders):
-        chart_labels.append(f"Test {i + 1}")
-
-    # Add columns for each folder (build)
-    for label in folder_labels:
-        html_content += f"<th>{label}</th>"
-    html_content += "</tr>"
-
-    test_case_data = []
-    for test_id, test_info in test_cases.items():
-        case_data = {
-            "id": test_id,
-            "description": test_info["Description"],
-            "results": test_info["Results"],
-        }
-        test_case_data.append(case_data)
-
-    for case in test_case_data:
-     html_content += f"<tr><td>{case['id']}</td><td>{case['description']}</td>"
-     for folder in folders:
-        result = case["results"].get(folder, "N/A")
-
-        if result == "N/A":  # Show ✗ N/A in red
-            html_content += f"<td style='color: red;'>✗ N/A</td>"
-        elif result.startswith("$"):  # Show ✗ FAIL in red for values starting with $
-            html_content += f"<td style='color: red;'>✗ FAIL</td>"
-        else:  # Otherwise, show result in green with a checkmark
-            html_content += f"<td style='color: green;'>✔ {result}</td>"
-
-     html_content += "</tr>"
-
-
-    html_content += """
+TABLE_TAIL = """
                 </table>
             </div>
             <div class="chart-container">
@@ -243,82 +258,66 @@ def generate_html_report():
         <div class="footer"></div>
     """
 
-    # ✅ JavaScript for Chart.js Visualization
-    html_content += f"""
+# ✅ JavaScript for Chart.js Visualization
+SCRIPT_HEAD = """
     <script>
          // Chart is likely available as just "Chart"
     // You need to CONFIRM the global variable name for the plugin. 
     // It MIGHT be ChartAnnotation, or something else. Check the plugin's documentation!
-       if (window.ChartAnnotation) {{ 
+       if (window.ChartAnnotation) { 
             Chart.register(window.ChartAnnotation); 
     
-        }} else {{
+        } else {
             console.error("Chart Annotation plugin not found!"); 
-        }}
-        const testCaseData = {json.dumps(test_case_data)};
-        const folders = {json.dumps(folders)};
-        const folderLabels = {json.dumps(folder_labels)};
-        const chartLabels={json.dumps(chart_labels)};
-        let chartInstance = null;
+        }
+"""
+
+CHART_SCRIPT = """        let chartInstance = null;
         let selectedRow = null;
         //--------------------------------------------
         
-        function updateChart(testCase) {{
+        function updateChart(row) {
             const ctx = document.getElementById('telemetryChart').getContext('2d');
                 let annotations = []; 
-                let tempData = []; // Temporary array to store values before calculating min
-
-                const data = folders.map((folder, index) => {{
-                    const result = testCase.results[folder];
-                    const parsedResult = isNaN(parseFloat(result)) ? 0 : parseFloat(result.split(" ")[0]);
-
-                    tempData.push(parsedResult); // Store for min calculation
-
-                    let annotationContent = '';
-
-                    if (typeof result === 'string' && result.startsWith('$')) {{
-                        annotationContent = 'FAIL';
-                    }} else if (result === 'N/A' || result === null || result === undefined || result === "") {{
-                        annotationContent = 'N/A';
-                    }}
-
-                    return parsedResult; // Store the processed data
-                }});
+                // ✅ Durations were parsed when the report was generated: one slice per click, no parseFloat
+                const start = row * folders.length;
+                const data = durationValues.slice(start, start + folders.length);
+                let tempData = data; // Values used to place the FAIL / N/A labels
 
-                folders.forEach((folder, index) => {{
-                    const result = testCase.results[folder];
+                folders.forEach((folder, index) => {
+                    const status = durationStatus.charCodeAt(start + index) - 48; // 0 pass, 1 FAIL, 2 N/A
 
                     let annotationContent = '';
                    // let val
 
-                    if (typeof result === 'string' && result.startsWith('$')) {{
+                    if (status === 1) {
                         annotationContent = 'FAIL';
-                    }} else if (result === 'N/A' || result === null || result === undefined || result === "") {{
+                    } else if (status === 2) {
                         annotationContent = 'N/A';
-                    }}
+                    }
 
-                    if (annotationContent !== '') {{
+                    if (annotationContent !== '') {
                     const yOffset = 0.15;
                     const maxYValue = Math.max(...tempData);
                     // ✅ Use maxYValue as a placeholder for yValue
                     // const safeYValue = maxYValue <= 1 ? 0.05 : yOffset;
              
                     let safeYValue=0;
-                    if( maxYValue <= 0.5){{
+                    if( maxYValue <= 0.5){
                       safeYValue= 0.02
-                    }}else if (maxYValue <=1  && maxYValue >= 0.5){{
+                    }else if (maxYValue <=1  && maxYValue >= 0.5){
                     safeYValue= 0.05
-                    }} else if(maxYValue <= 3 && maxYValue >= 1) {{
+                    } else if(maxYValue <= 3 && maxYValue >= 1) {
                      safeYValue= 0.07
-                    }}
-                    else if(maxYValue <= 5){{
+                    }
+                    else if(maxYValue <= 5){
                       safeYValue= 0.15
-                    }}else{{
+                    }else{
                       safeYValue= 0.25
-                    }}
+                    }
 
                        console.log('maxYValue---',maxYValue,'safeYValue--',safeYValue,'tempData---',JSON.stringify(tempData),)
-                         annotations.push({{
+                         annotations.push({
                             clip: false,
                             type: 'label',
                             xValue: chartLabels[index], // Keep aligned with the column
@@ -326,124 +325,969 @@ def generate_html_report():
                             content: annotationContent,
                             borderRadius: 5,
                             color: (annotationContent === 'FAIL' || annotationContent === 'N/A') ? 'red' : 'green',
-                            font: {{
+                            font: {
                                 size: 10
-                            }},
+                            },
                             textAlign: 'center',
-                        }});
-                     }}
-                }});
+                        });
+                     }
+                });
 
 
-            if (chartInstance) {{
+            if (chartInstance) {
                 chartInstance.destroy();
-            }}
+            }
 
-            chartInstance = new Chart(ctx, {{
+            chartInstance = new Chart(ctx, {
                 type: 'bar',
-                data: {{
+                data: {
                     labels: chartLabels,
-                    datasets: [{{
-                        label: testCase.description,
+                    datasets: [{
+                        label: descriptions[descriptionOf[row]],
                         data: data,
                         backgroundColor: ['#6CB8BF', '#97C7E8', '#C1E2E3', '#f59fa7'],
                         borderWidth: 1,
                         borderRadius: 10,
                         barThickness: 45,
-                    }}]
-                }},
-                options: {{
+                    }]
+                },
+                options: {
                     responsive: true,
                     maintainAspectRatio: false,
-                    animation: {{
+                    animation: {
                         duration: 1000,
                         easing: 'easeOutBounce'
-                    }},
-                    scales: {{
-                        y: {{
+                    },
+                    scales: {
+                        y: {
                             beginAtZero: true,
-                            title: {{
+                            title: {
                                 display: true,
                                 text: 'Duration (seconds)'
-                            }}
-                        }},
-                        x: {{
-                            title: {{
+                            }
+                        },
+                        x: {
+                            title: {
                                 display: true,
                                 text: 'Build Versions'
-                            }}
-                        }}
-                    }},
-                    plugins: {{
-                        legend: {{
+                            }
+                        }
+                    },
+                    plugins: {
+                        legend: {
                             display: true,
                             position: 'bottom',
-                            labels: {{
-                                font: {{ size: 14 }},
+                            labels: {
+                                font: { size: 14 },
                                 usePointStyle: true,
                                 pointStyle: 'rect',
-                            }}
-                        }},
-                       annotation: {{
+                            }
+                        },
+                       annotation: {
                            annotations:annotations
-                      }},
+                      },
                       
-                    }}
-                }}
-            }});
-        }}
+                    }
+                }
+            });
+        }
 
 
-   //-----------------------------------------------------------------------------
+"""
+
+TABLE_SCRIPT = """   //-----------------------------------------------------------------------------
         // Show first row data by default
         const tableRows1 = document.querySelectorAll('#telemetryTable tbody tr');
-        if (testCaseData.length > 0) {{
-            updateChart(testCaseData[0]);
-            if (tableRows1.length > 1) {{
+        if (descriptionOf.length > 0) {
+            updateChart(0);
+            if (tableRows1.length > 1) {
                 tableRows1[1].classList.add('selected-row');
                 selectedRow = tableRows1[1];
-            }}
-        }}
+            }
+        }
 
         // Add click event listeners to table rows
          const tableRows = document.querySelectorAll('#telemetryTable tbody tr');
-        tableRows.forEach((row, index) => {{
-            row.addEventListener('click', () => {{
-                if (selectedRow) {{
+        tableRows.forEach((row, index) => {
+            row.addEventListener('click', () => {
+                if (selectedRow) {
                     selectedRow.classList.remove('selected-row');
-                }}
+                }
                 row.classList.add('selected-row');
                 selectedRow = row;
-                updateChart(testCaseData[index-1]);
-            }});
-        }});
+                updateChart(index-1);
+            });
+        });
     </script>
     """
 
- 
-    html_content += "</body></html>"
-    # Generate an incremental filename
-    report_dir = "html_report"
-    if not os.path.exists(report_dir):
-        os.makedirs(report_dir)  # Create the directory if it doesn't exist
-
-    i = 1
-    while True:
-        random_filename = os.path.join(report_dir, f"telemetry_report_{i}.html")
-        if not os.path.exists(random_filename):
-            break
-        i += 1
+REPORT_END = "</body></html>"
+
+ROW_CHUNK = 1000  # table rows / data entries written per write() call
+LARGE_REPORT_ROWS = 20000  # "auto" mode switches to the large report above this many tests
+
+# ✅ Large report: the table is drawn in the browser from the embedded data, only the rows in view
+LARGE_TABLE_HEAD = """                <style>
+                    .table-toolbar { display: flex; gap: 12px; align-items: center; padding: 0 0 10px 0; }
+                    .table-toolbar input { flex: 1; padding: 8px; border: 1px solid #ccc; border-radius: 4px; }
+                    #telemetryTable thead th { position: sticky; top: 0; cursor: pointer; user-select: none; }
+                    #telemetryRows .spacer td { padding: 0; border: 0; }
+                </style>
+                <div class="table-toolbar">
+                    <input id="testSearch" type="search" placeholder="Search test ID or description">
+                    <span id="rowCount"></span>
+                </div>
+                <table id="telemetryTable">
+                    <thead><tr>
+                        <th data-column="-2">ID</th>
+                        <th data-column="-1">Description</th>
+    """
+
+# Chart inputs (durationValues / durationStatus) expanded from the per-cell indexes into 'texts'
+LARGE_DATA_SCRIPT = """        const durationValues = textOf.map(text => textValues[text]);
+        const durationStatus = textOf.map(text => textStatus[text]).join('');
+"""
+
+LARGE_TABLE_SCRIPT = """   //-----------------------------------------------------------------------------
+        const builds = folders.length;
+        const viewport = document.querySelector('.table-container');
+        const rowsBody = document.getElementById('telemetryRows');
+        const searchBox = document.getElementById('testSearch');
+        const rowCount = document.getElementById('rowCount');
+        const headers = Array.from(document.querySelectorAll('#telemetryTable thead th'));
+        const headerLabels = headers.map(th => th.textContent);
+        const OVERSCAN = 20; // rows rendered above and below the visible ones
+
+        function escapeHtml(value) {
+            return String(value).replace(/[&<>"']/g, c => ({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'})[c]);
+        }
+
+        const cellHtml = texts.map((text, index) =>
+            textStatus[index] === '2' ? "<td style='color: red;'>✗ N/A</td>"
+            : textStatus[index] === '1' ? "<td style='color: red;'>✗ FAIL</td>"
+            : "<td style='color: green;'>✔ " + escapeHtml(text) + "</td>");
+        const badges = new Map(regressions.map(([row, badge, title]) =>
+            [row, "<span class='regression-badge' title='" + escapeHtml(title) + "'>" + badge + "</span>"]));
+
+        // Regressions first (worst first), then the remaining tests in file order
+        const defaultOrder = regressions.map(([row]) => row);
+        for (let row = 0; row < testIds.length; row++) {
+            if (!badges.has(row)) defaultOrder.push(row);
+        }
+        let sortedRows = defaultOrder; // all rows, in the current sort order
+        let order = defaultOrder;      // rows matching the search, in display order
+        let sortColumn = null;
+        let sortDirection = 1;
+        let selected = order.length > 0 ? order[0] : -1;
+        let rowHeight = 0;
+        let searchKeys = null;
+
+        function rowHtml(row) {
+            const classes = (badges.has(row) ? 'regression ' : '') + (row === selected ? 'selected-row' : '');
+            let html = "<tr data-row='" + row + "' class='" + classes + "'><td>" + escapeHtml(testIds[row]) + (badges.get(row) || '')
+                + "</td><td>" + escapeHtml(descriptions[descriptionOf[row]]) + "</td>";
+            for (let cell = row * builds; cell < (row + 1) * builds; cell++) {
+                html += cellHtml[textOf[cell]];
+            }
+            return html + "</tr>";
+        }
+
+        function spacer(height) {
+            return "<tr class='spacer'><td colspan='" + (builds + 2) + "' style='height: " + height + "px'></td></tr>";
+        }
+
+        function render() {
+            if (!rowHeight && order.length > 0) {
+                rowsBody.innerHTML = rowHtml(order[0]);
+                rowHeight = rowsBody.firstChild.getBoundingClientRect().height || 55;
+            }
+            const first = Math.max(0, Math.floor(viewport.scrollTop / (rowHeight || 1)) - OVERSCAN);
+            const last = Math.min(order.length, first + Math.ceil(viewport.clientHeight / (rowHeight || 1)) + 2 * OVERSCAN);
+            let html = spacer(first * rowHeight);
+            for (let index = first; index < last; index++) {
+                html += rowHtml(order[index]);
+            }
+            rowsBody.innerHTML = html + spacer((order.length - last) * rowHeight);
+            rowCount.textContent = order.length + ' of ' + testIds.length + ' tests';
+        }
+
+        let frameRequested = false;
+        viewport.addEventListener('scroll', () => {
+            if (!frameRequested) {
+                frameRequested = true;
+                requestAnimationFrame(() => { frameRequested = false; render(); });
+            }
+        });
+
+        rowsBody.addEventListener('click', event => {
+            const tr = event.target.closest('tr[data-row]');
+            if (!tr) return;
+            selected = Number(tr.dataset.row);
+            updateChart(selected);
+            render();
+        });
+
+        function applySearch() {
+            const query = searchBox.value.trim().toLowerCase();
+            if (query && !searchKeys) {
+                const descriptionKeys = descriptions.map(description => String(description).toLowerCase());
+                searchKeys = testIds.map((id, row) => String(id).toLowerCase() + '\\n' + descriptionKeys[descriptionOf[row]]);
+            }
+            order = query ? sortedRows.filter(row => searchKeys[row].includes(query)) : sortedRows;
+            viewport.scrollTop = 0;
+            render();
+        }
+
+        let searchTimer = null;
+        searchBox.addEventListener('input', () => {
+            clearTimeout(searchTimer);
+            searchTimer = setTimeout(applySearch, 150);
+        });
+
+        // Click a header to sort by it (again to reverse); builds sort slowest first, FAIL / N/A last
+        function sortBy(column) {
+            sortDirection = column === sortColumn ? -sortDirection : (column >= 0 ? -1 : 1);
+            sortColumn = column;
+            let keys;
+            if (column === -2) {
+                keys = testIds.map(String);
+            } else if (column === -1) {
+                keys = Array.from(descriptionOf, index => String(descriptions[index]));
+            } else {
+                keys = testIds.map((_, row) => durationStatus[row * builds + column] === '0' ? durationValues[row * builds + column] : NaN);
+            }
+            sortedRows = defaultOrder.slice().sort((a, b) => {
+                const x = keys[a], y = keys[b];
+                if (x !== x || y !== y) return (x !== x) - (y !== y); // NaN (no duration) last
+                return x < y ? -sortDirection : x > y ? sortDirection : a - b;
+            });
+            headers.forEach((th, index) => {
+                th.textContent = headerLabels[index] + (Number(th.dataset.column) === column ? (sortDirection > 0 ? ' ▲' : ' ▼') : '');
+            });
+            applySearch();
+        }
+
+        headers.forEach(th => th.addEventListener('click', () => sortBy(Number(th.dataset.column))));
+
+        render();
+        if (selected >= 0) {
+            updateChart(selected);
+        }
+    </script>
+    """
+
+
+def format_result_cell(status, text):
+    """Table cell for one build's result."""
+    if status == STATUS_NA:  # Show ✗ N/A in red
+        return f"<td style='color: red;'>✗ N/A</td>"
+    elif status == STATUS_FAIL:  # Show ✗ FAIL in red for values starting with $
+        return f"<td style='color: red;'>✗ FAIL</td>"
+    else:  # Otherwise, show result in green with a checkmark
+        return f"<td style='color: green;'>✔ {text}</td>"
+
+
+def js_number(value):
+    """Shortest JavaScript literal for a parsed duration; 0 where the chart has no number (FAIL, N/A)."""
+    if value != value or value in (float("inf"), float("-inf")):
+        return "0"
+    text = repr(value)
+    return text[:-2] if text.endswith(".0") else text
+
+
+def format_folder_labels(folders):
+    """Return (folder_labels, chart_labels) for the table headers and the chart."""
+    # Format folders for table headers and chart labels
+    folder_labels = []
+    for folder in folders:
+        try:
+            dt = datetime.strptime(folder, "%Y%m%d%H%M%S")  # Try parsing as timestamp
+            formatted_folder = dt.strftime("%d %b, %I:%M %p")
+        except ValueError:
+            formatted_folder = folder  # Use original if format is incorrect
+        folder_labels.append(f"Test ({formatted_folder})")
+    
+       # Format labels for chart (Test 1, Test 2, ...)
+    chart_labels = []
+    for i, _ in enumerate(folders):
+        chart_labels.append(f"Test {i + 1}")
+    return folder_labels, chart_labels
+
+
+def regression_badge_parts(regression):
+    """(label, tooltip) of the marker shown next to a regressed test's ID."""
+    return (f"▲ +{(regression['slowdown'] - 1) * 100:.0f}%",
+            f"baseline {regression['baseline']:g} s over {regression['samples']} builds, z = {regression['z']:g}")
+
+
+def format_regression_badge(regression):
+    """Marker next to the test ID of a regressed test, with the baseline in its tooltip."""
+    label, title = regression_badge_parts(regression)
+    return f"<span class='regression-badge' title='{title}'>{label}</span>"
+
+
+def write_report(output, matrix, regressions=()):
+    """Write the report for a DurationMatrix to the text stream 'output', chunk by chunk.
+
+    Table rows and the embedded chart data are emitted in chunks of ROW_CHUNK
+    tests, so the document is never held in memory as a whole. The chart data is
+    embedded pre-parsed and columnar: dictionary-encoded descriptions, a flat
+    tests × builds array of numbers and one status character per cell.
+    Regressed tests (see detect_regressions) are listed first, worst first, and highlighted.
+    """
+    folders = matrix.folders
+    builds = len(folders)
+    folder_labels, chart_labels = format_folder_labels(folders)
+    flagged = {regression["row"]: regression for regression in regressions}
+    order = range(len(matrix))
+    if flagged:
+        order = [regression["row"] for regression in regressions]
+        order.extend(row for row in range(len(matrix)) if row not in flagged)
+
+    # ✅ HTML Header and Table
+    output.write(REPORT_HEAD)
+    output.write(TABLE_HEAD)
+    # Add columns for each folder (build)
+    output.write("".join(f"<th>{label}</th>" for label in folder_labels) + "</tr>")
+
+    cell_html = {}  # (status, text index) -> formatted cell, so repeated results are formatted once
+    chunk = []
+    for row in order:
+        cells = []
+        for cell in range(row * builds, (row + 1) * builds):
+            key = (matrix.status[cell], matrix.text_of[cell])
+            html = cell_html.get(key)
+            if html is None:
+                html = cell_html[key] = format_result_cell(key[0], matrix.texts[key[1]])
+            cells.append(html)
+        description = matrix.descriptions[matrix.description_of[row]]
+        regression = flagged.get(row)
+        if regression is None:
+            chunk.append(f"<tr><td>{matrix.test_ids[row]}</td><td>{description}</td>{''.join(cells)}</tr>")
+        else:
+            chunk.append(f"<tr class='regression'><td>{matrix.test_ids[row]}{format_regression_badge(regression)}</td>"
+                         f"<td>{description}</td>{''.join(cells)}</tr>")
+        if len(chunk) >= ROW_CHUNK:
+            output.write("".join(chunk))
+            chunk.clear()
+    output.write("".join(chunk))
+    output.write(TABLE_TAIL)
+
+    output.write(SCRIPT_HEAD)
+    output.write(f"        const descriptions = {json.dumps(matrix.descriptions)};\n")
+    output.write(f"        const descriptionOf = [{','.join(str(matrix.description_of[row]) for row in order)}];\n")
+    # ✅ tests × builds, row-major (in table order), as plain numbers: updateChart() only slices this array
+    output.write("        const durationValues = [")
+    values = matrix.values
+    for start in range(0, len(order), ROW_CHUNK):
+        if start:
+            output.write(",")
+        if flagged:
+            rows = order[start:start + ROW_CHUNK]
+            output.write(",".join(",".join(map(js_number, values[row * builds:(row + 1) * builds])) for row in rows))
+        else:
+            output.write(",".join(map(js_number, values[start * builds:(start + ROW_CHUNK) * builds])))
+    output.write("];\n")
+    # One character per cell: 0 = pass, 1 = FAIL, 2 = N/A
+    status = matrix.status
+    if flagged:
+        status = bytearray()
+        for row in order:
+            status += matrix.status[row * builds:(row + 1) * builds]
+    output.write(f'        const durationStatus = "{bytes(code + 48 for code in status).decode("ascii")}";\n')
+    output.write(f"""        const folders = {json.dumps(folders)};
+        const folderLabels = {json.dumps(folder_labels)};
+        const chartLabels={json.dumps(chart_labels)};
+""")
+    output.write(CHART_SCRIPT)
+    output.write(TABLE_SCRIPT)
+    output.write(REPORT_END)
+
+
+def write_large_report(output, matrix, regressions=()):
+    """Write the large-suite variant of the report for a DurationMatrix to 'output'.
+
+    No table rows are written: the page embeds the matrix once, compactly (test IDs,
+    deduplicated descriptions and Duration strings, one string index per cell), and
+    draws only the rows in view. Search and sort run over these arrays in the browser.
+    """
+    folders = matrix.folders
+    folder_labels, chart_labels = format_folder_labels(folders)
+
+    output.write(REPORT_HEAD)
+    output.write(LARGE_TABLE_HEAD)
+    output.write("".join(f'<th data-column="{build}">{label}</th>' for build, label in enumerate(folder_labels)))
+    output.write('</tr></thead>\n                    <tbody id="telemetryRows"></tbody>')
+    output.write(TABLE_TAIL)
+
+    output.write(SCRIPT_HEAD)
+    output.write("        const testIds = [")
+    for start in range(0, len(matrix.test_ids), ROW_CHUNK):
+        if start:
+            output.write(",")
+        output.write(json.dumps(matrix.test_ids[start:start + ROW_CHUNK])[1:-1])
+    output.write("];\n")
+    output.write(f"        const descriptions = {json.dumps(matrix.descriptions)};\n")
+    output.write(f"        const descriptionOf = [{','.join(map(str, matrix.description_of))}];\n")
+    # Distinct Duration strings with their status (0 pass, 1 FAIL, 2 N/A) and parsed value
+    parsed = [parse_duration(text) for text in matrix.texts]
+    output.write(f"        const texts = {json.dumps(matrix.texts)};\n")
+    output.write(f'        const textStatus = "{"".join(str(status) for status, _, _ in parsed)}";\n')
+    output.write(f"        const textValues = [{','.join(js_number(value) for _, value, _ in parsed)}];\n")
+    # ✅ tests × builds, row-major: one index into 'texts' per cell
+    output.write("        const textOf = [")
+    step = ROW_CHUNK * max(len(folders), 1)
+    for start in range(0, len(matrix.text_of), step):
+        if start:
+            output.write(",")
+        output.write(",".join(map(str, matrix.text_of[start:start + step])))
+    output.write("];\n")
+    badges = [[regression["row"], *regression_badge_parts(regression)] for regression in regressions]
+    output.write(f"        const regressions = {json.dumps(badges)};\n")
+    output.write(f"""        const folders = {json.dumps(folders)};
+        const folderLabels = {json.dumps(folder_labels)};
+        const chartLabels={json.dumps(chart_labels)};
+""")
+    output.write(LARGE_DATA_SCRIPT)
+    output.write(CHART_SCRIPT)
+    output.write(LARGE_TABLE_SCRIPT)
+    output.write(REPORT_END)
+
+
+# ✅ Diff report: one table of the tests that changed between two runs, full width (no chart)
+DIFF_TABLE_HEAD = """                <style>
+                    .table-container { width: 100%; max-width: 100%; max-height: none; }
+                    .diff-summary { padding: 0 0 10px 0; }
+                    .change-broken, .change-slower, .change-removed { color: #c62828; font-weight: bold; }
+                    .change-fixed, .change-faster { color: #2e7d32; font-weight: bold; }
+                </style>
+"""
+DIFF_CHANGE_LABELS = {
+    "broken": "✗ broken", "slower": "▲ slower", "removed": "− removed", "new": "+ new",
+    "status": "status changed", "fixed": "✔ fixed", "faster": "▼ faster",
+}
+
+
+def write_diff_report(output, base, head, changes, summary):
+    """Write the diff report (changed tests between the 'base' and 'head' runs, see diff_builds) to 'output'."""
+    base_label, head_label = format_folder_labels([base, head])[0]
+    counts = ", ".join(f"{summary[kind]} {kind}" for kind in DIFF_CHANGE_LABELS if summary[kind])
+    output.write(REPORT_HEAD)
+    output.write(DIFF_TABLE_HEAD)
+    output.write(f"""                <div class="diff-summary"><b>{html.escape(base_label)} → {html.escape(head_label)}</b>:
+                    {len(changes)} of {summary['unchanged'] + len(changes)} tests changed{' (' + counts + ')' if counts else ''}</div>
+                <table id="diffTable">
+                    <tr><th>ID</th><th>Description</th><th>Change</th><th>{html.escape(base_label)}</th>
+                        <th>{html.escape(head_label)}</th><th>Δ s</th><th>Δ %</th></tr>
+""")
+    for start in range(0, len(changes), ROW_CHUNK):
+        chunk = []
+        for change in changes[start:start + ROW_CHUNK]:
+            delta = "" if change["delta"] is None else f"{change['delta']:+.2f}"
+            ratio = "" if change["delta"] is None or change["ratio"] is None else f"{(change['ratio'] - 1) * 100:+.0f}%"
+            chunk.append(
+                f"<tr><td>{html.escape(change['ID'])}</td><td>{html.escape(change['description'])}</td>"
+                f"<td class='change-{change['change']}'>{DIFF_CHANGE_LABELS[change['change']]}</td>"
+                f"<td>{html.escape(change['base'] or '—')}</td><td>{html.escape(change['head'] or '—')}</td>"
+                f"<td>{delta}</td><td>{ratio}</td></tr>"
+            )
+        output.write("\n".join(chunk))
+    output.write("""
+                </table>
+            </div>
+        </div>
+        <div class="footer"></div>
+    """)
+    output.write(REPORT_END)
+
+
+def generate_diff_report(base, head, min_delta=MIN_DELTA, min_ratio=MIN_RATIO, open_browser=True, timings=False):
+    """Generate an HTML report of the tests that changed between the runs 'base' and 'head'.
+
+    Only changed tests are listed (status flips, new/removed tests, durations that moved
+    by at least min_delta seconds and min_ratio of the base), most impactful first.
+    Returns the report's path, or None if a run has no results.json.
+    """
+    metrics.reset()
+    get_run_index(TELEMETRY_DATA_PATH).refresh()
+    paths = {folder: results_path(folder) for folder in (base, head)}
+    for folder, path in paths.items():
+        if not results_exist(path):
+            print(f"❌ No results.json for run: {folder}")
+            return None
+
+    signatures = [(folder, stat_results(path).st_mtime_ns, stat_results(path).st_size) for folder, path in paths.items()]
+    key = fingerprint([REPORT_FORMAT_VERSION, "diff", base, head, min_delta, min_ratio] + signatures)
+    manifest = ReportManifest(REPORT_DIR)
+    report = manifest.lookup(key)
+    if report is not None:
+        print("✅ Telemetry data unchanged, diff report is up to date:" + report)
+    else:
+        with metrics.stage("load"):
+            diff_input = load_build_diff(head, base, lambda folder: load_records_cached(paths[folder]))
+        with metrics.stage("diff"):
+            changes, summary = diff_builds(diff_input, min_delta, min_ratio)
+        metrics.count("tests", len(diff_input.matrix))
+        os.makedirs(REPORT_DIR, exist_ok=True)
+        report = os.path.join(REPORT_DIR, f"diff_report_{base}_{head}.html")
+        try:
+            with metrics.stage("render"), open(report + ".tmp", "w", encoding="utf-8") as report_file:
+                write_diff_report(report_file, base, head, changes, summary)
+            os.replace(report + ".tmp", report)
+        except OSError as e:
+            print(f"❌ Error writing report: {e}")
+            return None
+        manifest.record(key, report)
+        print(f"✅ Diff report generated ({len(changes)} changed tests):" + report)
+    if open_browser:
+        webbrowser.open("file://" + os.path.realpath(report))
+    if timings:
+        print(metrics.summary())
+    return report
+
+
+# ✅ Series report: one test's long-history chart, full width (no table)
+SERIES_HEAD = """                <style>
+                    .table-container { width: 100%; max-width: 100%; max-height: none; padding-bottom: 70px; }
+                    .series-summary { padding: 0 0 10px 0; }
+                </style>
+"""
+SERIES_LABEL_FORMATS = {"raw": "%Y-%m-%d %H:%M", "day": "%Y-%m-%d", "week": "week of %Y-%m-%d"}
+SERIES_SCRIPT = """    <script>
+        // ✅ Raw points: one line; day/week rollups: the median with a min-max band
+        const labels = series.points.map(point => point.label);
+        const line = (label, key, extra) => Object.assign(
+            {label: label, data: series.points.map(point => point[key]), pointRadius: 0, borderWidth: 1, spanGaps: true}, extra);
+        const datasets = series.period === "raw"
+            ? [line("Duration (s)", "value", {borderColor: "#0071c5", borderWidth: 2})]
+            : [line("max", "max", {borderColor: "rgba(0, 113, 197, 0.3)"}),
+               line("min", "min", {borderColor: "rgba(0, 113, 197, 0.3)", backgroundColor: "rgba(0, 113, 197, 0.12)", fill: "-1"}),
+               line("median", "median", {borderColor: "#0071c5", borderWidth: 2})];
+        new Chart(document.getElementById("seriesChart").getContext("2d"), {
+            type: "line",
+            data: {labels: labels, datasets: datasets},
+            options: {animation: false, interaction: {mode: "index", intersect: false},
+                      scales: {y: {beginAtZero: true, title: {display: true, text: "seconds"}}}}
+        });
+    </script>
+"""
+
+
+def write_series_report(output, test_id, description, series):
+    """Write the series report (one test's downsampled history, see TelemetryStore.test_series) to 'output'."""
+    label_format = SERIES_LABEL_FORMATS[series["period"]]
+    points = [dict(point, label=datetime.fromtimestamp(point["t"], timezone.utc).strftime(label_format))
+              for point in series["points"]]
+    period = "results" if series["period"] == "raw" else f"{series['period']}s (min / median / max)"
+    output.write(REPORT_HEAD)
+    output.write(SERIES_HEAD)
+    output.write(f"""                <div class="series-summary"><b>{html.escape(test_id)}</b> {html.escape(description or '')}:
+                    {len(points)} of {series['total']} {period}</div>
+                <canvas id="seriesChart" height="110"></canvas>
+            </div>
+        </div>
+        <div class="footer"></div>
+""")
+    data = json.dumps({"period": series["period"], "points": points}, separators=(",", ":"))
+    output.write("    <script>const series = " + data.replace("</", "<\\/") + ";</script>\n")
+    output.write(SERIES_SCRIPT)
+    output.write(REPORT_END)
+
+
+def generate_series_report(test_id, points=SERIES_POINTS, period="raw", open_browser=True, timings=False):
+    """Generate an HTML chart of one test's history across every run in the SQLite store.
+
+    The history is downsampled to about 'points' points (LTTB), from the raw results
+    (period="raw") or from the day/week rollups with a min-max band. Returns the
+    report's path, or None if the store has no such test.
+    """
+    metrics.reset()
+    with metrics.stage("ingest"):
+        store = get_telemetry_store(TELEMETRY_DATA_PATH)
+        store.ingest()
+    with metrics.stage("series"):
+        series = store.test_series(test_id, points, period)
+    if series is None:
+        print(f"❌ No history for test: {test_id}")
+        return None
+    metrics.count("points", len(series["points"]))
+
+    key = fingerprint([REPORT_FORMAT_VERSION, "series", test_id, points, series])
+    manifest = ReportManifest(REPORT_DIR)
+    report = manifest.lookup(key)
+    if report is not None:
+        print("✅ Telemetry data unchanged, series report is up to date:" + report)
+    else:
+        os.makedirs(REPORT_DIR, exist_ok=True)
+        safe_id = re.sub(r"[^\w.-]", "_", test_id)
+        report = os.path.join(REPORT_DIR, f"series_report_{safe_id}_{period}.html")
+        try:
+            with metrics.stage("render"), open(report + ".tmp", "w", encoding="utf-8") as report_file:
+                write_series_report(report_file, test_id, store.describe(test_id), series)
+            os.replace(report + ".tmp", report)
+        except OSError as e:
+            print(f"❌ Error writing report: {e}")
+            return None
+        manifest.record(key, report)
+        print(f"✅ Series report generated ({len(series['points'])} of {series['total']} points):" + report)
+    if open_browser:
+        webbrowser.open("file://" + os.path.realpath(report))
+    if timings:
+        print(metrics.summary())
+    return report
+
+
+def write_report_file(path, matrix, regressions, mode):
+    """Render the report of 'matrix' to 'path' (see generate_html_report for 'mode'); returns its size in bytes."""
+    # ✅ Stream into a temporary file so a failed run never leaves a half-written report behind
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as report_file:
+        if mode == "large" or (mode == "auto" and len(matrix) > LARGE_REPORT_ROWS):
+            write_large_report(report_file, matrix, regressions)
+        else:
+            write_report(report_file, matrix, regressions)
+    size = os.path.getsize(temp_path)
+    os.replace(temp_path, path)
+    return size
+
+
+def generate_html_report(builds=5, use_store=False, regression_window=None, mode="auto",
+                         open_browser=True, timings=False):
+    """Generate an HTML report with interactive Chart.js visualization.
+
+    builds            -- number of latest runs to include
+    use_store         -- read runs from the SQLite history (see telemetry_store) after an incremental ingest
+    regression_window -- previous builds used as the regression baseline (0 = no regression analysis);
+                         None = the displayed builds (see regression_baseline). Each baseline build
+                         beyond 'builds' is one more results.json to read and parse
+    mode              -- "table" (every row in the HTML), "large" (virtualized, see write_large_report)
+                         or "auto" (large above LARGE_REPORT_ROWS tests)
+    open_browser      -- open the report in the default browser when done
+    timings           -- print the time spent per stage (see 'metrics') when done
+
+    Returns the report's path. If the selected runs are unchanged since an earlier report
+    with the same options (see ReportManifest), that report is returned without re-rendering.
+    """
+    metrics.reset()
+    with metrics.stage("total"):
+        report = _generate_html_report(builds, use_store, regression_window, mode, open_browser)
+    if timings:
+        print(metrics.summary())
+    return report
+
+
+def _generate_html_report(builds, use_store, regression_window, mode, open_browser):
+    regression_window = regression_baseline(builds, regression_window)
+    store = None
+    if use_store:
+        with metrics.stage("ingest"):
+            store = get_telemetry_store(TELEMETRY_DATA_PATH)
+            store.ingest()
+    with metrics.stage("scan"):
+        folders = get_latest_folders(max(builds, regression_window + 1), store)
+
+    # ✅ Same runs (and results.json mtime/size) and options as an earlier report: reuse it
+    with metrics.stage("manifest"):
+        if store is not None:
+            signatures = store.run_signatures(folders)
+            signatures = [(folder, signatures.get(folder)) for folder in folders]
+        else:
+            signatures = results_signatures(folders, [results_path(folder) for folder in folders])
+        key = fingerprint([REPORT_FORMAT_VERSION, builds, regression_window, mode, use_store] + signatures)
+        manifest = ReportManifest(REPORT_DIR)
+        existing = manifest.lookup(key)
+    if existing is not None:
+        print("✅ Telemetry data unchanged, report is up to date:" + existing)
+        if open_browser:
+            webbrowser.open("file://" + os.path.realpath(existing))
+        return existing
+
+    # ✅ The baseline builds are loaded with the displayed ones, but only fill in their tests
+    with metrics.stage("load"):  # ✅ Read, parse and aggregate: interleaved when streaming
+        matrix = get_duration_matrix(folders, store, builds)
+    with metrics.stage("regressions"):
+        regressions = detect_regressions(matrix, regression_window) if regression_window > 0 else []
+    matrix.drop_builds(range(min(builds, len(matrix.folders))))
+    metrics.count("folders", len(matrix.folders))
+    metrics.count("tests", len(matrix))
+    if regressions:
+        print(f"⚠️ {len(regressions)} regression(s) in the latest build, listed first in the report")
+
+    # Generate an incremental filename (the manifest keeps the next free number)
+    if not os.path.exists(REPORT_DIR):
+        os.makedirs(REPORT_DIR)  # Create the directory if it doesn't exist
+    random_filename = manifest.next_filename()
     try:
-        with open(random_filename, "w", encoding="utf-8") as report_file:
-            report_file.write(html_content)
+        with metrics.stage("render"):
+            metrics.count("bytes_written", write_report_file(random_filename, matrix, regressions, mode))
+        manifest.record(key, random_filename)
         print("✅ Telemetry report generated:" + random_filename)
-        webbrowser.open("file://" + os.path.realpath(random_filename))  # Open the file in the default browser
+        if open_browser:
+            webbrowser.open("file://" + os.path.realpath(random_filename))  # Open the file in the default browser
+        return random_filename
     except OSError as e:
         print(f"❌ Error writing report: {e}")	  
 
+# ✅ Batch mode: keys of one job in a --batch jobs file (see generate_batch_reports)
+BATCH_JOB_KEYS = ("root", "output", "builds", "runs", "since", "until", "regression_window", "mode")
+
+
+def load_batch_jobs(path):
+    """Read a --batch jobs file: a JSON list of jobs (see generate_batch_reports). Raises ValueError if malformed."""
+    with open(path, "r", encoding="utf-8") as jobs_file:
+        jobs = json.load(jobs_file)
+    if not isinstance(jobs, list):
+        raise ValueError(f"{path}: expected a JSON list of jobs")
+    for number, job in enumerate(jobs, 1):
+        if not isinstance(job, dict) or not job.get("output"):
+            raise ValueError(f"{path}: job {number} has no 'output'")
+        unknown = sorted(set(job) - set(BATCH_JOB_KEYS))
+        if unknown:
+            raise ValueError(f"{path}: job {number} has unknown key(s): {', '.join(unknown)}")
+        if job.get("mode", "auto") not in ("auto", "table", "large"):
+            raise ValueError(f"{path}: job {number} has an unknown mode: {job['mode']}")
+    return jobs
+
+
+def load_batch_run(path):
+    """(records, None) for one run of a batch, or (None, error) if it can't be read. Module-level for process pools."""
+    try:
+        return load_records_cached(path), None
+    except (OSError, ValueError) as e:
+        return None, str(e)
+
+
+def generate_batch_reports(jobs, workers=LOADER_WORKERS):
+    """Generate one report per job in a single process; returns one result dict per job, in job order.
+
+    Each job is a dict:
+      output            -- report path (required)
+      root              -- telemetry root (default: TELEMETRY_DATA_PATH)
+      builds            -- number of latest runs to include (default: 5)
+      runs              -- explicit run names, newest first, instead of the latest runs; the job
+                           fails if one of them has no results.json
+      since, until      -- only runs started in this range, in epoch seconds (see RunIndex.page)
+      regression_window -- as for generate_html_report (default: the displayed builds)
+      mode              -- as for generate_html_report (default: "auto")
+
+    Jobs share the run indexes, the records cache and one loader pool ('workers',
+    LOADER_MODE, at most LOADER_MAX_BYTES of results.json loaded ahead), and every run
+    is read and parsed once however many jobs select it: the runs of all jobs are loaded
+    in job order, ahead of the report being rendered, and a run is released after the
+    last job that uses it. Jobs reading the same runs build one matrix between them. A
+    job whose runs and options are unchanged since its last report (see ReportManifest)
+    is not rendered again. Each result holds the job's "output", "status" ("written",
+    "unchanged" or "failed", with an "error"), "runs" (in the report), "read" (with the
+    regression baseline), "shared" (of those, runs already loaded for an earlier job),
+    "tests" and per-stage "seconds".
+    """
+    metrics.reset()
+    results, timers, plans = [], [], []
+    refreshed = set()
+    manifests = {}  # report directory -> ReportManifest, shared by the jobs writing there
+    for job in jobs:
+        job_metrics = StageMetrics()
+        timers.append(job_metrics)
+        output = job["output"]
+        root = job.get("root") or TELEMETRY_DATA_PATH
+        builds = job.get("builds", 5)
+        regression_window = regression_baseline(builds, job.get("regression_window"))
+        mode = job.get("mode", "auto")
+        result = {"output": output, "status": "written", "runs": 0, "read": 0, "shared": 0, "tests": 0}
+        results.append(result)
+        with job_metrics.stage("total"), job_metrics.stage("scan"):
+            index = get_run_index(root)
+            if job.get("runs"):
+                if os.path.abspath(root) not in refreshed:
+                    index.refresh()  # ✅ Once per root, so named runs added since the last scan are found
+                    refreshed.add(os.path.abspath(root))
+                folders = list(job["runs"])
+            else:
+                folders = index.page(max(builds, regression_window + 1),
+                                     since=job.get("since"), until=job.get("until"))[0]
+            paths = [index.results_path(folder) for folder in folders]
+            # ✅ A named run without results (e.g. a typo in the jobs file) fails the job, not a narrower report
+            unknown = [folder for folder, path in zip(folders, paths)
+                       if job.get("runs") and not results_exist(path)]
+        if unknown:
+            result["status"], result["error"] = "failed", f"no results.json for run(s): {', '.join(unknown)}"
+            continue
+
+        # ✅ Same runs (and results.json mtime/size) and options as this output's last report: keep it
+        with job_metrics.stage("total"), job_metrics.stage("manifest"):
+            key = fingerprint([REPORT_FORMAT_VERSION, "batch", os.path.abspath(output), builds,
+                               regression_window, mode] + results_signatures(folders, paths))
+            report_dir = os.path.abspath(os.path.dirname(output) or ".")
+            manifest = manifests.get(report_dir)
+            if manifest is None:
+                manifest = manifests[report_dir] = ReportManifest(report_dir)
+            unchanged = manifest.lookup(key) is not None
+        if unchanged:
+            result["status"] = "unchanged"
+        else:
+            plans.append((job_metrics, result, folders, paths, builds, regression_window, mode, manifest, key))
+
+    # ✅ Jobs reading the same runs share one matrix: builds add their new tests in order, so the
+    # rows a job shows are a prefix of the rows of the job showing the most builds (DurationMatrix.head)
+    groups = {}
+    for plan in plans:
+        group = groups.setdefault(tuple(plan[3]), {"builds": 0, "jobs": 0})
+        group["builds"] = max(group["builds"], plan[4])
+        group["jobs"] += 1
+
+    # ✅ Every run once, in the order the jobs need them; the pool keeps loading ahead while reports render
+    uses = {}
+    for paths in groups:
+        for path in paths:
+            uses[path] = uses.get(path, 0) + 1
+    unique_paths = list(uses)
+    loads = zip(unique_paths, imap_ordered(load_batch_run, unique_paths, workers,
+                                           use_processes=LOADER_MODE == "process", size_of=results_size))
+    loaded = {}
+    for job_metrics, result, folders, paths, builds, regression_window, mode, manifest, key in plans:
+        group = groups[tuple(paths)]
+        group["jobs"] -= 1
+        result["read"] = len(paths)
+        with job_metrics.stage("total"):
+            if "matrix" not in group and "error" not in group:
+                with job_metrics.stage("load"):
+                    result["shared"] = sum(1 for path in paths if path in loaded)
+                    missing = {path for path in paths if path not in loaded}
+                    while missing:
+                        path, run = next(loads)
+                        loaded[path] = run
+                        missing.discard(path)
+                        metrics.count("runs_loaded")
+                runs = [loaded[path] for path in paths]
+                for path in paths:
+                    uses[path] -= 1
+                    if not uses[path]:
+                        del loaded[path]  # ✅ No later job needs it
+                errors = [error for _, error in runs if error is not None]
+                if errors:
+                    group["error"] = errors[0]
+                else:
+                    with job_metrics.stage("matrix"):
+                        matrix = DurationMatrix(folders, group["builds"])
+                        present, rows_after = [], []
+                        for build, (records, _) in enumerate(runs):
+                            if records is not None:
+                                present.append(build)
+                                for test in records:
+                                    matrix.add_record(build, test)
+                            rows_after.append(len(matrix))
+                        matrix.drop_builds(present)
+                        group["matrix"], group["rows_after"] = matrix, rows_after
+                del runs
+            else:
+                result["shared"] = len(paths)
+            if "error" in group:
+                result["status"], result["error"] = "failed", group["error"]
+                continue
+
+            with job_metrics.stage("matrix"):
+                shown = min(builds, len(folders))
+                matrix = group["matrix"].head(group["rows_after"][shown - 1] if shown else 0, builds)
+                if not group["jobs"]:
+                    del group["matrix"]  # ✅ Last job of the group
+            with job_metrics.stage("regressions"):
+                regressions = detect_regressions(matrix, regression_window) if regression_window > 0 else []
+            matrix.drop_builds(range(min(builds, len(matrix.folders))))
+            result["runs"], result["tests"] = len(matrix.folders), len(matrix)
+            try:
+                with job_metrics.stage("render"):
+                    os.makedirs(os.path.dirname(result["output"]) or ".", exist_ok=True)
+                    metrics.count("bytes_written", write_report_file(result["output"], matrix, regressions, mode))
+            except OSError as e:
+                result["status"], result["error"] = "failed", str(e)
+                continue
+            manifest.record(key, result["output"])
+
+    for result, job_metrics in zip(results, timers):
+        stages = job_metrics.snapshot()["stages"]
+        result["seconds"] = {name: stats["seconds"] for name, stats in stages.items()}
+        for name, seconds in result["seconds"].items():
+            metrics.observe(name, seconds)
+    metrics.count("jobs", len(results))
+    metrics.count("runs_selected", sum(len(plan[3]) for plan in plans))
+    return results
+
+
+def print_batch_results(results, elapsed):
+    """One line per batch job (status, runs, tests and where its time went), then the totals."""
+    for number, result in enumerate(results, 1):
+        seconds = result["seconds"]
+        stages = ", ".join(f"{name} {seconds[name] * 1000:.0f} ms"
+                           for name in ("scan", "load", "matrix", "regressions", "render") if name in seconds)
+        icon = {"written": "✅", "unchanged": "✅", "failed": "❌"}[result["status"]]
+        detail = (f"{result['runs']} runs, {result['tests']} tests"
+                  f" ({result['read']} runs read, {result['shared']} loaded by earlier jobs)")
+        if result["status"] == "unchanged":
+            detail = "unchanged"
+        elif result["status"] == "failed":
+            detail = result["error"]
+        print(f"{icon} [{number}/{len(results)}] {result['output']}: {detail}"
+              f" | {stages} | total {seconds.get('total', 0.0) * 1000:.0f} ms")
+    counts = {status: sum(1 for result in results if result["status"] == status)
+              for status in ("written", "unchanged", "failed")}
+    counters = metrics.snapshot()["counters"]
+    print(f"✅ {len(results)} report(s): {counts['written']} written, {counts['unchanged']} unchanged,"
+          f" {counts['failed']} failed; {counters.get('runs_loaded', 0)} unique run(s) loaded for"
+          f" {counters.get('runs_selected', 0)} selected, in {elapsed:.2f} s")
+
+
 def main():
     """Main function to generate telemetry report."""
-    generate_html_report()
+    parser = argparse.ArgumentParser(description="Generate the static telemetry HTML report.")
+    parser.add_argument("--builds", type=int, default=5, help="number of latest runs to include (default: 5)")
+    parser.add_argument("--store", action="store_true",
+                        help="read runs from the SQLite history store instead of scanning folders")
+    parser.add_argument("--regression-window", type=int,
+                        help="previous builds used as the regression baseline, 0 to disable (default: the other"
+                             " displayed builds; a larger window reads that many more runs)")
+    parser.add_argument("--mode", choices=["auto", "table", "large"], default="auto",
+                        help=f"large = virtualized table for big suites; auto picks it above {LARGE_REPORT_ROWS} tests")
+    parser.add_argument("--no-browser", action="store_true", help="don't open the report when it is written")
+    parser.add_argument("--timings", action="store_true",
+                        help="print the time spent per stage (scan, load, regressions, render) and bytes read")
+    parser.add_argument("--diff", nargs=2, metavar=("BASE", "HEAD"),
+                        help="write a diff report of the tests that changed between two runs instead")
+    parser.add_argument("--min-delta", type=float, default=MIN_DELTA,
+                        help=f"diff: smallest duration change in seconds that counts (default: {MIN_DELTA})")
+    parser.add_argument("--min-ratio", type=float, default=MIN_RATIO,
+                        help=f"diff: smallest duration change relative to the base that counts (default: {MIN_RATIO})")
+    parser.add_argument("--series", metavar="TEST_ID",
+                        help="write a chart of one test's history across every stored run instead")
+    parser.add_argument("--points", type=int, default=SERIES_POINTS,
+                        help=f"series: number of points the history is downsampled to (default: {SERIES_POINTS})")
+    parser.add_argument("--period", choices=["raw", *PERIODS], default="raw",
+                        help="series: chart raw results or per-day/per-week min/median/max (default: raw)")
+    parser.add_argument("--batch", metavar="JOBS",
+                        help="write one report per job listed in this JSON file (root, runs, output), in one process")
+    args = parser.parse_args()
+    if args.batch:
+        try:
+            jobs = load_batch_jobs(args.batch)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+        start = time.perf_counter()
+        results = generate_batch_reports(jobs)
+        print_batch_results(results, time.perf_counter() - start)
+        if args.timings:
+            print(metrics.summary())
+        if any(result["status"] == "failed" for result in results):
+            raise SystemExit(1)
+        return
+    if args.series:
+        generate_series_report(args.series, points=args.points, period=args.period,
+                               open_browser=not args.no_browser, timings=args.timings)
+        return
+    if args.diff:
+        generate_diff_report(*args.diff, min_delta=args.min_delta, min_ratio=args.min_ratio,
+                             open_browser=not args.no_browser, timings=args.timings)
+        return
+    generate_html_report(builds=args.builds, use_store=args.store, regression_window=args.regression_window,
+                         mode=args.mode, open_browser=not args.no_browser, timings=args.timings)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,70 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# ✅ Loading is dominated by file I/O latency on network shares, so threads beat the CPU count
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# LOADER_WORKERS: concurrent loads (1 = sequential). LOADER_MODE: "thread", or "process" for
+# parse-heavy large files (parsing holds the GIL, so only processes spread it over cores).
+LOADER_WORKERS = int(os.getenv("LOADER_WORKERS", str(DEFAULT_WORKERS)))
+LOADER_MODE = os.getenv("LOADER_MODE", "thread")
+# LOADER_MAX_BYTES: with a size_of, input bytes (e.g. results.json sizes) loaded ahead of the consumer at most
+LOADER_MAX_BYTES = int(os.getenv("LOADER_MAX_BYTES", str(16 * 1024 * 1024)))
+
+_process_pool = None
+
+
+def get_process_pool():
+    """Shared process pool for parsing, created on first use."""
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=min(LOADER_WORKERS, os.cpu_count() or 1))
+    return _process_pool
+
+
+def imap_ordered(func, items, workers=LOADER_WORKERS, use_processes=False, size_of=None, max_size=LOADER_MAX_BYTES):
+    """Yield func(item) for each item, in input order, running up to 'workers' calls concurrently.
+
+    At most 2 * workers results are in flight or buffered at a time, so a slow consumer
+    (e.g. report aggregation) bounds memory. With 'size_of' (item -> input size), the
+    items in flight or buffered also stay within 'max_size' (always at least one), since
+    a few large files can outweigh many small ones. With workers <= 1 this is a plain map.
+    'func' must be picklable (a module-level function) when use_processes is set.
+    """
+    items = list(items)
+    if workers <= 1 or len(items) <= 1:
+        for item in items:
+            yield func(item)
+        return
+
+    if use_processes:
+        executor = get_process_pool()
+    else:
+        executor = ThreadPoolExecutor(max_workers=min(workers, len(items)), thread_name_prefix="loader")
+    window = deque()  # (future, size)
+    position = ahead = 0
+
+    def submit():
+        nonlocal position, ahead
+        while position < len(items) and len(window) < workers * 2:
+            size = size_of(items[position]) if size_of is not None else 0
+            if window and ahead + size > max_size:
+                break
+            window.append((executor.submit(func, items[position]), size))
+            position += 1
+            ahead += size
+
+    try:
+        submit()
+        while window:
+            future, size = window.popleft()
+            result = future.result()
+            ahead -= size
+            submit()
+            yield result
+    finally:
+        for future, _ in window:
+            future.cancel()
+        if not use_processes:
+            executor.shutdown(wait=True)
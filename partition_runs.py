@@ -0,0 +1,60 @@
+"""Move the runs of a flat telemetry root into date partitions (<root>/YYYY/MM/DD/<run>).
+
+A run goes to the partition of the timestamp in its name (%Y%m%d%H%M%S), or of its
+latest update time when its name is not a timestamp. Runs still waiting for their
+results.json are left in place, and so is anything whose target already exists.
+Folders and archives are moved with os.rename (their mtimes are kept), so the
+server can keep running: the run index picks the moves up on its next refresh.
+
+Usage:
+    python partition_runs.py [--root PATH] [--depth 3] [--dry-run]
+"""
+import argparse
+import os
+import time
+
+from run_index import PARTITION_FORMATS, get_run_index, partition_for, run_name_time
+
+
+def partition_runs(root, depth=len(PARTITION_FORMATS), dry_run=False):
+    """Move every complete run directly in 'root' into its partition; returns [(run, partition)] moved."""
+    index = get_run_index(root)
+    moved = []
+    for run, (latest_time, _, _) in sorted(index.runs().items()):
+        if index.partition(run):
+            continue  # ✅ Already partitioned
+        source = index.run_path(run)
+        started = run_name_time(run)
+        partition = partition_for(started if started is not None else latest_time, depth)
+        target = os.path.join(root, *partition.split("/"), os.path.basename(source))
+        if os.path.exists(target):
+            print(f"⚠️ Skipped {run}: {target} already exists")
+            continue
+        if not dry_run:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.rename(source, target)
+        moved.append((run, partition))
+    return moved
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Move the runs of a flat telemetry root into date partitions.")
+    parser.add_argument("--root", default=os.getenv("TELEMETRY_DATA_PATH",
+                                                    os.path.join(os.getcwd(), "../", "telemetry_data")))
+    parser.add_argument("--depth", type=int, choices=range(1, len(PARTITION_FORMATS) + 1),
+                        default=len(PARTITION_FORMATS), help="3: YYYY/MM/DD (default), 2: YYYY/MM, 1: YYYY")
+    parser.add_argument("--dry-run", action="store_true", help="only print where each run would go")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    moved = partition_runs(args.root, args.depth, args.dry_run)
+    if args.dry_run:
+        for run, partition in moved:
+            print(f"{run} -> {partition}/")
+    partitions = len({partition for _, partition in moved})
+    verb = "Would move" if args.dry_run else "Moved"
+    print(f"✅ {verb} {len(moved)} run(s) into {partitions} partition(s) in {time.perf_counter() - start:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
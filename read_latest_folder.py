@@ -1,14 +1,23 @@
-import platform
-from flask import Flask, jsonify, render_template,send_from_directory
+from flask import Flask, Response, jsonify, send_from_directory, request
 from flask_cors import CORS
-import webbrowser
 import os
-import json
+import queue
 import threading
-import requests
+from werkzeug.datastructures import MultiDict
 from werkzeug.serving import run_simple  # Import run_simple
 import time
-import signal
+
+from duration_matrix import DurationMatrix
+from parallel_loader import LOADER_MODE, get_process_pool, imap_ordered
+from records_cache import load_results_cached
+from response_cache import EncodedResponseCache, fingerprint
+from results_cache import ResultsCache, parse_results_file
+from run_archive import results_exist, stat_results
+from run_index import get_run_index
+from run_watcher import RunWatcher
+from serving import DEFAULT_THREADS, serve
+from stage_metrics import StageMetrics
+from telemetry_query import MAX_LIMIT, TelemetryQuery, TestIndex
 
 app = Flask(__name__,static_folder='.')
 CORS(app, resources={r"/*": {"origins": "*"}})  # Enable CORS for all routes
@@ -22,55 +31,443 @@ DEFAULT_PATH = os.path.join(os.getcwd(), "../", "telemetry_data")
 # ✅ Use environment variable if set, otherwise fallback to DEFAULT_PATH
 TELEMETRY_DATA_PATH = os.getenv("TELEMETRY_DATA_PATH", DEFAULT_PATH)
 
+# ✅ Per-stage timings and counters of the hot paths, exposed at /metrics (METRICS=0 turns them off)
+metrics = StageMetrics(enabled=os.getenv("METRICS", "1") != "0")
+
+# ✅ Parsed results.json files are cached in memory (LRU, validated by mtime/size)
+RESULTS_CACHE_MB = int(os.getenv("RESULTS_CACHE_MB", "256"))
+def parse_in_process_pool(path):
+    """Hand a cache miss to the shared process pool (LOADER_MODE=process) for parse-heavy files."""
+    return get_process_pool().submit(parse_results_file, path).result()
+
+
+def measured(parse):
+    """Wrap a results.json parser with the 'parse' stage timer and the bytes_read counter."""
+    def parse_measured(path):
+        with metrics.stage("parse"):
+            data = parse(path)
+        if metrics.enabled and data is not None:
+            try:
+                metrics.count("bytes_read", stat_results(path).st_size)
+            except OSError:
+                pass
+        return data
+    return parse_measured
+
+
+results_cache = ResultsCache(
+    max_bytes=RESULTS_CACHE_MB * 1024 * 1024,
+    parse=measured(parse_in_process_pool if LOADER_MODE == "process" else parse_results_file),
+)
+
+# ✅ Serving: "dev" is werkzeug's thread-per-connection server, "production" a fixed worker pool
+# in SERVER_PROCESSES pre-forked processes (each open SSE stream holds one worker thread)
+SERVER_HOST = os.getenv("SERVER_HOST", "localhost")
+SERVER_PORT = int(os.getenv("SERVER_PORT", "5001"))
+SERVER_MODE = os.getenv("SERVER_MODE", "dev")
+SERVER_THREADS = int(os.getenv("SERVER_THREADS", str(DEFAULT_THREADS)))
+SERVER_PROCESSES = int(os.getenv("SERVER_PROCESSES", "1"))
+# ✅ Parse the latest runs in the background at startup, so the first request finds them cached
+WARM_UP = os.getenv("WARM_UP", "1") != "0"
+# ✅ Headless: don't open the dashboard in a browser (servers, containers, CI)
+HEADLESS = os.getenv("HEADLESS", "0") != "0"
+
+# ✅ Serialized (and pre-compressed) API responses, keyed by a fingerprint of the selected runs
+response_cache = EncodedResponseCache()
+
+# ✅ New runs are pushed to dashboards over Server-Sent Events ("auto" = inotify with polling fallback, or "poll")
+WATCH_MODE = os.getenv("WATCH_MODE", "auto")
+SSE_HEARTBEAT_SECONDS = 15
+_subscribers = set()
+_subscribers_lock = threading.Lock()
+_watcher = None
+
 
 def get_latest_folders(limit=3):
-    """Get the latest 'limit' folders sorted by latest update time (only folders with results.json)."""
-    folders = []
+    """Get the latest 'limit' folders sorted by latest update time (only folders with results.json).
 
-    if not os.path.exists(TELEMETRY_DATA_PATH):
-        return []  # Return an empty list if directory doesn't exist
+    Backed by the persistent run index, so only new or changed folders are stat'ed.
+    """
+    return get_run_index(TELEMETRY_DATA_PATH).latest(limit)
 
-    for folder in os.listdir(TELEMETRY_DATA_PATH):
-        folder_path = os.path.join(TELEMETRY_DATA_PATH, folder)
-        results_file = os.path.join(folder_path, "results.json")
 
-        if os.path.isdir(folder_path) and os.path.exists(results_file):  # ✅ Check if results.json exists
-            creation_time = os.path.getctime(folder_path)  
-            modification_time = os.path.getmtime(folder_path)  
+def results_path(folder):
+    """Path of a run's results.json: in the run folder, or inside the run's archive."""
+    return get_run_index(TELEMETRY_DATA_PATH).results_path(folder)
 
-            file_modification_time = os.path.getmtime(results_file)
-            modification_time = max(modification_time, file_modification_time)
 
-            latest_time = max(creation_time, modification_time)
-            folders.append((folder, latest_time))
+def get_telemetry_data(latest_folders=None, query=None):
+    """Fetch telemetry data from latest valid folders (folders with results.json).
 
-    latest_folders = sorted(folders, key=lambda x: x[1], reverse=True)[:limit]
-    return [folder[0] for folder in latest_folders]
+    Folders are read concurrently; see parallel_loader for LOADER_WORKERS / LOADER_MODE.
+    With a TelemetryQuery, records are filtered (via the cached per-run test-ID index)
+    and projected before anything is serialized.
+    """
+    result = {}
+    if latest_folders is None:
+        latest_folders = get_latest_folders()
+
+    def load(folder):
+        file_path = results_path(folder)
+        if query is not None and query.is_filtered:
+            return results_cache.derive(file_path, "test_index", TestIndex)
+        return results_cache.load(file_path), None
+
+    # ✅ Folders are loaded concurrently (LOADER_WORKERS), results come back in folder order
+    tests = 0
+    for folder, (data, index) in zip(latest_folders, imap_ordered(load, latest_folders)):
+        if data is not None:  # ✅ None if results.json disappeared since the scan
+            result[folder] = query.apply(data, index) if query is not None else data
+            tests += len(result[folder])
+    metrics.count("folders", len(result))
+    metrics.count("tests", tests)
 
+    return {"folders": list(result.keys()), "data": result}  # ✅ Return only folders that have data
 
-def get_telemetry_data():
-    """Fetch telemetry data from latest valid folders (folders with results.json)."""
-    result = {}
-    latest_folders = get_latest_folders()
 
-    for folder in latest_folders:
-        file_path = os.path.join(TELEMETRY_DATA_PATH, folder, "results.json")
 
-        if os.path.exists(file_path):  # ✅ Check again before reading
-            with open(file_path, "r") as file:
-                result[folder] = json.load(file)
+def get_runs_fingerprint(folders, extra=()):
+    """Fingerprint of the selected runs: folder names plus their results.json mtime/size."""
+    parts = list(extra)
+    for folder in folders:
+        try:
+            results_stat = stat_results(results_path(folder))
+        except OSError:
+            continue
+        parts.append((folder, results_stat.st_mtime_ns, results_stat.st_size))
+    return fingerprint(parts)
 
-    return {"folders": list(result.keys()), "data": result}  # ✅ Return only folders that have data
 
+def serialize(obj):
+    """Serialize exactly like jsonify() does outside debug mode (compact, trailing newline)."""
+    with metrics.stage("serialize"):
+        body = (app.json.dumps(obj, separators=(",", ":")) + "\n").encode("utf-8")
+    metrics.count("bytes_serialized", len(body))
+    return body
+
+
+def send_payload(payload):
+    """Send a pre-serialized payload, honouring If-None-Match and Accept-Encoding."""
+    encoding, body = payload.select(request.accept_encodings.quality)
+
+    if payload.matches(request.headers.get("If-None-Match")):
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(body, mimetype="application/json")
+        if encoding != "identity":
+            response.headers["Content-Encoding"] = encoding
+
+    response.set_etag(payload.etag_for(encoding))
+    response.headers["Vary"] = "Accept-Encoding"
+    response.headers["Cache-Control"] = "no-cache"  # ✅ Browser keeps the body but revalidates with the ETag
+    response.headers.add("Access-Control-Allow-Origin", "*")
+    return response
+
+
+def bad_request(message):
+    response = jsonify({"error": message})
+    response.status_code = 400
+    return response
 
 
 @app.route("/api/telemetry", methods=["GET"])
 def telemetry_api():
-    response = jsonify(get_telemetry_data())
-    response.headers.add("Access-Control-Allow-Origin", "*")
+    """Latest runs' results. Optional query parameters (see TelemetryQuery):
+    limit, cursor, test, prefix, fields, since, until -- e.g. ?test=TC_001&fields=ID,Duration&limit=20
+    """
+    try:
+        query = TelemetryQuery.from_args(request.args)
+    except ValueError as error:
+        return bad_request(str(error))
+    with metrics.stage("request"):
+        try:
+            with metrics.stage("scan"):
+                folders, next_cursor = get_run_index(TELEMETRY_DATA_PATH).page(query.limit, query.cursor, query.since, query.until)
+        except KeyError:
+            return bad_request(f"unknown cursor: {query.cursor}")
+
+        return send_payload(get_telemetry_payload(folders, next_cursor, query))
+
+
+def get_telemetry_payload(folders, next_cursor, query):
+    """Cached, encoded /api/telemetry response for one page of runs."""
+    def build():
+        with metrics.stage("aggregate"):
+            telemetry_data = get_telemetry_data(folders, query)
+        telemetry_data["next_cursor"] = next_cursor
+        return serialize(telemetry_data)
+
+    # ✅ The cursor is part of the payload: the same runs with an older run appearing later is another response
+    return response_cache.get_or_build(get_runs_fingerprint(folders, query.key() + (next_cursor,)), build)
+
+
+def warm_up():
+    """Build the default /api/telemetry response (parsing the latest runs) ahead of the first request."""
+    start = time.perf_counter()
+    try:
+        query = TelemetryQuery.from_args(MultiDict())
+        folders, next_cursor = get_run_index(TELEMETRY_DATA_PATH).page(query.limit, query.cursor, query.since, query.until)
+        get_telemetry_payload(folders, next_cursor, query)
+    except Exception as error:  # ✅ Best effort: the first request builds it instead
+        print(f"⚠️ Warm-up failed: {error}")
+        return
+    print(f"✅ Warmed up {len(folders)} runs in {time.perf_counter() - start:.2f} s")
+
+
+def get_duration_matrix(folders):
+    """DurationMatrix of the given folders (newest first), built from the parsed-results cache.
+
+    Only the newest folder adds tests: the others are the regression baseline.
+    """
+    matrix = DurationMatrix(folders, row_builds=1)
+    load = lambda folder: results_cache.load(results_path(folder))
+    present = []
+    for build, data in enumerate(imap_ordered(load, folders)):
+        if data is not None:
+            present.append(build)
+            for record in data:
+                matrix.add_record(build, record)
+    matrix.drop_builds(present)
+    return matrix
+
+
+@app.route("/api/regressions", methods=["GET"])
+def regressions_api():
+    """Tests whose duration in the latest run is a significant slowdown against the previous runs.
+
+    ?window=20 (baseline runs) &z=3.5 &min_slowdown=1.2 &limit=100 (regressions returned, worst first)
+    """
+    # ✅ Imported on first use: numpy adds noticeably to server startup
+    from regressions import MIN_SLOWDOWN, REGRESSION_WINDOW, Z_THRESHOLD, detect_regressions
+
+    try:
+        window = int(request.args.get("window", REGRESSION_WINDOW))
+        limit = int(request.args.get("limit", "100"))
+        z_threshold = float(request.args.get("z", Z_THRESHOLD))
+        min_slowdown = float(request.args.get("min_slowdown", MIN_SLOWDOWN))
+    except ValueError:
+        return bad_request("'window' and 'limit' must be integers, 'z' and 'min_slowdown' numbers")
+    if not 1 <= window < MAX_LIMIT:
+        return bad_request(f"'window' must be between 1 and {MAX_LIMIT - 1}")
+    if limit < 1:
+        return bad_request("'limit' must be positive")
+
+    folders = get_latest_folders(window + 1)
+
+    def build():
+        with metrics.stage("matrix"):
+            matrix = get_duration_matrix(folders)
+        with metrics.stage("regressions"):
+            regressions = detect_regressions(matrix, window, z_threshold, min_slowdown)
+        for regression in regressions:
+            del regression["row"]
+        return serialize({
+            "latest": matrix.folders[0] if matrix.folders else None,
+            "baseline": matrix.folders[1:],
+            "count": len(regressions),
+            "regressions": regressions[:limit],
+        })
+
+    key = ("regressions", window, limit, z_threshold, min_slowdown)
+    return send_payload(response_cache.get_or_build(get_runs_fingerprint(folders, key), build))
+
+
+def publish_run(folder, data):
+    """Send a newly completed run to every connected SSE client (serialized once)."""
+    message = f"event: run\ndata: {app.json.dumps({'folder': folder, 'data': data}, separators=(',', ':'))}\n\n"
+    with _subscribers_lock:
+        for subscriber in _subscribers:
+            subscriber.put(message)
+
+
+def ensure_watcher():
+    """Start the run watcher on first use, so importing this module has no side effects."""
+    global _watcher
+    with _subscribers_lock:
+        if _watcher is None:
+            _watcher = RunWatcher(
+                TELEMETRY_DATA_PATH,
+                load=lambda folder: results_cache.load(results_path(folder)),
+                on_run=publish_run,
+                mode=WATCH_MODE,
+            )
+            _watcher.start()
+
+
+@app.route("/api/telemetry/stream", methods=["GET"])
+def telemetry_stream():
+    """Server-Sent Events stream with one 'run' event per newly completed run."""
+    ensure_watcher()
+    subscriber = queue.Queue()
+    with _subscribers_lock:
+        _subscribers.add(subscriber)
+
+    def events():
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    yield subscriber.get(timeout=SSE_HEARTBEAT_SECONDS)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"  # ✅ Keeps proxies from closing idle connections
+        finally:
+            with _subscribers_lock:
+                _subscribers.discard(subscriber)
+
+    response = Response(events(), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
     return response
 
 
+DIFF_MAX_LIMIT = 100000
+
+
+def is_run_name(name):
+    """True if 'name' can only refer to a run folder directly under TELEMETRY_DATA_PATH."""
+    return bool(name) and name not in (".", "..") and os.path.basename(name) == name and "\\" not in name
+
+
+@app.route("/api/diff", methods=["GET"])
+def diff_api():
+    """Tests that changed between two runs: status flips, new/removed tests and duration deltas.
+
+    ?base=<run>&head=<run>[&limit=1000][&min_delta=0.05][&min_ratio=0.1]
+    Only changed tests are returned, most impactful first (see build_diff.CHANGE_KINDS);
+    'summary' counts every change, also beyond 'limit'.
+    """
+    # ✅ Imported on first use: numpy adds noticeably to server startup
+    from build_diff import MIN_DELTA, MIN_RATIO, diff_builds, load_build_diff
+
+    base, head = request.args.get("base"), request.args.get("head")
+    if not is_run_name(base) or not is_run_name(head):
+        return bad_request("'base' and 'head' must be run folder names")
+    try:
+        limit = int(request.args.get("limit", "1000"))
+        min_delta = float(request.args.get("min_delta", MIN_DELTA))
+        min_ratio = float(request.args.get("min_ratio", MIN_RATIO))
+    except ValueError:
+        return bad_request("'limit' must be an integer, 'min_delta' and 'min_ratio' numbers")
+    if not 1 <= limit <= DIFF_MAX_LIMIT:
+        return bad_request(f"'limit' must be between 1 and {DIFF_MAX_LIMIT}")
+    get_run_index(TELEMETRY_DATA_PATH).refresh()  # ✅ Runs archived since the last request
+    for folder in (base, head):
+        if not results_exist(results_path(folder)):
+            response = jsonify({"error": f"unknown run: {folder}"})
+            response.status_code = 404
+            return response
+
+    def build():
+        load = lambda folder: results_cache.load(results_path(folder))
+        with metrics.stage("diff"):
+            changes, summary = diff_builds(load_build_diff(head, base, load), min_delta, min_ratio)
+        for change in changes:
+            del change["row"]
+        return serialize({"base": base, "head": head, "summary": summary, "changes": changes[:limit]})
+
+    key = ("diff", limit, min_delta, min_ratio)
+    return send_payload(response_cache.get_or_build(get_runs_fingerprint([base, head], key), build))
+
+
+HISTORY_MAX_LIMIT = 10000
+
+
+@app.route("/api/history", methods=["GET"])
+def history_api():
+    """One test's results across all ingested runs (SQLite store), newest first.
+
+    ?test=TC_001[&limit=1000][&since=<epoch>][&until=<epoch>]
+    """
+    # ✅ Imported on first use: the SQLite store (and sqlite3) is only needed for history
+    from telemetry_store import get_telemetry_store
+
+    test_id = request.args.get("test")
+    if not test_id:
+        return bad_request("'test' is required")
+    try:
+        limit = int(request.args.get("limit", "1000"))
+        since = float(request.args["since"]) if "since" in request.args else None
+        until = float(request.args["until"]) if "until" in request.args else None
+    except ValueError:
+        return bad_request("'limit' must be an integer and 'since'/'until' epoch seconds")
+    if not 1 <= limit <= HISTORY_MAX_LIMIT:
+        return bad_request(f"'limit' must be between 1 and {HISTORY_MAX_LIMIT}")
+
+    store = get_telemetry_store(TELEMETRY_DATA_PATH)
+    store.ingest()  # ✅ Incremental: only runs added or changed since the last call are read
+    return jsonify({
+        "test": test_id,
+        "description": store.describe(test_id),
+        "history": store.test_history(test_id, limit, since, until),
+    })
+
+
+SERIES_MAX_POINTS = 10000
+
+
+@app.route("/api/series", methods=["GET"])
+def series_api():
+    """One test's duration history downsampled for charting (LTTB over raw results or day/week rollups).
+
+    ?test=TC_001[&points=500][&period=raw|day|week][&since=<epoch>][&until=<epoch>]
+    """
+    # ✅ Imported on first use: the SQLite store (and sqlite3) is only needed for history
+    from telemetry_store import PERIODS as SERIES_PERIODS, SERIES_POINTS, get_telemetry_store
+
+    test_id = request.args.get("test")
+    if not test_id:
+        return bad_request("'test' is required")
+    period = request.args.get("period", "raw")
+    if period != "raw" and period not in SERIES_PERIODS:
+        return bad_request(f"'period' must be one of raw, {', '.join(SERIES_PERIODS)}")
+    try:
+        points = int(request.args.get("points", str(SERIES_POINTS)))
+        since = float(request.args["since"]) if "since" in request.args else None
+        until = float(request.args["until"]) if "until" in request.args else None
+    except ValueError:
+        return bad_request("'points' must be an integer and 'since'/'until' epoch seconds")
+    if not 3 <= points <= SERIES_MAX_POINTS:
+        return bad_request(f"'points' must be between 3 and {SERIES_MAX_POINTS}")
+
+    store = get_telemetry_store(TELEMETRY_DATA_PATH)
+    store.ingest()  # ✅ Also brings the rollups of the new runs' days/weeks up to date
+    with metrics.stage("series"):
+        series = store.test_series(test_id, points, period, since, until)
+    if series is None:
+        response = jsonify({"error": f"unknown test: {test_id}"})
+        response.status_code = 404
+        return response
+    return jsonify({"test": test_id, "description": store.describe(test_id), **series})
+
+
+@app.route("/api/cache-stats", methods=["GET"])
+def cache_stats_api():
+    """Hit/miss counters of the parsed-results cache."""
+    return jsonify(results_cache.stats())
+
+
+@app.route("/metrics")
+def metrics_api():
+    """Per-stage timings, counters and cache statistics in the Prometheus text format."""
+    cache = results_cache.stats()
+    extra = [
+        (f"results_cache_{name}_total", "counter", f"Parsed-results cache {name}.", cache[name])
+        for name in ("hits", "misses", "coalesced", "evictions")
+    ]
+    extra += [
+        ("results_cache_entries", "gauge", "Parsed results.json files in the cache.", cache["entries"]),
+        ("results_cache_bytes", "gauge", "Estimated memory held by the parsed-results cache.", cache["bytes"]),
+        ("sse_subscribers", "gauge", "Open live-update streams.", len(_subscribers)),
+    ]
+    return Response(metrics.prometheus("telemetry", extra), mimetype="text/plain; version=0.0.4")
+
+
+@app.route("/healthz")
+def healthz():
+    """Readiness check: answers as soon as the server accepts requests, without touching the data."""
+    return jsonify({"status": "ok"})
+
+
 @app.route("/")
 def serve_html():
     """Serves the report_with_graph.html file."""
@@ -80,37 +477,66 @@ def serve_html():
 def serve_logo():
     return send_from_directory(os.getcwd(), "hotwire_logo.png")
 
-def run_server():
-    """Start the Flask server."""
-    run_simple('localhost', 5001, app, use_reloader=False)  # Remove shutdown_with_keyboard_interrupt
+def run_server(host=SERVER_HOST, port=SERVER_PORT, mode=SERVER_MODE,
+               threads=SERVER_THREADS, processes=SERVER_PROCESSES):
+    """Start the Flask server (blocks until interrupted)."""
+    def start_warm_up():
+        if WARM_UP:
+            threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+
+    if mode == "production":
+        if processes > 1:
+            # ✅ Worker processes don't share memory: let cache misses go through the on-disk
+            # records cache so each results.json is parsed once, not once per process
+            results_cache.parse = measured(load_results_cached)
+        serve(app, host, port, threads=threads, processes=processes, on_start=start_warm_up)
+    else:
+        start_warm_up()
+        # ✅ threaded=True: open SSE streams must not block other requests
+        run_simple(host, port, app, use_reloader=False, threaded=True)  # Remove shutdown_with_keyboard_interrupt
 
 def is_server_ready(url):
     """Checks if the Flask server is ready."""
+    import requests  # ✅ Only needed when a browser is opened
+
     try:
         response = requests.get(url)
         return response.status_code == 200
     except requests.exceptions.ConnectionError:
         return False
 
-if __name__ == "__main__":
-    server_thread = threading.Thread(target=run_server)
-    server_thread.start()
-
-    server_url = "http://127.0.0.1:5001/api/telemetry"
+def open_report_when_ready(server_url):
+    """Open the dashboard in the browser once the server answers."""
     while not is_server_ready(server_url):
         time.sleep(0.1)
 
+    import webbrowser
+
     report_file = os.path.abspath("report_with_graph.html")
     webbrowser.open("file://" + report_file)
 
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve the telemetry API.")
+    parser.add_argument("--host", default=SERVER_HOST, help="Interface to bind (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=SERVER_PORT, help="Port to listen on (default: %(default)s)")
+    parser.add_argument("--mode", choices=("dev", "production"), default=SERVER_MODE,
+                        help="dev: werkzeug thread per connection; production: fixed worker pool (default: %(default)s)")
+    parser.add_argument("--threads", type=int, default=SERVER_THREADS,
+                        help="Worker threads per process in production mode (default: %(default)s)")
+    parser.add_argument("--processes", type=int, default=SERVER_PROCESSES,
+                        help="Pre-forked worker processes in production mode, POSIX only (default: %(default)s)")
+    parser.add_argument("--headless", action="store_true", default=HEADLESS,
+                        help="Don't open the dashboard in a browser")
+    args = parser.parse_args()
+
+    browse_host = "127.0.0.1" if args.host in ("localhost", "0.0.0.0", "") else args.host
+    server_url = f"http://{browse_host}:{args.port}/healthz"
+    if not args.headless:
+        threading.Thread(target=open_report_when_ready, args=(server_url,), daemon=True).start()
+
     try:
-        server_thread.join()  # Wait for the server thread to finish
+        run_server(args.host, args.port, args.mode, args.threads, args.processes)
     except KeyboardInterrupt:
         print("Server termination requested.")
-        if platform.system() == "Windows":
-            os.kill(os.getpid(), signal.CTRL_C_EVENT)  # Simulate Ctrl+C on Windows
-        else:
-            os.kill(os.getpid(), signal.SIGTERM)  # Terminate on other platforms
-
-
-
@@ -0,0 +1,102 @@
+import hashlib
+import marshal
+import os
+import time
+
+from results_cache import parse_results_file
+from results_stream import RECORD_FIELDS, iter_results
+from run_archive import stat_results
+from run_index import RACY_WINDOW_NS, default_cache_dir
+
+RECORDS_CACHE_VERSION = 1
+
+
+def records_cache_path(path, fields=RECORD_FIELDS):
+    """Cache file for one results.json: <cache dir>/run_records/<hash of its absolute path and fields>.marshal."""
+    key = os.path.abspath(path) + "\0" + (",".join(fields) if fields is not None else "*")
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:24]
+    return os.path.join(default_cache_dir(), "run_records", f"{digest}.marshal")
+
+
+def load_records_cached(path, fields=RECORD_FIELDS):
+    """Like results_stream.load_records, but keeps each run's records in a local cache.
+
+    The cache file is validated against the results.json mtime/size, so a report that
+    selects mostly the same runs as the previous one only parses the new or changed
+    runs; the rest load with marshal at C speed. fields=None keeps whole records.
+    Module-level so it can run in a process pool.
+    """
+    try:
+        results_stat = stat_results(path)
+    except FileNotFoundError:
+        return None
+    signature = (RECORDS_CACHE_VERSION, results_stat.st_mtime_ns, results_stat.st_size)
+    cache_path = records_cache_path(path, fields)
+    records = _read_cache(cache_path, signature)
+    if records is not None:
+        return records
+
+    try:
+        records = parse_results_file(path) if fields is None else list(iter_results(path, fields))
+    except FileNotFoundError:
+        return None
+    if records is not None:
+        _write_cache(cache_path, signature, records, results_stat)
+    return records
+
+
+def iter_records_cached(path, fields=RECORD_FIELDS):
+    """A run's records through the same cache, streamed from results.json on a miss; None if it is gone.
+
+    A hit returns the cached list. A miss parses one record at a time (see results_stream),
+    keeping only 'fields', and writes the cache once the whole file has been read.
+    """
+    try:
+        results_stat = stat_results(path)
+    except FileNotFoundError:
+        return None
+    signature = (RECORDS_CACHE_VERSION, results_stat.st_mtime_ns, results_stat.st_size)
+    cache_path = records_cache_path(path, fields)
+    records = _read_cache(cache_path, signature)
+    if records is not None:
+        return records
+    return _stream_and_cache(path, fields, cache_path, signature, results_stat)
+
+
+def _stream_and_cache(path, fields, cache_path, signature, results_stat):
+    records = []
+    for record in iter_results(path, fields):
+        records.append(record)
+        yield record
+    _write_cache(cache_path, signature, records, results_stat)
+
+
+def _read_cache(cache_path, signature):
+    try:
+        with open(cache_path, "rb") as cache_file:
+            # ✅ One read: marshal.load on a file object issues a read() per value, about 14x slower
+            cached_signature, records = marshal.loads(cache_file.read())
+        if cached_signature == signature:
+            return records
+    except (OSError, EOFError, ValueError, TypeError):
+        pass  # ✅ Missing, stale format or truncated: parse again
+    return None
+
+
+def _write_cache(cache_path, signature, records, results_stat):
+    # ✅ A file modified within the racy window may still change without its mtime moving
+    if time.time_ns() - results_stat.st_mtime_ns <= RACY_WINDOW_NS:
+        return
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as cache_file:
+            marshal.dump((signature, records), cache_file)
+        os.replace(temp_path, cache_path)
+    except (OSError, ValueError):
+        pass  # ✅ The cache is optional: a read-only cache dir or an unmarshallable value just skips it
+
+
+def load_results_cached(path):
+    """Whole parsed results.json through the records cache (shared by all server worker processes)."""
+    return load_records_cached(path, fields=None)
@@ -0,0 +1,110 @@
+import math
+from statistics import median
+
+try:
+    import numpy as np
+except ImportError:  # ✅ Optional: falls back to a (much slower) pure-Python loop
+    np = None
+
+# A test regresses in the newest build when its duration is both far outside the noise of
+# its baseline (robust z-score) and meaningfully slower (ratio to the baseline median).
+REGRESSION_WINDOW = 20  # previous builds used as the baseline
+Z_THRESHOLD = 3.5
+MIN_SLOWDOWN = 1.2      # newest / baseline median
+MIN_SAMPLES = 5         # baseline builds with a number, below this a test is not judged
+MAD_SCALE = 1.4826      # MAD -> standard deviation for normally distributed noise
+MIN_SCALE = 0.01        # durations are reported to 1/100 s, so no baseline is tighter than that
+RELATIVE_NOISE = 0.01   # ... or than 1% of its median
+
+
+def detect_regressions(matrix, window=REGRESSION_WINDOW, z_threshold=Z_THRESHOLD,
+                       min_slowdown=MIN_SLOWDOWN, min_samples=MIN_SAMPLES):
+    """Tests of a DurationMatrix whose newest build (column 0) is a significant slowdown.
+
+    The baseline of each test is the median/MAD of its numeric durations over the
+    following 'window' builds (FAIL and N/A cells are ignored). Returns dicts with
+    row, ID, description, current, baseline, mad, z, slowdown and samples, worst first.
+    """
+    builds = len(matrix.folders)
+    window = min(window, builds - 1)
+    if window < 1 or not len(matrix):
+        return []
+    if np is not None:
+        found = _detect_numpy(matrix, builds, window, z_threshold, min_slowdown, min_samples)
+    else:
+        found = _detect_python(matrix, builds, window, z_threshold, min_slowdown, min_samples)
+    return [
+        {
+            "row": row,
+            "ID": matrix.test_ids[row],
+            "description": matrix.descriptions[matrix.description_of[row]],
+            "current": current,
+            "baseline": baseline,
+            "mad": mad,
+            "z": round(z, 2),
+            "slowdown": round(current / baseline, 3),
+            "samples": samples,
+        }
+        for row, current, baseline, mad, z, samples in found
+    ]
+
+
+def _noise_scale(mad, baseline):
+    return max(MAD_SCALE * mad, RELATIVE_NOISE * abs(baseline), MIN_SCALE)
+
+
+def _row_medians(sorted_rows, counts):
+    """Medians of row-sorted values whose first 'counts' entries per row are numbers (NaN sorts last)."""
+    rows = np.arange(sorted_rows.shape[0])
+    low = sorted_rows[rows, np.maximum(counts - 1, 0) // 2]
+    high = sorted_rows[rows, counts // 2]
+    medians = (low + high) / 2
+    medians[counts == 0] = np.nan
+    return medians
+
+
+def _detect_numpy(matrix, builds, window, z_threshold, min_slowdown, min_samples):
+    values = np.frombuffer(matrix.values, dtype=np.float64).reshape(len(matrix), builds)
+    current = values[:, 0]
+    baseline = values[:, 1:window + 1]
+    # ✅ Only rows that could flag are sorted (most tests have a current number, but not all)
+    candidates = np.flatnonzero(~np.isnan(current))
+    baseline = baseline[candidates]
+    current = current[candidates]
+
+    counts = np.count_nonzero(~np.isnan(baseline), axis=1)
+    medians = _row_medians(np.sort(baseline, axis=1), counts)
+    mads = _row_medians(np.sort(np.abs(baseline - medians[:, None]), axis=1), counts)
+    scale = np.maximum(np.maximum(MAD_SCALE * mads, RELATIVE_NOISE * np.abs(medians)), MIN_SCALE)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        z = (current - medians) / scale
+        flagged = (counts >= min_samples) & (medians > 0) & (z >= z_threshold) & (current >= medians * min_slowdown)
+    hits = np.flatnonzero(flagged)
+    hits = hits[np.argsort(-z[hits], kind="stable")]
+    return [
+        (int(candidates[i]), float(current[i]), float(medians[i]), float(mads[i]), float(z[i]), int(counts[i]))
+        for i in hits
+    ]
+
+
+def _detect_python(matrix, builds, window, z_threshold, min_slowdown, min_samples):
+    values = matrix.values
+    found = []
+    for row in range(len(matrix)):
+        start = row * builds
+        current = values[start]
+        if math.isnan(current):
+            continue
+        samples = [value for value in values[start + 1:start + window + 1] if not math.isnan(value)]
+        if len(samples) < min_samples:
+            continue
+        baseline = median(samples)
+        if baseline <= 0 or current < baseline * min_slowdown:
+            continue
+        mad = median(abs(value - baseline) for value in samples)
+        z = (current - baseline) / _noise_scale(mad, baseline)
+        if z >= z_threshold:
+            found.append((row, current, baseline, mad, z, len(samples)))
+    found.sort(key=lambda hit: -hit[4])
+    return found
@@ -0,0 +1,91 @@
+import json
+import os
+import re
+from collections import OrderedDict
+
+MANIFEST_FILE = ".report_manifest.json"
+MANIFEST_VERSION = 1
+MAX_REPORTS = 1000  # content hashes remembered (oldest forgotten first)
+
+_REPORT_NAME = re.compile(r"telemetry_report_(\d+)\.html$")
+
+
+class ReportManifest:
+    """Reports written to a report directory, keyed by a content hash of their inputs.
+
+    Also remembers the next free telemetry_report_<n>.html number, so picking an
+    output name is O(1) instead of probing _1, _2, ... one os.path.exists at a time.
+    The directory is listed once, when it has no manifest yet.
+    """
+
+    def __init__(self, report_dir):
+        self.report_dir = report_dir
+        self.path = os.path.join(report_dir, MANIFEST_FILE)
+        self.reports = OrderedDict()  # content hash -> report file name
+        self.next_index = None
+        self._load()
+
+    def lookup(self, key):
+        """Path of the report built from the inputs hashed to 'key', if it still exists."""
+        name = self.reports.get(key)
+        if name is not None:
+            path = os.path.join(self.report_dir, name)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def next_filename(self):
+        """Path for the next report: telemetry_report_<n>.html, n above every report written so far."""
+        if self.next_index is None:
+            self.next_index = self._scan_next_index()
+        path = os.path.join(self.report_dir, f"telemetry_report_{self.next_index}.html")
+        while os.path.exists(path):  # ✅ Only if another tool wrote reports behind the manifest's back
+            self.next_index += 1
+            path = os.path.join(self.report_dir, f"telemetry_report_{self.next_index}.html")
+        return path
+
+    def record(self, key, path):
+        """Remember that 'path' was built from the inputs hashed to 'key' and save the manifest."""
+        name = os.path.basename(path)
+        self.reports.pop(key, None)
+        self.reports[key] = name
+        while len(self.reports) > MAX_REPORTS:
+            self.reports.popitem(last=False)
+        match = _REPORT_NAME.match(name)
+        if match:
+            self.next_index = max(self.next_index or 1, int(match.group(1)) + 1)
+        self._save()
+
+    def _scan_next_index(self):
+        highest = 0
+        try:
+            with os.scandir(self.report_dir) as entries:
+                for entry in entries:
+                    match = _REPORT_NAME.match(entry.name)
+                    if match:
+                        highest = max(highest, int(match.group(1)))
+        except FileNotFoundError:
+            pass
+        return highest + 1
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as manifest_file:
+                manifest = json.load(manifest_file)
+        except (OSError, ValueError):
+            return
+        if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+            return
+        self.reports = OrderedDict(manifest.get("reports", []))
+        self.next_index = manifest.get("next_index")
+
+    def _save(self):
+        manifest = {"version": MANIFEST_VERSION, "next_index": self.next_index, "reports": list(self.reports.items())}
+        temp_path = self.path + ".tmp"
+        try:
+            os.makedirs(self.report_dir, exist_ok=True)
+            with open(temp_path, "w", encoding="utf-8") as manifest_file:
+                json.dump(manifest, manifest_file)
+            os.replace(temp_path, self.path)
+        except OSError:
+            pass  # ✅ The manifest is a cache: the next run rebuilds it with one directory listing
@@ -0,0 +1,97 @@
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+
+from single_flight import SingleFlight
+
+try:
+    import brotli  # ✅ Optional: only used when installed
+except ImportError:
+    brotli = None
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def fingerprint(parts):
+    """Content hash of the inputs a response was built from (e.g. folder + results.json mtime/size)."""
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(repr(part).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class EncodedPayload:
+    """A serialized response body with its pre-compressed variants and a strong ETag."""
+
+    def __init__(self, key, body):
+        self.etag = key
+        self.bodies = {"identity": body, "gzip": gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)}
+        if brotli is not None:
+            self.bodies["br"] = brotli.compress(body, quality=BROTLI_QUALITY)
+
+    def select(self, accept_quality):
+        """Pick the smallest encoding the client accepts; 'accept_quality' maps an encoding to its q-value."""
+        best = "identity"
+        for encoding in ("br", "gzip"):
+            if encoding in self.bodies and accept_quality(encoding) > 0 \
+                    and len(self.bodies[encoding]) < len(self.bodies[best]):
+                best = encoding
+        return best, self.bodies[best]
+
+    def etag_for(self, encoding):
+        """Each encoding is a distinct representation, so it gets its own entity tag."""
+        return self.etag if encoding == "identity" else f"{self.etag}-{encoding}"
+
+    def matches(self, if_none_match):
+        """True if any tag in an If-None-Match header refers to this payload (in any encoding)."""
+        if not if_none_match:
+            return False
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag == "*":
+                return True
+            tag = tag.removeprefix("W/").strip('"')
+            if tag == self.etag or tag.startswith(self.etag + "-"):
+                return True
+        return False
+
+
+class EncodedResponseCache:
+    """Small LRU of EncodedPayloads keyed by the fingerprint of their inputs."""
+
+    def __init__(self, max_entries=8):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._flights = SingleFlight()
+
+    def get(self, key):
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+            return payload
+
+    def get_or_build(self, key, serialize):
+        """Return the payload for 'key', calling serialize() -> bytes only on a miss (once for concurrent misses)."""
+        payload = self.get(key)
+        if payload is not None:
+            return payload
+
+        def build():
+            built = EncodedPayload(key, serialize())
+            with self._lock:
+                self._entries[key] = built
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            return built
+
+        return self._flights.do(key, build)[0]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,171 @@
+import json
+import sys
+import threading
+from collections import OrderedDict
+
+from run_archive import open_results, stat_results
+from single_flight import SingleFlight
+
+# Number of records measured when estimating the in-memory size of a parsed results list.
+SIZE_SAMPLE = 64
+
+
+def _deep_sizeof(value):
+    """Approximate memory held by a parsed JSON value (dicts, lists, strings, numbers)."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += sys.getsizeof(key) + _deep_sizeof(item)
+    elif isinstance(value, list):
+        for item in value:
+            size += _deep_sizeof(item)
+    return size
+
+
+def estimate_size(value):
+    """Estimate the memory held by parsed results, extrapolating from a sample of records."""
+    if isinstance(value, list) and len(value) > SIZE_SAMPLE:
+        step = len(value) // SIZE_SAMPLE
+        sample = value[::step][:SIZE_SAMPLE]
+        per_record = sum(_deep_sizeof(item) for item in sample) / len(sample)
+        return sys.getsizeof(value) + int(per_record * len(value))
+    return _deep_sizeof(value)
+
+
+def parse_results_file(path):
+    """Parse one results.json, in a folder or an archive (module-level so it can run in a process pool)."""
+    with open_results(path) as file:
+        return json.load(file)
+
+
+class _Entry:
+    __slots__ = ("signature", "value", "cost", "derived")
+
+    def __init__(self, signature, value, cost):
+        self.signature = signature
+        self.value = value
+        self.cost = cost
+        self.derived = {}  # name -> structure built from value (e.g. a test-ID index)
+
+
+class ResultsCache:
+    """In-process LRU cache of parsed results.json files.
+
+    Entries are validated against (mtime_ns, size) of the file on every lookup, so
+    only new or changed runs are re-parsed. 'max_bytes' bounds the estimated
+    memory of the cached parsed objects; least recently used entries are evicted
+    first. Cached values are shared between callers and must be treated as read-only.
+    'parse' is called with the path on a miss (e.g. to hand parsing to a process pool);
+    concurrent misses on the same file share one parse.
+    """
+
+    def __init__(self, max_bytes, parse=parse_results_file):
+        self.max_bytes = max_bytes
+        self.parse = parse
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # path -> _Entry
+        self._bytes = 0
+        self._flights = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def load(self, path):
+        """Return the parsed contents of 'path', or None if the file does not exist."""
+        try:
+            file_stat = stat_results(path)
+        except OSError:
+            self._discard(path)
+            return None
+        signature = (file_stat.st_mtime_ns, file_stat.st_size)
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry.signature == signature:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry.value
+
+        def parse():
+            value = self.parse(path)
+            self._store(path, signature, value)
+            return value
+
+        # ✅ Parse outside the lock so one large file doesn't block other requests
+        value, shared = self._flights.do((path, signature), parse)
+        with self._lock:
+            if shared:
+                self.coalesced += 1
+            else:
+                self.misses += 1
+        return value
+
+    def derive(self, path, name, build):
+        """Return (parsed, build(parsed)) for 'path'; build() runs once per cached version of the file.
+
+        Derived structures (indexes, matrices, ...) live and die with the cache entry
+        they were built from; their 'nbytes' attribute, if any, counts against the budget.
+        """
+        value = self.load(path)
+        if value is None:
+            return None, None
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry.value is value and name in entry.derived:
+                return value, entry.derived[name]
+
+        derived = build(value)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry.value is value and name not in entry.derived:
+                entry.derived[name] = derived
+                cost = getattr(derived, "nbytes", 0)
+                entry.cost += cost
+                self._bytes += cost
+                self._evict()
+        return value, derived
+
+    def _store(self, path, signature, value):
+        cost = estimate_size(value)
+        with self._lock:
+            old = self._entries.pop(path, None)
+            if old is not None:
+                self._bytes -= old.cost
+            if cost > self.max_bytes:
+                return
+            self._entries[path] = _Entry(signature, value, cost)
+            self._bytes += cost
+            self._evict()
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.cost
+            self.evictions += 1
+
+    def _discard(self, path):
+        with self._lock:
+            old = self._entries.pop(path, None)
+            if old is not None:
+                self._bytes -= old.cost
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Hit/miss counters and current memory usage, for monitoring."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
@@ -0,0 +1,91 @@
+import json
+import re
+import sys
+
+from run_archive import open_results
+
+# Fields the report pipeline uses; everything else in a record is dropped while parsing.
+RECORD_FIELDS = ("ID", "description", "Duration")
+CHUNK_SIZE = 1 << 20  # characters read per chunk
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_decoder = json.JSONDecoder()
+
+
+def iter_results(path, fields=RECORD_FIELDS, chunk_size=CHUNK_SIZE):
+    """Yield the records of a results.json array one at a time, keeping only 'fields'.
+
+    The file is read in chunks and each array element is decoded on its own, so
+    memory stays bounded by the chunk size plus one record, not by the file size.
+    'path' may point into an archive (see run_archive). Raises ValueError if the file
+    is not a JSON array.
+    """
+    with open_results(path) as file:
+        buffer, eof = "", False
+
+        def skip_whitespace(pos):
+            """Position of the next non-whitespace character, reading on as needed; len(buffer) at the end."""
+            nonlocal buffer, eof
+            pos = _WHITESPACE.match(buffer, pos).end()
+            while pos == len(buffer) and not eof:
+                buffer = file.read(chunk_size)
+                eof = not buffer
+                pos = _WHITESPACE.match(buffer).end()
+            return pos
+
+        pos = skip_whitespace(0)
+        if pos == len(buffer) or buffer[pos] != "[":
+            raise ValueError(f"{path}: expected a JSON array of test records")
+        pos = skip_whitespace(pos + 1)
+        if pos < len(buffer) and buffer[pos] == "]":
+            return
+
+        while True:
+            record = end = None
+            if pos < len(buffer):
+                if buffer[pos] in ",]":
+                    raise ValueError(f"{path}: expected a record, found {buffer[pos]!r}")
+                try:
+                    record, end = _decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                # ✅ A value that ends exactly at the buffer edge may be truncated (e.g. a number)
+                if end == len(buffer) and not eof:
+                    end = None
+            if end is None:
+                if eof:
+                    raise ValueError(f"{path}: unterminated JSON array")
+                chunk = file.read(chunk_size)
+                eof = not chunk
+                buffer = buffer[pos:] + chunk
+                pos = 0
+                continue
+
+            if isinstance(record, dict):
+                yield {field: record[field] for field in fields if field in record}
+            # ✅ Exactly one comma between records, none after the last one
+            pos = skip_whitespace(end)
+            if pos == len(buffer):
+                raise ValueError(f"{path}: unterminated JSON array")
+            if buffer[pos] == "]":
+                return
+            if buffer[pos] != ",":
+                raise ValueError(f"{path}: expected ',' or ']' after a record")
+            pos = skip_whitespace(pos + 1)
+
+
+def intern_value(value):
+    """Intern strings that repeat across runs (test IDs, descriptions) so each is stored once."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def load_records(path):
+    """All (projected) records of one results.json as a list, or None if the file is gone.
+
+    Module-level so that it can run in a process pool.
+    """
+    try:
+        return list(iter_results(path))
+    except FileNotFoundError:
+        return None
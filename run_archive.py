@@ -0,0 +1,273 @@
+import gzip
+import hashlib
+import io
+import json
+import os
+import posixpath
+import struct
+import tarfile
+import threading
+import time
+import zipfile
+import zlib
+
+RESULTS_FILE = "results.json"
+# Archived runs: <run>.tar.gz (etc.) next to the run folders, holding results.json at the
+# top level or in one directory (e.g. <run>/results.json)
+ARCHIVE_EXTENSIONS = (".tar.gz", ".tgz", ".tar", ".zip")
+# A results.json inside an archive is addressed as "<archive path>::results.json"
+ARCHIVE_SEPARATOR = "::"
+ARCHIVE_MEMBERS_VERSION = 1
+READ_CHUNK = 1 << 20
+
+_ZIP_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+_ZIP_LOCAL_SIGNATURE = b"PK\x03\x04"
+
+
+def archive_run_name(filename):
+    """Run name of an archive file name ("20250301120000.tar.gz" -> "20250301120000"), None if not an archive."""
+    for extension in ARCHIVE_EXTENSIONS:
+        if filename.endswith(extension) and len(filename) > len(extension):
+            return filename[:-len(extension)]
+    return None
+
+
+def archive_results_path(archive):
+    return archive + ARCHIVE_SEPARATOR + RESULTS_FILE
+
+
+def split_results_path(path):
+    """(archive path, member) for a results.json inside an archive, (None, path) for a plain file."""
+    archive, separator, member = path.rpartition(ARCHIVE_SEPARATOR)
+    return (archive, member) if separator else (None, path)
+
+
+def stat_results(path):
+    """os.stat() of a results.json, or of the archive holding it (its mtime/size validate the caches)."""
+    archive, _ = split_results_path(path)
+    return os.stat(archive if archive is not None else path)
+
+
+def results_exist(path):
+    """True if the results.json (in a folder or in an archive) can be opened."""
+    archive, _ = split_results_path(path)
+    if archive is None:
+        return os.path.isfile(path)
+    try:
+        get_archive_members().locate(archive)
+    except (OSError, ValueError):
+        return False
+    return True
+
+
+def open_results(path):
+    """Open a results.json as UTF-8 text, streaming it out of its archive without extracting it.
+
+    Raises FileNotFoundError if the file, the archive or the member is gone, and
+    ValueError if the archive can't be read (e.g. still being written).
+    """
+    archive, _ = split_results_path(path)
+    if archive is None:
+        return open(path, "r", encoding="utf-8")
+    return io.TextIOWrapper(open_archive_member(archive), encoding="utf-8")
+
+
+def open_archive_member(archive):
+    """Binary stream of the results.json in 'archive', read from its cached offset."""
+    location = get_archive_members().locate(archive)
+    kind = location["kind"]
+    if kind == "zip" and location["method"] not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+        return zipfile.ZipFile(archive).open(location["name"])  # ✅ bzip2/lzma members: through zipfile
+
+    file = open(archive, "rb")
+    try:
+        if kind == "zip":
+            file.seek(location["offset"])
+            header = _ZIP_LOCAL_HEADER.unpack(file.read(_ZIP_LOCAL_HEADER.size))
+            if header[0] != _ZIP_LOCAL_SIGNATURE:
+                raise ValueError(f"{archive}: bad zip member header")
+            file.seek(header[10] + header[11], os.SEEK_CUR)  # ✅ File name and extra field lengths
+            reader = _MemberReader(file, location["length"], location["method"] == zipfile.ZIP_DEFLATED)
+        elif kind == "tar":
+            file.seek(location["offset"])
+            reader = _MemberReader(file, location["length"])
+        else:
+            # ✅ gzip has no random access: the bytes before the member are still inflated,
+            # but skipped in bulk, without parsing a tar header per member
+            stream = gzip.GzipFile(fileobj=file)
+            skip = location["offset"]
+            while skip > 0:
+                try:
+                    skipped = len(stream.read(min(READ_CHUNK, skip)))
+                except (EOFError, zlib.error, gzip.BadGzipFile):
+                    skipped = 0
+                if not skipped:
+                    raise ValueError(f"{archive}: archive is truncated")
+                skip -= skipped
+            reader = _MemberReader(stream, location["length"], owned=(file,))
+    except BaseException:
+        file.close()
+        raise
+    return io.BufferedReader(reader, READ_CHUNK)
+
+
+class _MemberReader(io.RawIOBase):
+    """The next 'length' bytes of 'file', inflated (raw deflate, as in zip) if 'inflate'."""
+
+    def __init__(self, file, length, inflate=False, owned=()):
+        self._file = file
+        self._left = length
+        self._inflater = zlib.decompressobj(-zlib.MAX_WBITS) if inflate else None
+        self._owned = owned  # ✅ Closed with the reader (e.g. the file under a GzipFile)
+        self._pending = b""
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while self._pos == len(self._pending):
+            if self._left <= 0:
+                if self._inflater is None or self._inflater.eof:
+                    return 0
+                self._pending, self._pos = self._inflater.flush(), 0
+                self._inflater = None
+                continue
+            try:
+                chunk = self._file.read(min(READ_CHUNK, self._left))
+                if not chunk:
+                    raise ValueError("archive member is truncated")
+                self._left -= len(chunk)
+                self._pending = self._inflater.decompress(chunk) if self._inflater is not None else chunk
+            except (EOFError, zlib.error, gzip.BadGzipFile) as e:
+                # ✅ Truncated or corrupt compressed data: unreadable, like a truncated member
+                raise ValueError(f"archive member is unreadable ({e})") from e
+            self._pos = 0
+        count = min(len(buffer), len(self._pending) - self._pos)
+        buffer[:count] = self._pending[self._pos:self._pos + count]
+        self._pos += count
+        return count
+
+    def close(self):
+        if not self.closed:
+            self._file.close()
+            for file in self._owned:
+                file.close()
+        super().close()
+
+
+def archive_kind(archive):
+    if archive.endswith(".zip"):
+        return "zip"
+    return "tar" if archive.endswith(".tar") else "tar.gz"
+
+
+def scan_archive(archive):
+    """Locate the results.json in 'archive': a dict with kind, name, offset, length, method and mtime, or None.
+
+    offset/length are the member's local header offset and compressed size in a zip,
+    and its data offset and size in the (uncompressed) tar stream.
+    """
+    kind = archive_kind(archive)
+    try:
+        if kind == "zip":
+            with zipfile.ZipFile(archive) as zip_file:
+                members = [info for info in zip_file.infolist()
+                           if not info.is_dir() and _is_results_member(info.filename)]
+                if not members:
+                    return None
+                info = min(members, key=lambda member: member.filename.count("/"))
+                return {"kind": kind, "name": info.filename, "offset": info.header_offset,
+                        "length": info.compress_size, "method": info.compress_type,
+                        "mtime": time.mktime(info.date_time + (0, 0, -1))}
+        with tarfile.open(archive, "r:gz" if kind == "tar.gz" else "r:") as tar_file:
+            # ✅ Headers are read one at a time: stops at the first results.json
+            for info in tar_file:
+                if info.isfile() and _is_results_member(info.name):
+                    return {"kind": kind, "name": info.name, "offset": info.offset_data,
+                            "length": info.size, "method": None, "mtime": info.mtime}
+        return None
+    except FileNotFoundError:
+        raise
+    except (OSError, EOFError, zlib.error, tarfile.TarError, zipfile.BadZipFile) as e:
+        raise ValueError(f"{archive}: unreadable archive ({e})") from e
+
+
+def _is_results_member(name):
+    parts = [part for part in name.split("/") if part not in ("", ".")]
+    return len(parts) <= 2 and posixpath.basename(name) == RESULTS_FILE
+
+
+class ArchiveMembers:
+    """Where each archive keeps its results.json, so an archive is scanned once, not on every read.
+
+    Locations live in memory and in one small file per archive under
+    <cache dir>/archive_members/, both validated against the archive's mtime/size,
+    so other processes (server workers, the report generator) reuse them too.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self._lock = threading.Lock()
+        self._locations = {}  # absolute archive path -> (signature, location or None)
+        self.scans = 0
+
+    def locate(self, archive):
+        """The results.json location in 'archive' (see scan_archive); FileNotFoundError if it has none."""
+        archive_stat = os.stat(archive)
+        signature = [archive_stat.st_mtime_ns, archive_stat.st_size]
+        key = os.path.abspath(archive)
+        with self._lock:
+            known = self._locations.get(key)
+        if known is None or known[0] != signature:
+            known = self._load(key, signature)
+            if known is None:
+                known = (signature, scan_archive(archive))
+                with self._lock:
+                    self.scans += 1
+                self._save(key, known)
+            with self._lock:
+                self._locations[key] = known
+        if known[1] is None:
+            raise FileNotFoundError(f"{archive}: no {RESULTS_FILE} in the archive")
+        return known[1]
+
+    def _cache_path(self, key):
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:24]
+        return os.path.join(self.cache_dir, f"{digest}.json")
+
+    def _load(self, key, signature):
+        try:
+            with open(self._cache_path(key), "r", encoding="utf-8") as cache_file:
+                cached = json.load(cache_file)
+        except (OSError, ValueError):
+            return None
+        if cached.get("version") != ARCHIVE_MEMBERS_VERSION or cached.get("signature") != signature:
+            return None
+        return signature, cached.get("location")
+
+    def _save(self, key, known):
+        cache_path = self._cache_path(key)
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(temp_path, "w", encoding="utf-8") as cache_file:
+                json.dump({"version": ARCHIVE_MEMBERS_VERSION, "signature": known[0], "location": known[1]},
+                          cache_file)
+            os.replace(temp_path, cache_path)
+        except OSError:
+            pass  # ✅ Still cached in memory if the cache directory is not writable
+
+
+_members = None
+_members_lock = threading.Lock()
+
+
+def get_archive_members():
+    """Return the shared ArchiveMembers cache, creating it on first use."""
+    global _members
+    with _members_lock:
+        if _members is None:
+            from run_index import default_cache_dir  # ✅ Imported here: run_index imports this module
+            _members = ArchiveMembers(os.path.join(default_cache_dir(), "archive_members"))
+        return _members
@@ -0,0 +1,559 @@
+import hashlib
+import heapq
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+from run_archive import RESULTS_FILE, archive_results_path, archive_run_name, get_archive_members
+
+MANIFEST_VERSION = 3
+
+# Directory mtimes younger than this are not trusted to mean "unchanged": on
+# coarse-grained filesystems (network shares, FAT) a results.json written in the
+# same tick as the previous scan would otherwise be missed (same idea as git's
+# "racy clean" check).
+RACY_WINDOW_NS = 2 * 1_000_000_000
+
+# A results.json rewritten in place doesn't touch its directory, so only a stat of the file
+# sees it. latest()/page() stat the runs they return on every call, and every indexed run at
+# most this often (refresh() and runs() always do).
+RESULTS_RESTAT_SECONDS = float(os.getenv("RESULTS_RESTAT_SECONDS", "30"))
+
+# Run folders are named after their start time, e.g. 20250301120000
+RUN_NAME_FORMAT = "%Y%m%d%H%M%S"
+# Date partitions: <root>/YYYY/MM/DD/<run> (or YYYY/<run>, YYYY/MM/<run>), one name width per level
+PARTITION_WIDTHS = (4, 2, 2)
+PARTITION_FORMATS = ("%Y", "%Y/%m", "%Y/%m/%d")
+
+
+def default_cache_dir():
+    """Directory for local, rebuildable caches. Override with TELEMETRY_CACHE_DIR."""
+    return os.getenv(
+        "TELEMETRY_CACHE_DIR",
+        os.path.join(os.path.expanduser("~"), ".cache", "telemetry_report"),
+    )
+
+
+def cache_file_for(root, prefix, extension):
+    """Per-root cache file name, e.g. run_index_<hash>.json for a telemetry root."""
+    digest = hashlib.sha1(os.path.abspath(root).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(default_cache_dir(), f"{prefix}_{digest}{extension}")
+
+
+def run_name_time(run):
+    """Start time (epoch seconds) from a run name like 20250301120000, None if it isn't one."""
+    try:
+        return datetime.strptime(run, RUN_NAME_FORMAT).timestamp()
+    except ValueError:
+        return None
+
+
+def is_partition_name(name, depth):
+    """True if 'name' is a partition directory (year, month, day) at 'depth' below the root."""
+    return depth < len(PARTITION_WIDTHS) and len(name) == PARTITION_WIDTHS[depth] and name.isdigit()
+
+
+def partition_for(run_time, depth=len(PARTITION_WIDTHS)):
+    """Partition of a run time, e.g. "2025/03/01" (depth 3), "2025/03" (2) or "2025" (1)."""
+    return time.strftime(PARTITION_FORMATS[depth - 1], time.localtime(run_time))
+
+
+def partition_bounds(partition):
+    """(start, end) epoch seconds covered by a partition; unbounded for the root or a malformed name."""
+    try:
+        parts = [int(part) for part in partition.split("/")] if partition else []
+        start = datetime(*(parts + [1, 1])[:3])
+        if len(parts) == 1:
+            end = datetime(parts[0] + 1, 1, 1)
+        elif len(parts) == 2:
+            end = datetime(parts[0] + parts[1] // 12, parts[1] % 12 + 1, 1)
+        elif len(parts) == 3:
+            end = start + timedelta(days=1)
+        else:
+            return float("-inf"), float("inf")
+    except ValueError:
+        return float("-inf"), float("inf")
+    return start.timestamp(), end.timestamp()
+
+
+class RunIndex:
+    """Persistent, incrementally refreshed index of the run folders under a telemetry root.
+
+    The manifest maps every run folder (a directory containing results.json) to
+    [dir_mtime_ns, latest_time, results_mtime_ns, results_size]. A refresh only
+    lists a directory when its mtime changed. A results.json (or archive) rewritten in
+    place leaves its directory's mtime alone, so latest()/page() also stat the runs
+    they return, and every run at most every RESULTS_RESTAT_SECONDS; refresh() and
+    runs() stat every run. A steady-state latest() costs one stat per directory it
+    reads plus one per returned run.
+
+    Archived runs (<run>.tar.gz, .tgz, .tar or .zip holding a results.json, see
+    run_archive) are indexed under their run name, with the archive's mtime/size
+    and the archived results.json's mtime as the run time. A folder wins over an
+    archive of the same name.
+
+    Runs may also sit in date partitions, <root>/YYYY/MM/DD/<run> (or YYYY/<run>,
+    YYYY/MM/<run>; see partition_runs.py to migrate a flat root). Each partition
+    is validated by its own mtime, and latest()/page() walk partitions newest first
+    and stop once the page is full, so they only list and stat the recent
+    partitions they need, however long the history. A run in a newer partition
+    sorts before any run in an older one; runs directly in the root of a partitioned
+    tree sort last, whatever their time: the root can't be skipped by date, so
+    ordering them in would mean reading all of them for every page. partition_runs.py
+    moves them into their partitions.
+    """
+
+    def __init__(self, root, manifest_path=None):
+        self.root = root
+        self.manifest_path = manifest_path or cache_file_for(root, "run_index", ".json")
+        self._lock = threading.Lock()
+        # partition ("" for the root, "2025/03/01") -> [dir_mtime_ns, trusted_before_ns, sub-partitions, runs]
+        self._partitions = {}
+        self._runs = {}     # folder -> [dir_mtime_ns, latest_time, results_mtime_ns, results_size]
+        self._pending = {}  # folder -> dir_mtime_ns, for folders without results.json (yet)
+        self._archives = {}  # run name -> archive file name, for archived runs (indexed or pending)
+        self._partition_of = {}  # run name -> partition, for every run in _runs or _pending
+        self._dirty = False
+        self._restat_all = False  # ✅ Whether refreshing a partition re-stats all of its runs' results
+        self._restatted_at = float("-inf")  # time.monotonic() of the last full re-stat
+        self._load()
+
+    # ------------------------------------------------------------------ queries
+
+    def latest(self, limit):
+        """Return the 'limit' most recently updated run folders, newest first."""
+        return self.page(limit)[0]
+
+    def page(self, limit, cursor=None, since=None, until=None):
+        """Return (folders, next_cursor) for one page of runs, newest first.
+
+        'cursor' is the last folder of the previous page (the returned next_cursor);
+        raises KeyError if that folder is no longer indexed. next_cursor is None on
+        the last page. 'since'/'until' (epoch seconds, inclusive) keep the runs whose
+        run time (see run_time) is in range; partitions outside it are not read.
+        Runs directly in the root of a partitioned tree come after every partitioned run.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._restat_all = now - self._restatted_at >= RESULTS_RESTAT_SECONDS
+            try:
+                top = self._select(limit, cursor, since, until)
+                # ✅ The returned runs' results are always re-stat'ed; if one changed, its order may have too
+                if any([self._recheck_run(folder) for _, folder in top[:limit]]):
+                    self._restat_all = False
+                    top = self._select(limit, cursor, since, until)
+                if self._restat_all:
+                    self._restatted_at = now
+            finally:
+                self._restat_all = False
+                if self._dirty:
+                    self._save()
+        folders = [folder for _, folder in top[:limit]]
+        next_cursor = folders[-1] if len(top) > limit and folders else None
+        return folders, next_cursor
+
+    def _select(self, limit, cursor, since, until):
+        """Up to limit + 1 (latest_time, folder) of one page, newest first (see page)."""
+        lower = since if since is not None else float("-inf")
+        upper = until if until is not None else float("inf")
+        if cursor is not None and cursor not in self._runs:
+            self._refresh_all()
+            if cursor not in self._runs:
+                raise KeyError(cursor)
+        newest = self._partition_of[cursor] if cursor is not None else None
+
+        def overlaps(partition):
+            if newest is not None and partition > newest:
+                return False  # ✅ Already served by earlier pages
+            start, end = partition_bounds(partition)
+            return start <= upper and end > lower
+
+        runs = self._runs
+        top = []
+        for partition in self._walk(overlaps):
+            if len(self._partitions) == 1:
+                items = ((entry[1], run) for run, entry in runs.items())  # ✅ Flat root: every run
+            else:
+                # ✅ Newest names first, so the heap rarely has to replace its smallest item
+                items = ((runs[run][1], run) for run in reversed(self._partitions[partition][3])
+                         if run in runs)
+            if since is not None or until is not None:
+                items = (item for item in items if lower <= self._run_time(item[1]) <= upper)
+            if partition == newest:
+                if cursor not in self._runs:
+                    raise KeyError(cursor)
+                bound = (self._runs[cursor][1], cursor)
+                items = (item for item in items if item < bound)
+            top.extend(heapq.nlargest(limit + 1 - len(top), items))
+            if len(top) > limit:
+                break  # ✅ Older partitions can't hold newer runs
+        if cursor is not None and cursor not in self._runs:
+            raise KeyError(cursor)  # ✅ Its partition is gone
+        return top
+
+    def runs(self):
+        """Return a snapshot {folder: (latest_time, results_mtime_ns, results_size)}."""
+        self.refresh()
+        with self._lock:
+            return {folder: (entry[1], entry[2], entry[3]) for folder, entry in self._runs.items()}
+
+    def recent_runs(self):
+        """Like runs(), but only refreshes and returns the partitions where new runs show up.
+
+        Those are the newest partition at every level (see newest_partitions) and the
+        partitions of pending runs, so a poll costs a few stats however long the history is.
+        """
+        with self._lock:
+            def newest(partition):
+                return partition == max(self._partitions[partition.rpartition("/")[0]][2])
+
+            partitions = list(self._walk(newest))
+            for partition in {self._partition_of.get(folder) for folder in self._pending} - set(partitions):
+                if partition is not None and self._refresh_partition(partition):
+                    partitions.append(partition)
+            if self._dirty:
+                self._save()
+            return {folder: (self._runs[folder][1], self._runs[folder][2], self._runs[folder][3])
+                    for partition in partitions for folder in self._partitions[partition][3]
+                    if folder in self._runs and self._partition_of.get(folder) == partition}
+
+    def run_time(self, folder):
+        """Run time used by date ranges: the timestamp in the run name, else its latest update time."""
+        with self._lock:
+            return self._run_time(folder)
+
+    def partition(self, folder):
+        """Partition of a run, e.g. "2025/03/01" ("" if it sits directly in the root)."""
+        with self._lock:
+            return self._partition_of.get(folder, "")
+
+    def run_path(self, folder):
+        """Path of a run's folder, or of its archive."""
+        with self._lock:
+            return os.path.join(self._dir(self._partition_of.get(folder, "")), self._archives.get(folder, folder))
+
+    def results_path(self, folder):
+        """Path of a run's results.json: in its folder, or inside its archive (open with run_archive.open_results)."""
+        with self._lock:
+            archive = self._archives.get(folder)
+            path = os.path.join(self._dir(self._partition_of.get(folder, "")), archive or folder)
+        if archive is None:
+            return os.path.join(path, RESULTS_FILE)
+        return archive_results_path(path)
+
+    def newest_partitions(self):
+        """Directories where new runs show up: the root and its newest partition at every level."""
+        with self._lock:
+            chain = [""]
+            while chain[-1] in self._partitions and self._partitions[chain[-1]][2]:
+                chain.append(max(self._partitions[chain[-1]][2]))
+            return [self._dir(partition) for partition in chain]
+
+    def pending(self):
+        """Folders seen without a results.json as of the last refresh (e.g. runs still in progress)."""
+        with self._lock:
+            return list(self._pending)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._runs)
+
+    def _run_time(self, folder):
+        started = run_name_time(folder)
+        return started if started is not None else self._runs[folder][1]
+
+    def _dir(self, partition):
+        return os.path.join(self.root, *partition.split("/")) if partition else self.root
+
+    # ------------------------------------------------------------------ refresh
+
+    def refresh(self):
+        """Bring the index up to date with the filesystem and persist it if anything changed."""
+        with self._lock:
+            self._restat_all = True
+            try:
+                self._refresh_all()
+            finally:
+                self._restat_all = False
+            self._restatted_at = time.monotonic()
+            if self._dirty:
+                self._save()
+
+    def _refresh_all(self):
+        for _ in self._walk(lambda partition: True):
+            pass
+
+    def _walk(self, wanted, partition=""):
+        """Yield 'partition' and the 'wanted' partitions under it, newest first, refreshing each as it is reached.
+
+        Sub-partitions come before the partition's own runs, which matches the run order.
+        """
+        if not self._refresh_partition(partition):
+            return
+        for child in sorted(self._partitions[partition][2], reverse=True):
+            if wanted(child):
+                yield from self._walk(wanted, child)
+        yield partition
+
+    def _refresh_partition(self, partition):
+        """Relist 'partition' if its mtime changed; False (and forgotten) if it is gone."""
+        scan_started_ns = time.time_ns()
+        try:
+            dir_mtime_ns = os.stat(self._dir(partition)).st_mtime_ns
+            entry = self._partitions.get(partition)
+            if entry is None or dir_mtime_ns != entry[0] or dir_mtime_ns >= entry[1]:
+                self._rescan(partition)
+                entry = self._partitions[partition]
+                if entry[0] != dir_mtime_ns:
+                    entry[0] = dir_mtime_ns
+                    self._dirty = True
+            else:
+                self._recheck_pending(partition)
+            if self._restat_all:
+                self._recheck_results(partition)
+        except OSError:
+            self._drop_partition(partition)
+            return False
+        entry[1] = scan_started_ns - RACY_WINDOW_NS
+        return True
+
+    def _rescan(self, partition):
+        entry = self._partitions.setdefault(partition, [None, 0, [], []])
+        trusted_before_ns = entry[1]
+        depth = partition.count("/") + 1 if partition else 0
+        prefix = partition + "/" if partition else ""
+        children = []
+        seen = set()
+        archives = {}
+        with os.scandir(self._dir(partition)) as entries:
+            for dir_entry in entries:
+                try:
+                    if not dir_entry.is_dir():
+                        run = archive_run_name(dir_entry.name)
+                        if run is not None:
+                            archives[run] = dir_entry
+                        continue
+                    if is_partition_name(dir_entry.name, depth):
+                        children.append(prefix + dir_entry.name)
+                        continue
+                    folder_stat = dir_entry.stat()
+                except OSError:
+                    continue
+                if not self._claim(dir_entry.name, partition):
+                    continue
+                seen.add(dir_entry.name)
+                if self._is_unchanged(dir_entry.name, folder_stat.st_mtime_ns, trusted_before_ns):
+                    continue
+                self._update(dir_entry.name, folder_stat)
+
+        for run, dir_entry in archives.items():
+            if run in seen:
+                continue  # ✅ Extracted copy of the same run
+            try:
+                archive_stat = dir_entry.stat()
+            except OSError:
+                continue
+            if not self._claim(run, partition):
+                continue
+            seen.add(run)
+            if self._archives.get(run) == dir_entry.name and self._is_unchanged(
+                    run, archive_stat.st_mtime_ns, trusted_before_ns):
+                continue
+            self._update_archive(run, dir_entry.name, archive_stat)
+
+        for run in [r for r in entry[3] if r not in seen and self._partition_of.get(r) == partition]:
+            self._forget(run)
+        for child in [c for c in entry[2] if c not in children]:
+            self._drop_partition(child)
+        runs = sorted(seen)
+        children.sort()
+        if entry[2] != children or entry[3] != runs:
+            entry[2], entry[3] = children, runs
+            self._dirty = True
+
+    def _claim(self, run, partition):
+        """Record that 'run' lives in 'partition'; False if a newer partition holds a run of the same name."""
+        owner = self._partition_of.get(run)
+        if owner is not None and owner != partition:
+            if owner > partition:
+                return False
+            self._forget(run)  # ✅ Moved into a newer partition (e.g. by partition_runs.py)
+        self._partition_of[run] = partition
+        return True
+
+    def _forget(self, run):
+        partition = self._partition_of.pop(run, None)
+        self._runs.pop(run, None)
+        self._pending.pop(run, None)
+        self._archives.pop(run, None)
+        entry = self._partitions.get(partition)
+        if entry is not None and run in entry[3]:
+            entry[3].remove(run)
+        self._dirty = True
+
+    def _drop_partition(self, partition):
+        entry = self._partitions.pop(partition, None)
+        if entry is None:
+            return
+        for child in entry[2]:
+            self._drop_partition(child)
+        for run in entry[3]:
+            if self._partition_of.get(run) == partition:
+                self._partition_of.pop(run)
+                self._runs.pop(run, None)
+                self._pending.pop(run, None)
+                self._archives.pop(run, None)
+        parent = self._partitions.get(partition.rpartition("/")[0]) if partition else None
+        if parent is not None and partition in parent[2]:
+            parent[2].remove(partition)
+        self._dirty = True
+
+    def _recheck_pending(self, partition):
+        trusted_before_ns = self._partitions[partition][1]
+        for folder in [run for run in self._pending if self._partition_of.get(run) == partition]:
+            archive = self._archives.get(folder)
+            try:
+                folder_stat = os.stat(os.path.join(self._dir(partition), archive or folder))
+            except OSError:
+                del self._pending[folder]
+                self._dirty = True
+                continue
+            if not self._is_unchanged(folder, folder_stat.st_mtime_ns, trusted_before_ns):
+                if archive is not None:
+                    self._update_archive(folder, archive, folder_stat)
+                else:
+                    self._update(folder, folder_stat)
+
+    def _recheck_results(self, partition):
+        """Re-stat the results of the partition's indexed runs: rewriting a file in place doesn't touch its directory."""
+        for folder in list(self._partitions[partition][3]):
+            if self._partition_of.get(folder) == partition:
+                self._recheck_run(folder)
+
+    def _recheck_run(self, folder):
+        """Re-stat one indexed run's results; True if its entry changed or it is gone."""
+        entry = self._runs.get(folder)
+        if entry is None:
+            return False
+        directory = self._dir(self._partition_of[folder])
+        archive = self._archives.get(folder)
+        path = os.path.join(directory, archive) if archive is not None else os.path.join(directory, folder, RESULTS_FILE)
+        try:
+            results_stat = os.stat(path)
+            if results_stat.st_mtime_ns == entry[2] and results_stat.st_size == entry[3]:
+                return False
+        except OSError:
+            pass
+        try:
+            if archive is not None:
+                self._update_archive(folder, archive, os.stat(path))
+            else:
+                self._update(folder, os.stat(os.path.join(directory, folder)))
+        except OSError:
+            self._forget(folder)  # ✅ Gone since the last listing
+        return True
+
+    def _is_unchanged(self, folder, dir_mtime_ns, trusted_before_ns):
+        if dir_mtime_ns >= trusted_before_ns:
+            return False
+        known = self._runs.get(folder)
+        if known is not None:
+            return known[0] == dir_mtime_ns
+        return self._pending.get(folder) == dir_mtime_ns
+
+    def _update(self, folder, folder_stat):
+        partition = self._partition_of[folder]
+        results_path = os.path.join(self._dir(partition), folder, RESULTS_FILE)
+        try:
+            results_stat = os.stat(results_path)
+        except OSError:
+            self._runs.pop(folder, None)
+            self._pending[folder] = folder_stat.st_mtime_ns
+            self._dirty = True
+            return
+
+        self._pending.pop(folder, None)
+        if self._archives.pop(folder, None) is not None:
+            self._dirty = True
+        if partition:
+            # ✅ Moving a folder into its partition resets its ctime, so only mtimes count here
+            latest_time = max(folder_stat.st_mtime, results_stat.st_mtime)
+        else:
+            # ✅ Same ordering key as the original scan: newest of ctime/mtime of the folder and results.json
+            latest_time = max(folder_stat.st_ctime, folder_stat.st_mtime, results_stat.st_mtime)
+        entry = [folder_stat.st_mtime_ns, latest_time, results_stat.st_mtime_ns, results_stat.st_size]
+        if self._runs.get(folder) != entry:
+            self._runs[folder] = entry
+            self._dirty = True
+
+    def _update_archive(self, folder, archive, archive_stat):
+        if self._archives.get(folder) != archive:
+            self._archives[folder] = archive
+            self._dirty = True
+        try:
+            location = get_archive_members().locate(os.path.join(self._dir(self._partition_of[folder]), archive))
+        except (OSError, ValueError):
+            # No results.json in it, or unreadable (e.g. still being written): retried when it changes
+            self._runs.pop(folder, None)
+            self._pending[folder] = archive_stat.st_mtime_ns
+            self._dirty = True
+            return
+
+        self._pending.pop(folder, None)
+        # ✅ The archived results.json's own mtime: archiving old runs must not make them the newest
+        latest_time = location["mtime"] or archive_stat.st_mtime
+        entry = [archive_stat.st_mtime_ns, latest_time, archive_stat.st_mtime_ns, archive_stat.st_size]
+        if self._runs.get(folder) != entry:
+            self._runs[folder] = entry
+            self._dirty = True
+
+    # -------------------------------------------------------------- persistence
+
+    def _load(self):
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as manifest_file:
+                manifest = json.load(manifest_file)
+        except (OSError, ValueError):
+            return
+        if manifest.get("version") != MANIFEST_VERSION or manifest.get("root") != os.path.abspath(self.root):
+            return
+        self._partitions = manifest.get("partitions", {})
+        self._runs = manifest.get("runs", {})
+        self._pending = manifest.get("pending", {})
+        self._archives = manifest.get("archives", {})
+        self._partition_of = {run: partition for partition, entry in self._partitions.items() for run in entry[3]}
+
+    def _save(self):
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "root": os.path.abspath(self.root),
+            "partitions": self._partitions,
+            "runs": self._runs,
+            "pending": self._pending,
+            "archives": self._archives,
+        }
+        tmp_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as manifest_file:
+                json.dump(manifest, manifest_file, separators=(",", ":"))
+            os.replace(tmp_path, self.manifest_path)
+            self._dirty = False
+        except OSError:
+            pass  # ✅ The index still works in memory if the cache directory is not writable
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_run_index(root):
+    """Return the shared RunIndex for 'root', creating it on first use."""
+    key = os.path.abspath(root)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = RunIndex(root)
+        return index
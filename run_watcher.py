@@ -0,0 +1,176 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import sys
+import threading
+import time
+
+from run_archive import results_exist
+from run_index import get_run_index
+
+# inotify(7) event masks
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+
+ROOT_MASK = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO
+RUN_FOLDER_MASK = IN_CREATE | IN_CLOSE_WRITE | IN_MOVED_TO
+
+POLL_INTERVAL = 2.0    # seconds between scans when inotify is unavailable
+SAFETY_INTERVAL = 30.0  # inotify misses changes made by other hosts on network shares
+SETTLE_DELAY = 0.2     # let a burst of events (mkdir + write + close) coalesce into one refresh
+
+
+class _Inotify:
+    """Minimal ctypes binding to Linux inotify; raises OSError where it is not available."""
+
+    def __init__(self):
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def add_watch(self, path, mask):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {path}")
+        return wd
+
+    def remove_watch(self, wd):
+        self._libc.inotify_rm_watch(self.fd, wd)
+
+    def wait(self, timeout):
+        """Block until events arrive or 'timeout' expires; events are drained, not decoded."""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return False
+        while True:
+            try:
+                if not os.read(self.fd, 65536):
+                    break
+            except BlockingIOError:
+                break
+        return True
+
+    def close(self):
+        os.close(self.fd)
+
+
+class RunWatcher:
+    """Watches a telemetry root and calls on_run(folder, data) once per newly completed run.
+
+    A run counts as completed when its results.json exists and parses. inotify is
+    used as a wake-up signal where available (the root and its newest date
+    partitions for new folders, in-progress folders for results.json); otherwise,
+    or with mode="poll", the index is polled every POLL_INTERVAL seconds. A check
+    refreshes only the newest partitions and the pending runs' partitions (see
+    RunIndex.recent_runs), which stays cheap on a long history; a full refresh, which
+    stats every run, runs every SAFETY_INTERVAL to catch runs written anywhere else.
+    Runs present when the watcher starts are not reported.
+    """
+
+    def __init__(self, root, load, on_run, mode="auto", poll_interval=POLL_INTERVAL):
+        """'mode' is "auto" (inotify, falling back to polling) or "poll"."""
+        self.root = root
+        self.load = load
+        self.on_run = on_run
+        self.mode = mode
+        self.poll_interval = poll_interval
+        self._index = get_run_index(root)
+        self._known = set()
+        self._retry = set()  # results.json present but not parseable yet (still being written)
+        self._watches = {}   # folder -> inotify watch descriptor
+        self._partition_watches = {}  # root or newest partition directory -> inotify watch descriptor
+        self._full_check_at = float("-inf")  # time.monotonic() of the last full check
+        self._stop = threading.Event()
+        self._thread = None
+        self.backend = None
+
+    def start(self):
+        self._known = set(self._index.runs())
+        self._full_check_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="run-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        inotify = None
+        if self.mode != "poll":
+            try:
+                inotify = _Inotify()
+                self._partition_watches[self.root] = inotify.add_watch(self.root, ROOT_MASK)
+            except OSError:
+                if inotify is not None:
+                    inotify.close()
+                inotify = None  # ✅ Fall back to polling (non-Linux, missing root, watch limit reached)
+        self.backend = "inotify" if inotify is not None else "poll"
+
+        try:
+            while not self._stop.is_set():
+                self._check()
+                if inotify is not None:
+                    self._sync_watches(inotify)
+                    if inotify.wait(SAFETY_INTERVAL):
+                        self._stop.wait(SETTLE_DELAY)
+                else:
+                    self._stop.wait(self.poll_interval)
+        finally:
+            if inotify is not None:
+                inotify.close()
+
+    def _check(self):
+        now = time.monotonic()
+        full = now - self._full_check_at >= SAFETY_INTERVAL
+        runs = self._index.runs() if full else self._index.recent_runs()
+        if full:
+            self._full_check_at = now
+        fresh = [folder for folder in runs if folder not in self._known]
+        fresh.sort(key=lambda folder: runs[folder][0])  # ✅ Oldest first, so clients end with the newest on top
+
+        for folder in fresh:
+            try:
+                data = self.load(folder)
+            except (OSError, ValueError):
+                self._retry.add(folder)
+                continue
+            self._retry.discard(folder)
+            self._known.add(folder)
+            if data is not None:
+                self.on_run(folder, data)
+
+        if full:
+            self._known.intersection_update(runs)  # ✅ Only a full check sees every run
+        self._retry.intersection_update(runs)
+
+    def _sync_watches(self, inotify):
+        # ✅ New runs (and new day/month/year partitions) show up under the newest partitions
+        partitions = set(self._index.newest_partitions())
+        for path in [p for p in self._partition_watches if p not in partitions]:
+            inotify.remove_watch(self._partition_watches.pop(path))
+        new_partition = False
+        for path in partitions - set(self._partition_watches):
+            try:
+                self._partition_watches[path] = inotify.add_watch(path, ROOT_MASK)
+                new_partition = True
+            except OSError:
+                continue
+
+        wanted = set(self._index.pending()) | self._retry
+        for folder in [f for f in self._watches if f not in wanted]:
+            inotify.remove_watch(self._watches.pop(folder))
+        added = False
+        for folder in wanted - set(self._watches):
+            try:
+                self._watches[folder] = inotify.add_watch(self._index.run_path(folder), RUN_FOLDER_MASK)
+                added = True
+            except OSError:
+                continue
+        if new_partition or added and any(results_exist(self._index.results_path(folder)) for folder in wanted):
+            self._check()  # ✅ A run or results.json may have appeared before the watch was in place
@@ -0,0 +1,103 @@
+import os
+import signal
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.serving import BaseWSGIServer
+
+DEFAULT_THREADS = 32
+
+
+class PooledWSGIServer(BaseWSGIServer):
+    """werkzeug WSGI server that handles requests on a fixed pool of worker threads.
+
+    Unlike run_simple(threaded=True), which starts a thread per connection, the pool
+    bounds concurrency. Each open Server-Sent Events stream holds one worker for as
+    long as the client stays connected, so size 'threads' above the number of dashboards.
+    """
+
+    multithread = True
+
+    def __init__(self, host, port, app, threads=DEFAULT_THREADS, **kwargs):
+        super().__init__(host, port, app, **kwargs)
+        self.threads = threads
+        self._pool = None  # ✅ Created lazily, so no threads exist yet when worker processes fork
+
+    def process_request(self, request, client_address):
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="http")
+        self._pool.submit(self._handle, request, client_address)
+
+    def _handle(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def serve(app, host, port, threads=DEFAULT_THREADS, processes=1, on_start=None):
+    """Serve 'app' on host:port with 'threads' worker threads in each of 'processes' processes.
+
+    With several processes (POSIX only), the listening socket is opened once and
+    inherited by forked workers, which accept connections from it independently.
+    'on_start' is called in every serving process once the socket is bound (after
+    the fork, so threads it starts run in the workers). Blocks until interrupted.
+    """
+    server = PooledWSGIServer(host, port, app, threads=threads)
+    print(f"✅ Serving on http://{host}:{server.server_port} "
+          f"({processes} process(es) × {threads} thread(s))")
+    if processes <= 1:
+        if on_start is not None:
+            on_start()
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+        return
+
+    if not hasattr(os, "fork"):
+        server.server_close()
+        raise RuntimeError("multiple server processes need os.fork(); use threads on this platform")
+
+    children = []
+    for _ in range(processes):
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            try:
+                if on_start is not None:
+                    on_start()
+                server.serve_forever()
+            finally:
+                os._exit(0)
+        children.append(pid)
+
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        for pid in children:
+            os.waitpid(pid, 0)
+    except KeyboardInterrupt:
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in children:
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+    finally:
+        server.server_close()
+        sys.stdout.flush()
@@ -0,0 +1,143 @@
+import math
+import threading
+import time
+from bisect import bisect_left
+
+# Upper bounds (seconds) of the stage-duration histogram buckets
+LATENCY_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _StageStats:
+    __slots__ = ("count", "seconds", "max", "buckets")
+
+    def __init__(self, bucket_count):
+        self.count = 0
+        self.seconds = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (bucket_count + 1)  # ✅ Last slot is +Inf
+
+
+class _Timer:
+    __slots__ = ("metrics", "name", "start")
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.metrics.observe(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class StageMetrics:
+    """Per-stage durations (histograms) and counters for the hot paths (scan, parse, aggregate, serialize, ...).
+
+    with metrics.stage("parse"): ...   times a block
+    metrics.count("bytes_read", n)      adds to a counter
+
+    Thread-safe; each update is a perf_counter() pair and a short critical section.
+    With enabled=False, stage() returns a shared no-op context manager and count()
+    returns immediately.
+    """
+
+    def __init__(self, enabled=True, buckets=LATENCY_BUCKETS):
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._stages = {}    # stage name -> _StageStats
+        self._counters = {}  # counter name -> total
+
+    def stage(self, name):
+        """Context manager that records the time spent in the block under 'name'."""
+        return _Timer(self, name) if self.enabled else _NULL_TIMER
+
+    def observe(self, name, seconds):
+        bucket = bisect_left(self.buckets, seconds)
+        with self._lock:
+            stats = self._stages.get(name)
+            if stats is None:
+                stats = self._stages[name] = _StageStats(len(self.buckets))
+            stats.count += 1
+            stats.seconds += seconds
+            stats.buckets[bucket] += 1
+            if seconds > stats.max:
+                stats.max = seconds
+
+    def count(self, name, amount=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+
+    def snapshot(self):
+        """{"stages": {name: {count, seconds, max}}, "counters": {name: total}}."""
+        with self._lock:
+            return {
+                "stages": {
+                    name: {"count": stats.count, "seconds": stats.seconds, "max": stats.max}
+                    for name, stats in self._stages.items()
+                },
+                "counters": dict(self._counters),
+            }
+
+    def prometheus(self, namespace, extra=()):
+        """Prometheus text exposition: a <namespace>_stage_seconds histogram, one <namespace>_<name>_total
+        counter per counter, and 'extra' (name, type, help, value) samples such as cache gauges."""
+        with self._lock:
+            stages = [(name, stats.count, stats.seconds, list(stats.buckets)) for name, stats in sorted(self._stages.items())]
+            counters = sorted(self._counters.items())
+
+        lines = [
+            f"# HELP {namespace}_stage_seconds Time spent per processing stage.",
+            f"# TYPE {namespace}_stage_seconds histogram",
+        ]
+        for name, count, seconds, buckets in stages:
+            cumulative = 0
+            for bound, in_bucket in zip(self.buckets + (math.inf,), buckets):
+                cumulative += in_bucket
+                le = "+Inf" if bound == math.inf else repr(bound)
+                lines.append(f'{namespace}_stage_seconds_bucket{{stage="{name}",le="{le}"}} {cumulative}')
+            lines.append(f'{namespace}_stage_seconds_sum{{stage="{name}"}} {seconds!r}')
+            lines.append(f'{namespace}_stage_seconds_count{{stage="{name}"}} {count}')
+        for name, total in counters:
+            lines.append(f"# TYPE {namespace}_{name}_total counter")
+            lines.append(f"{namespace}_{name}_total {total}")
+        for name, kind, help_text, value in extra:
+            lines.append(f"# HELP {namespace}_{name} {help_text}")
+            lines.append(f"# TYPE {namespace}_{name} {kind}")
+            lines.append(f"{namespace}_{name} {value}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self):
+        """Human-readable table of the stages (in first-seen order) and counters."""
+        snapshot = self.snapshot()
+        lines = [f"{'stage':<14}{'calls':>8}{'total s':>12}{'mean ms':>12}{'max ms':>12}"]
+        for name, stats in snapshot["stages"].items():
+            mean = stats["seconds"] / stats["count"] if stats["count"] else 0.0
+            lines.append(f"{name:<14}{stats['count']:>8}{stats['seconds']:>12.3f}"
+                         f"{mean * 1000:>12.2f}{stats['max'] * 1000:>12.2f}")
+        for name, total in snapshot["counters"].items():
+            lines.append(f"{name:<14}{total:>20,}")
+        return "\n".join(lines)
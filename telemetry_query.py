@@ -0,0 +1,100 @@
+import sys
+from bisect import bisect_left
+
+DEFAULT_LIMIT = 3
+MAX_LIMIT = 200
+
+
+class TestIndex:
+    """Sorted test-ID index over one run's results, for exact-ID and prefix lookups.
+
+    Built once per parsed results.json (see ResultsCache.derive), so filtered
+    queries cost O(log n + matches) instead of a pass over every record.
+    """
+
+    def __init__(self, records):
+        positions = {}
+        for position, record in enumerate(records):
+            positions.setdefault(str(record.get("ID")), []).append(position)
+        self.positions = positions
+        self.ids = sorted(positions)
+        self.nbytes = sys.getsizeof(self.ids) + sys.getsizeof(positions) + 64 * len(positions)
+
+    def select(self, ids=(), prefix=None):
+        """Positions (in file order) of records whose ID is in 'ids' or starts with 'prefix'."""
+        selected = set()
+        for test_id in ids:
+            selected.update(self.positions.get(test_id, ()))
+        if prefix is not None:
+            start = bisect_left(self.ids, prefix)
+            for test_id in self.ids[start:]:
+                if not test_id.startswith(prefix):
+                    break
+                selected.update(self.positions[test_id])
+        return sorted(selected)
+
+
+class TelemetryQuery:
+    """Validated query parameters for /api/telemetry.
+
+    limit   -- number of runs per page (default 3, max 200)
+    cursor  -- folder name returned as next_cursor by the previous page
+    test    -- comma-separated exact test IDs (may be repeated)
+    prefix  -- test-ID prefix
+    fields  -- comma-separated record fields to return, e.g. ID,Duration
+    since   -- only runs started at or after this time (epoch seconds)
+    until   -- only runs started at or before this time (epoch seconds)
+    """
+
+    def __init__(self, limit=DEFAULT_LIMIT, cursor=None, tests=(), prefix=None, fields=None, since=None, until=None):
+        self.limit = limit
+        self.cursor = cursor
+        self.since = since
+        self.until = until
+        self.tests = tuple(tests)
+        self.prefix = prefix
+        self.fields = tuple(fields) if fields else None
+
+    @classmethod
+    def from_args(cls, args):
+        """Build a query from request args (a werkzeug MultiDict); raises ValueError on bad input."""
+        try:
+            limit = int(args.get("limit", DEFAULT_LIMIT))
+        except (TypeError, ValueError):
+            raise ValueError("'limit' must be an integer") from None
+        if not 1 <= limit <= MAX_LIMIT:
+            raise ValueError(f"'limit' must be between 1 and {MAX_LIMIT}")
+        try:
+            since = float(args["since"]) if "since" in args else None
+            until = float(args["until"]) if "until" in args else None
+        except (TypeError, ValueError):
+            raise ValueError("'since'/'until' must be epoch seconds") from None
+
+        tests = [test_id for value in args.getlist("test") for test_id in value.split(",") if test_id]
+        fields = [field for value in args.getlist("fields") for field in value.split(",") if field]
+        return cls(
+            limit=limit,
+            cursor=args.get("cursor") or None,
+            tests=tests,
+            prefix=args.get("prefix") or None,
+            fields=fields,
+            since=since,
+            until=until,
+        )
+
+    @property
+    def is_filtered(self):
+        return bool(self.tests) or self.prefix is not None
+
+    def key(self):
+        """Normalized form, for response-cache keys."""
+        return (self.limit, self.cursor, tuple(sorted(set(self.tests))), self.prefix, self.fields,
+                self.since, self.until)
+
+    def apply(self, records, index=None):
+        """Filter and project one run's records; 'index' is its TestIndex (required when filtered)."""
+        if self.is_filtered:
+            records = [records[position] for position in index.select(self.tests, self.prefix)]
+        if self.fields is not None:
+            records = [{field: record[field] for field in self.fields if field in record} for record in records]
+        return records
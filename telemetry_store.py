@@ -0,0 +1,561 @@
+"""SQLite-backed history of every run under a telemetry root.
+
+Usage:
+    python telemetry_store.py ingest [--root PATH] [--db PATH]
+    python telemetry_store.py history TEST_ID [--limit N] [--root PATH] [--db PATH]
+    python telemetry_store.py series TEST_ID [--points N] [--period raw|day|week] [--root PATH] [--db PATH]
+    python telemetry_store.py rollups [--root PATH] [--db PATH]
+"""
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from downsample import lttb
+from duration_matrix import STATUS_FAIL, STATUS_NA, STATUS_PASS, parse_duration
+from results_stream import iter_results
+from run_archive import stat_results
+from run_index import cache_file_for, get_run_index, run_name_time
+
+STATUS_NAMES = {STATUS_PASS: "pass", STATUS_FAIL: "FAIL", STATUS_NA: "N/A"}
+INGEST_BATCH = 5000   # result rows per executemany()
+COMMIT_ROWS = 200000  # result rows per ingest transaction
+
+# Rollup periods (UTC) and their length in seconds; weeks start on Monday
+DAY = 86400
+PERIODS = {"day": DAY, "week": 7 * DAY}
+_WEEK_OFFSET = 4 * DAY  # the epoch was a Thursday
+SERIES_POINTS = 500          # default target point count of a downsampled series
+RAW_SERIES_LIMIT = 20000     # above this many raw points, a series is downsampled from the daily rollups
+BULK_ROLLUP_RUNS = 100       # ingests of this many runs recompute the touched buckets once instead of per run
+# PRAGMA user_version; 1: run_time is the timestamp in the run name (was the folder's latest update time)
+STORE_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    folder TEXT NOT NULL UNIQUE,
+    run_time REAL NOT NULL,
+    results_mtime_ns INTEGER NOT NULL,
+    results_size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_by_time ON runs (run_time);
+
+CREATE TABLE IF NOT EXISTS tests (
+    test_pk INTEGER PRIMARY KEY,
+    test_id TEXT NOT NULL UNIQUE,
+    description TEXT
+);
+
+-- Clustered on (test, time): one test's history is a single index range scan.
+CREATE TABLE IF NOT EXISTS results (
+    test_pk INTEGER NOT NULL,
+    run_time REAL NOT NULL,
+    run_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    duration TEXT NOT NULL,
+    value REAL,
+    status INTEGER NOT NULL,
+    PRIMARY KEY (test_pk, run_time, run_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS results_by_run ON results (run_id, position);
+
+-- Per-test duration aggregates per day/week. 'runs' counts all results, 'samples' those with
+-- a number (min/max/total/median are over those). Ingest adds each new run to the counts,
+-- min/max and total; the median can't be updated that way, so it is flagged stale and
+-- recomputed from the test's results the next time it is read.
+CREATE TABLE IF NOT EXISTS rollups (
+    test_pk INTEGER NOT NULL,
+    period TEXT NOT NULL,
+    bucket REAL NOT NULL,
+    runs INTEGER NOT NULL,
+    failures INTEGER NOT NULL,
+    samples INTEGER NOT NULL,
+    min REAL,
+    max REAL,
+    total REAL NOT NULL,
+    median REAL,
+    median_stale INTEGER NOT NULL,
+    PRIMARY KEY (test_pk, period, bucket)
+) WITHOUT ROWID;
+
+-- Buckets to recompute entirely (runs re-ingested or moved, databases from before rollups)
+CREATE TABLE IF NOT EXISTS stale_rollups (
+    period TEXT NOT NULL,
+    bucket REAL NOT NULL,
+    PRIMARY KEY (period, bucket)
+) WITHOUT ROWID;
+"""
+
+
+def bucket_start(run_time, period):
+    """Start (epoch seconds) of the UTC day or Monday-based week containing 'run_time'."""
+    if period == "week":
+        return run_time - (run_time - _WEEK_OFFSET) % PERIODS["week"]
+    return run_time - run_time % PERIODS[period]
+
+
+def run_time_of(folder, results_stat):
+    """A run's time in the store: the timestamp in its name, as for /api/telemetry date ranges
+    (RunIndex.run_time), else its results.json mtime. Copying or moving runs keeps it."""
+    started = run_name_time(folder)
+    return started if started is not None else results_stat.st_mtime
+
+
+def default_db_path(root):
+    """TELEMETRY_DB if set, otherwise a per-root database in the local cache directory."""
+    return os.getenv("TELEMETRY_DB") or cache_file_for(root, "telemetry", ".sqlite3")
+
+
+class TelemetryStore:
+    """Historical results of all runs under 'root', ingested incrementally into SQLite.
+
+    Runs stay in the store after their folder is deleted or archived. A run is
+    re-ingested when its results.json mtime/size changes.
+    """
+
+    def __init__(self, root, db_path=None):
+        self.root = root
+        self.db_path = db_path or default_db_path(root)
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._ingested = None  # folder -> (results_mtime_ns, results_size), loaded on first ingest
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        connection = self._connection()
+        had_rollups = connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'rollups'").fetchone()
+        connection.executescript(SCHEMA)
+        if not had_rollups:
+            # ✅ Database from before rollups existed: computed by the next ingest
+            self._mark_all_stale(connection)
+        if connection.execute("PRAGMA user_version").fetchone()[0] < STORE_VERSION:
+            self._migrate_run_times(connection)
+
+    def _connection(self):
+        """One connection per thread (the Flask server handles requests on several threads)."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            # isolation_level=None: transactions are explicit (see ingest)
+            connection = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA cache_size=-65536")  # 64 MiB
+            self._local.connection = connection
+        return connection
+
+    # ------------------------------------------------------------------ ingest
+
+    def ingest(self):
+        """Load runs not seen before (or changed since) into the store; returns the number of runs ingested."""
+        index = get_run_index(self.root)
+        runs = {}
+        for folder in index.runs():
+            # ✅ Stat'ed here rather than taken from the index: a results.json rewritten in place must be re-ingested
+            try:
+                results_stat = stat_results(index.results_path(folder))
+            except OSError:
+                continue  # ✅ Removed since the index refresh
+            runs[folder] = (run_time_of(folder, results_stat), results_stat.st_mtime_ns, results_stat.st_size)
+        with self._write_lock:
+            connection = self._connection()
+            if self._ingested is None:
+                self._ingested = {
+                    folder: (mtime_ns, size)
+                    for folder, mtime_ns, size in connection.execute(
+                        "SELECT folder, results_mtime_ns, results_size FROM runs")
+                }
+            todo = [
+                (run_time, folder, mtime_ns, size)
+                for folder, (run_time, mtime_ns, size) in runs.items()
+                if self._ingested.get(folder) != (mtime_ns, size)
+            ]
+            if not todo:
+                if connection.execute("SELECT 1 FROM stale_rollups LIMIT 1").fetchone():
+                    self._refresh_rollups_transaction(connection)
+                return 0
+
+            tests = self._load_tests(connection)
+            bulk = len(todo) >= BULK_ROLLUP_RUNS
+            done = {}
+            rows = ingested = 0
+            connection.execute("BEGIN")
+            try:
+                # ✅ Oldest first, so each test keeps the description of its newest run
+                for run_time, folder, mtime_ns, size in sorted(todo):
+                    connection.execute("SAVEPOINT run")
+                    try:
+                        rows += self._ingest_run(connection, tests, folder, run_time, mtime_ns, size, bulk)
+                    except ValueError as e:
+                        # Half-written or malformed: dropped, retried on the next ingest
+                        connection.execute("ROLLBACK TO run")
+                        connection.execute("RELEASE run")
+                        print(f"⚠️ Skipping {folder}: {e}")
+                        tests = self._load_tests(connection)
+                        continue
+                    connection.execute("RELEASE run")
+                    done[folder] = (mtime_ns, size)
+                    ingested += 1
+                    # ✅ Many runs per commit: each commit rewrites every B-tree page the runs touched
+                    if rows >= COMMIT_ROWS:
+                        connection.execute("COMMIT")
+                        self._ingested.update(done)
+                        done.clear()
+                        rows = 0
+                        connection.execute("BEGIN")
+                self._refresh_rollups(connection)
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            self._ingested.update(done)
+            return ingested
+
+    def _migrate_run_times(self, connection):
+        """Move runs stored with their update time to the time in their name (and their buckets with them)."""
+        connection.execute("BEGIN")
+        try:
+            for run_id, folder, run_time in connection.execute("SELECT run_id, folder, run_time FROM runs").fetchall():
+                started = run_name_time(folder)
+                if started is None or started == run_time:
+                    continue
+                self._mark_stale(connection, run_time)
+                self._mark_stale(connection, started)
+                connection.execute("UPDATE runs SET run_time = ? WHERE run_id = ?", (started, run_id))
+                connection.execute("UPDATE results SET run_time = ? WHERE run_id = ?", (started, run_id))
+            connection.execute(f"PRAGMA user_version = {STORE_VERSION}")
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def rebuild_rollups(self):
+        """Recompute every day/week rollup from the stored results."""
+        with self._write_lock:
+            connection = self._connection()
+            self._mark_all_stale(connection)
+            self._refresh_rollups_transaction(connection)
+
+    def _mark_all_stale(self, connection):
+        connection.execute("BEGIN")
+        try:
+            connection.execute("DELETE FROM rollups")
+            for (run_time,) in connection.execute("SELECT DISTINCT run_time FROM runs").fetchall():
+                self._mark_stale(connection, run_time)
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _mark_stale(connection, run_time):
+        connection.executemany("INSERT OR IGNORE INTO stale_rollups (period, bucket) VALUES (?, ?)",
+                               [(period, bucket_start(run_time, period)) for period in PERIODS])
+
+    def _refresh_rollups_transaction(self, connection):
+        connection.execute("BEGIN")
+        try:
+            self._refresh_rollups(connection)
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _refresh_rollups(connection):
+        """Recompute the buckets listed in stale_rollups (inside the caller's transaction)."""
+        for period, bucket in connection.execute("SELECT period, bucket FROM stale_rollups").fetchall():
+            connection.execute("DELETE FROM rollups WHERE period = ? AND bucket = ?", (period, bucket))
+            by_test = {}
+            # ✅ One range seek per test on the (test, time) clustered key instead of a full table scan
+            rows = connection.execute(
+                "SELECT test_pk, value, status FROM results "
+                "WHERE test_pk IN (SELECT test_pk FROM tests) AND run_time >= ? AND run_time < ?",
+                (bucket, bucket + PERIODS[period]))
+            for test_pk, value, status in rows:
+                stats = by_test.get(test_pk)
+                if stats is None:
+                    stats = by_test[test_pk] = [0, 0, []]
+                stats[0] += 1
+                if status == STATUS_FAIL:
+                    stats[1] += 1
+                if value is not None:
+                    stats[2].append(value)
+            connection.executemany(
+                "INSERT INTO rollups (test_pk, period, bucket, runs, failures, samples, min, max, total, median, "
+                "median_stale) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0)",
+                [(test_pk, period, bucket, runs, failures, len(values),
+                  min(values, default=None), max(values, default=None), sum(values), _median(values))
+                 for test_pk, (runs, failures, values) in by_test.items()])
+            connection.execute("DELETE FROM stale_rollups WHERE period = ? AND bucket = ?", (period, bucket))
+
+    @staticmethod
+    def _load_tests(connection):
+        return {test_id: (test_pk, description) for test_pk, test_id, description in
+                connection.execute("SELECT test_pk, test_id, description FROM tests")}
+
+    def _ingest_run(self, connection, tests, folder, run_time, mtime_ns, size, bulk=False):
+        """Replace one run's rows (inside the caller's transaction); returns the number of results.
+
+        A new run is added to its rollups; with 'bulk', or if the run was ingested before,
+        its buckets are marked for recomputation at the end of the ingest instead.
+        """
+        path = get_run_index(self.root).results_path(folder)
+        row = connection.execute("SELECT run_id, run_time FROM runs WHERE folder = ?", (folder,)).fetchone()
+        if row is None:
+            run_id = connection.execute(
+                "INSERT INTO runs (folder, run_time, results_mtime_ns, results_size) VALUES (?, ?, ?, ?)",
+                (folder, run_time, mtime_ns, size)).lastrowid
+            latest = None if bulk else {}  # ✅ test_pk -> (status, value), added to the rollups below
+            if bulk:
+                self._mark_stale(connection, run_time)
+        else:
+            # ✅ A changed run can't be subtracted from min/max: its old and new buckets are recomputed
+            run_id = row[0]
+            latest = None
+            self._mark_stale(connection, row[1])
+            self._mark_stale(connection, run_time)
+            connection.execute("DELETE FROM results WHERE run_id = ?", (run_id,))
+            connection.execute(
+                "UPDATE runs SET run_time = ?, results_mtime_ns = ?, results_size = ? WHERE run_id = ?",
+                (run_time, mtime_ns, size, run_id))
+
+        batch = []
+        count = 0
+        try:
+            for position, record in enumerate(iter_results(path)):
+                test_id = str(record.get("ID", "Unknown"))
+                description = record.get("description", "No Description")
+                known = tests.get(test_id)
+                if known is None:
+                    test_pk = connection.execute(
+                        "INSERT INTO tests (test_id, description) VALUES (?, ?)",
+                        (test_id, description)).lastrowid
+                    tests[test_id] = (test_pk, description)
+                else:
+                    test_pk = known[0]
+                    if known[1] != description:
+                        connection.execute("UPDATE tests SET description = ? WHERE test_pk = ?",
+                                           (description, test_pk))
+                        tests[test_id] = (test_pk, description)
+                status, value, text = parse_duration(record.get("Duration", "N/A"))
+                value = None if value != value else value
+                batch.append((test_pk, run_time, run_id, position, text, value, status))
+                if latest is not None:
+                    latest[test_pk] = (status, value)
+                if len(batch) >= INGEST_BATCH:
+                    self._insert_results(connection, batch)
+                    count += len(batch)
+                    batch.clear()
+        except FileNotFoundError:
+            pass  # ✅ Removed since the scan: keep the run (with what was read) so it is not retried
+        self._insert_results(connection, batch)
+        if latest:
+            self._add_to_rollups(connection, run_time, latest)
+        return count + len(batch)
+
+    @staticmethod
+    def _add_to_rollups(connection, run_time, latest):
+        """Add one new run's results ({test_pk: (status, value)}) to its day and week rollups."""
+        connection.executemany(
+            "INSERT INTO rollups (test_pk, period, bucket, runs, failures, samples, min, max, total, median, "
+            "median_stale) VALUES (?, ?, ?, 1, ?, ?, ?, ?, ?, ?, 0) "
+            "ON CONFLICT (test_pk, period, bucket) DO UPDATE SET runs = runs + 1, "
+            "failures = failures + excluded.failures, samples = samples + excluded.samples, "
+            "min = coalesce(min(min, excluded.min), min, excluded.min), "
+            "max = coalesce(max(max, excluded.max), max, excluded.max), "
+            "total = total + excluded.total, median_stale = 1",
+            [(test_pk, period, bucket_start(run_time, period), int(status == STATUS_FAIL),
+              int(value is not None), value, value, value or 0.0, value)
+             for period in PERIODS for test_pk, (status, value) in latest.items()])
+
+    @staticmethod
+    def _insert_results(connection, batch):
+        # ✅ OR REPLACE: a test listed twice in one run keeps its last result, like the dict-based report
+        connection.executemany(
+            "INSERT OR REPLACE INTO results (test_pk, run_time, run_id, position, duration, value, status) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)", batch)
+
+    # ----------------------------------------------------------------- queries
+
+    def latest_runs(self, limit, offset=0):
+        """Folder names of the 'limit' newest runs in the store, newest first."""
+        rows = self._connection().execute(
+            "SELECT folder FROM runs ORDER BY run_time DESC, folder DESC LIMIT ? OFFSET ?", (limit, offset))
+        return [folder for (folder,) in rows]
+
+    def run_signatures(self, folders):
+        """{folder: (results_mtime_ns, results_size)} as last ingested, for the given folders."""
+        wanted = set(folders)
+        rows = self._connection().execute("SELECT folder, results_mtime_ns, results_size FROM runs")
+        return {folder: (mtime_ns, size) for folder, mtime_ns, size in rows if folder in wanted}
+
+    def run_records(self, folder):
+        """Records of one run as {"ID", "description", "Duration"} dicts in file order, or None if unknown."""
+        connection = self._connection()
+        row = connection.execute("SELECT run_id FROM runs WHERE folder = ?", (folder,)).fetchone()
+        if row is None:
+            return None
+        rows = connection.execute(
+            "SELECT t.test_id, t.description, r.duration FROM results r JOIN tests t ON t.test_pk = r.test_pk "
+            "WHERE r.run_id = ? ORDER BY r.position", (row[0],))
+        return [{"ID": test_id, "description": description, "Duration": duration}
+                for test_id, description, duration in rows]
+
+    def test_history(self, test_id, limit=1000, since=None, until=None):
+        """One test's results over time, newest first: dicts with folder, run_time, Duration, value, status."""
+        connection = self._connection()
+        row = connection.execute("SELECT test_pk FROM tests WHERE test_id = ?", (test_id,)).fetchone()
+        if row is None:
+            return []
+        rows = connection.execute(
+            "SELECT runs.folder, r.run_time, r.duration, r.value, r.status FROM results r "
+            "JOIN runs ON runs.run_id = r.run_id "
+            "WHERE r.test_pk = ? AND r.run_time >= ? AND r.run_time <= ? "
+            "ORDER BY r.run_time DESC, runs.folder DESC LIMIT ?",
+            (row[0], since if since is not None else float("-inf"),
+             until if until is not None else float("inf"), limit))
+        return [
+            {"folder": folder, "run_time": run_time, "Duration": duration, "value": value,
+             "status": STATUS_NAMES[status]}
+            for folder, run_time, duration, value, status in rows
+        ]
+
+    def test_series(self, test_id, points=SERIES_POINTS, period="raw", since=None, until=None):
+        """One test's durations over time, oldest first, downsampled to at most 'points' points.
+
+        period="raw" gives {t, folder, value} per result with a number; "day"/"week" gives
+        the rollups {t, runs, failures, samples, min, median, max, mean}. Either is reduced
+        with LTTB (on the median for rollups) when longer than 'points'. A raw series of
+        more than RAW_SERIES_LIMIT results is built from the daily rollups instead, so the
+        cost stays bounded however long the history. Returns {period, total, points}:
+        'period' is what the points are, 'total' the count before downsampling; None if
+        the test is unknown.
+        """
+        connection = self._connection()
+        row = connection.execute("SELECT test_pk FROM tests WHERE test_id = ?", (test_id,)).fetchone()
+        if row is None:
+            return None
+        bounds = (row[0], since if since is not None else float("-inf"),
+                  until if until is not None else float("inf"))
+
+        if period == "raw":
+            (total,) = connection.execute(
+                "SELECT COUNT(*) FROM results WHERE test_pk = ? AND run_time >= ? AND run_time <= ? "
+                "AND value IS NOT NULL", bounds).fetchone()
+            if total > RAW_SERIES_LIMIT:
+                period = "day"
+            else:
+                rows = connection.execute(
+                    "SELECT r.run_time, runs.folder, r.value FROM results r JOIN runs ON runs.run_id = r.run_id "
+                    "WHERE r.test_pk = ? AND r.run_time >= ? AND r.run_time <= ? AND r.value IS NOT NULL "
+                    "ORDER BY r.run_time, runs.folder", bounds).fetchall()
+                kept = lttb([run_time for run_time, _, _ in rows], [value for _, _, value in rows], points)
+                return {"period": "raw", "total": len(rows),
+                        "points": [{"t": rows[i][0], "folder": rows[i][1], "value": rows[i][2]} for i in kept]}
+
+        # ✅ The bucket containing 'since' is included
+        first = bucket_start(since, period) if since is not None else bounds[1]
+        rows = connection.execute(
+            "SELECT bucket, runs, failures, samples, min, median, max, total, median_stale FROM rollups "
+            "WHERE test_pk = ? AND period = ? AND bucket >= ? AND bucket <= ? ORDER BY bucket",
+            (bounds[0], period, first, bounds[2])).fetchall()
+        medians = self._fresh_medians(bounds[0], period, [row for row in rows if row[8]])
+        buckets = [
+            {"t": bucket, "runs": runs, "failures": failures, "samples": samples, "min": low,
+             "median": medians.get(bucket, median), "max": high, "mean": total / samples if samples else None}
+            for bucket, runs, failures, samples, low, median, high, total, _ in rows
+        ]
+        if len(buckets) > points:
+            # ✅ Buckets without a number (every result failed) have no median to place on the chart
+            buckets = [bucket for bucket in buckets if bucket["median"] is not None]
+            kept = lttb([bucket["t"] for bucket in buckets], [bucket["median"] for bucket in buckets], points)
+            buckets = [buckets[i] for i in kept]
+        return {"period": period, "total": len(rows), "points": buckets}
+
+    def _fresh_medians(self, test_pk, period, stale):
+        """{bucket: median} recomputed for one test's 'stale' rollup rows, and stored for the next read."""
+        if not stale:
+            return {}
+        connection = self._connection()
+        medians = {}
+        for row in stale:
+            bucket = row[0]
+            medians[bucket] = _median([value for (value,) in connection.execute(
+                "SELECT value FROM results WHERE test_pk = ? AND run_time >= ? AND run_time < ? "
+                "AND value IS NOT NULL", (test_pk, bucket, bucket + PERIODS[period]))])
+        with self._write_lock:
+            # ✅ 'runs = ?': skipped if an ingest (maybe in another process) added to the bucket meanwhile
+            connection.execute("BEGIN")
+            try:
+                connection.executemany(
+                    "UPDATE rollups SET median = ?, median_stale = 0 "
+                    "WHERE test_pk = ? AND period = ? AND bucket = ? AND runs = ?",
+                    [(medians[row[0]], test_pk, period, row[0], row[1]) for row in stale])
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        return medians
+
+    def describe(self, test_id):
+        row = self._connection().execute("SELECT description FROM tests WHERE test_id = ?", (test_id,)).fetchone()
+        return row[0] if row else None
+
+
+def _median(values):
+    if not values:
+        return None
+    values = sorted(values)
+    middle = len(values) // 2
+    return values[middle] if len(values) % 2 else (values[middle - 1] + values[middle]) / 2
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_telemetry_store(root):
+    """Return the shared TelemetryStore for 'root', creating it on first use."""
+    key = os.path.abspath(root)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = TelemetryStore(root)
+        return store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite history of telemetry runs.")
+    parser.add_argument("command", choices=["ingest", "history", "series", "rollups"])
+    parser.add_argument("test_id", nargs="?")
+    parser.add_argument("--root", default=os.getenv("TELEMETRY_DATA_PATH",
+                                                    os.path.join(os.getcwd(), "../", "telemetry_data")))
+    parser.add_argument("--db", help="database path (default: TELEMETRY_DB or the local cache directory)")
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--points", type=int, default=SERIES_POINTS, help="series: target point count")
+    parser.add_argument("--period", choices=["raw", *PERIODS], default="raw", help="series: raw results or rollups")
+    args = parser.parse_args()
+
+    store = TelemetryStore(args.root, args.db)
+    if args.command == "ingest":
+        start = time.perf_counter()
+        count = store.ingest()
+        print(f"✅ Ingested {count} run(s) into {store.db_path} in {time.perf_counter() - start:.2f} s")
+    elif args.command == "rollups":
+        start = time.perf_counter()
+        store.rebuild_rollups()
+        print(f"✅ Rebuilt the rollups of {store.db_path} in {time.perf_counter() - start:.2f} s")
+    else:
+        if not args.test_id:
+            parser.error(f"{args.command} needs a TEST_ID")
+        store.ingest()
+        if args.command == "history":
+            print(json.dumps(store.test_history(args.test_id, args.limit), indent=2))
+        else:
+            print(json.dumps(store.test_series(args.test_id, args.points, args.period), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Keep every test's caches (run index manifests, records cache, ...) out of ~/.cache."""
+    path = tmp_path / "cache"
+    monkeypatch.setenv("TELEMETRY_CACHE_DIR", str(path))
+    return path
+
+
+def write_run(root, run, records):
+    """Write 'records' as the results.json of run folder 'run' under 'root'; returns its path."""
+    folder = os.path.join(root, run)
+    os.makedirs(folder, exist_ok=True)
+    with open(os.path.join(folder, "results.json"), "w", encoding="utf-8") as results_file:
+        json.dump(records, results_file)
+    return os.path.join(folder, "results.json")
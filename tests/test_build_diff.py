@@ -0,0 +1,87 @@
+import pytest
+
+import build_diff
+from build_diff import CHANGE_KINDS, BuildDiffInput, diff_builds
+
+BASE = [
+    {"ID": "broken", "Duration": "1 sec"},
+    {"ID": "fixed", "Duration": "$timeout"},
+    {"ID": "status", "Duration": "$timeout"},
+    {"ID": "same_fail", "Duration": "$timeout"},
+    {"ID": "slower_a", "Duration": "1 sec"},
+    {"ID": "slower_b", "Duration": "1 sec"},
+    {"ID": "faster", "Duration": "2 sec"},
+    {"ID": "noise", "Duration": "1 sec"},
+    {"ID": "small_ratio", "Duration": "10 sec"},
+    {"ID": "removed", "Duration": "3 sec"},
+    {"ID": "reported_na", "Duration": "N/A"},
+]
+HEAD = [
+    {"ID": "broken", "Duration": "$assert"},
+    {"ID": "fixed", "Duration": "4 sec"},
+    {"ID": "status", "Duration": "N/A"},
+    {"ID": "same_fail", "Duration": "$timeout"},
+    {"ID": "slower_a", "Duration": "1.5 sec"},
+    {"ID": "slower_b", "Duration": "3 sec"},
+    {"ID": "faster", "Duration": "1 sec"},
+    {"ID": "noise", "Duration": "1.04 sec"},         # ✅ Under MIN_DELTA
+    {"ID": "small_ratio", "Duration": "10.5 sec"},   # ✅ Under MIN_RATIO
+    {"ID": "new", "Duration": "2 sec"},
+    {"ID": "reported_na", "Duration": "N/A"},
+]
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    if request.param == "python":
+        monkeypatch.setattr(build_diff, "np", None)
+    elif build_diff.np is None:
+        pytest.skip("NumPy is not installed")
+    return request.param
+
+
+def diff(head, base, **options):
+    diff_input = BuildDiffInput("head", "base")
+    diff_input.add_head(head)
+    diff_input.add_base(base)
+    return diff_builds(diff_input, **options)
+
+
+def test_change_kinds_in_order(backend):
+    changes, summary = diff(HEAD, BASE)
+    assert [(change["ID"], change["change"]) for change in changes] == [
+        ("broken", "broken"),
+        ("slower_b", "slower"),  # ✅ Within a kind, most seconds lost first
+        ("slower_a", "slower"),
+        ("removed", "removed"),
+        ("new", "new"),
+        ("status", "status"),
+        ("fixed", "fixed"),
+        ("faster", "faster"),
+    ]
+    assert [summary[kind] for kind in CHANGE_KINDS] == [1, 2, 1, 1, 1, 1, 1]
+    assert (summary["unchanged"], summary["head_tests"], summary["base_tests"]) == (4, 11, 11)
+
+
+def test_change_fields(backend):
+    changes = {change["ID"]: change for change in diff(HEAD, BASE)[0]}
+    assert changes["slower_b"]["base"] == "1 sec" and changes["slower_b"]["head"] == "3 sec"
+    assert (changes["slower_b"]["delta"], changes["slower_b"]["ratio"]) == (2.0, 3.0)
+    assert changes["broken"]["head"] == "FAIL" and changes["broken"]["head_duration"] is None
+    assert changes["new"]["base"] is None and changes["removed"]["head"] is None
+    assert changes["status"]["base"] == "FAIL" and changes["status"]["head"] == "N/A"
+
+
+def test_thresholds(backend):
+    assert {change["ID"] for change in diff(HEAD, BASE, min_delta=0.01, min_ratio=0.01)[0]} >= {"noise", "small_ratio"}
+
+
+def test_numpy_and_python_agree(monkeypatch):
+    if build_diff.np is None:
+        pytest.skip("NumPy is not installed")
+    durations = ["1 sec", "1.2 sec", "5 sec", "$fail", "N/A", "0 sec", "0.01 sec", "garbage sec"]
+    head = [{"ID": f"T{number}", "Duration": durations[number % 8]} for number in range(0, 400, 3)]
+    base = [{"ID": f"T{number}", "Duration": durations[number * 5 % 8]} for number in range(0, 400, 2)]
+    expected = diff(head, base)
+    monkeypatch.setattr(build_diff, "np", None)
+    assert diff(head, base) == expected
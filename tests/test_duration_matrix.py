@@ -0,0 +1,20 @@
+import math
+
+from duration_matrix import STATUS_FAIL, STATUS_NA, STATUS_PASS, DurationMatrix, parse_duration
+from generate_html_report import format_result_cell
+
+
+def test_parse_duration():
+    assert parse_duration("1.25 sec") == (STATUS_PASS, 1.25, "1.25 sec")
+    assert parse_duration(3) == (STATUS_PASS, 3.0, "3")
+    assert parse_duration("$timeout")[0] == STATUS_FAIL
+    assert parse_duration("N/A")[0] == parse_duration(None)[0] == STATUS_NA
+
+
+def test_empty_duration_is_a_pass_with_empty_text():
+    status, value, text = parse_duration("")
+    assert (status, text) == (STATUS_PASS, "") and math.isnan(value)
+
+    matrix = DurationMatrix(["run"])
+    matrix.add_record(0, {"ID": "T0", "Duration": ""})
+    assert format_result_cell(*[matrix.row_cells(0)[0][i] for i in (0, 2)]) == "<td style='color: green;'>✔ </td>"
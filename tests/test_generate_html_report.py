@@ -0,0 +1,42 @@
+import json
+import os
+
+import generate_html_report
+from conftest import write_run
+
+
+def test_report_is_regenerated_when_results_are_rewritten_in_place(tmp_path, monkeypatch):
+    root = str(tmp_path / "telemetry_data")
+    monkeypatch.setattr(generate_html_report, "TELEMETRY_DATA_PATH", root)
+    monkeypatch.setattr(generate_html_report, "REPORT_DIR", str(tmp_path / "html_report"))
+    path = write_run(root, "20240101000000", [{"ID": "first", "Duration": "1 sec"}])
+
+    def generate():
+        return generate_html_report.generate_html_report(builds=1, regression_window=0, open_browser=False)
+
+    report = generate()
+    assert generate() == report  # ✅ Unchanged: the earlier report is reused
+
+    with open(path, "r+", encoding="utf-8") as results_file:
+        results_file.truncate(0)
+        json.dump([{"ID": "first", "Duration": "1 sec"}, {"ID": "second", "Duration": "2 sec"}], results_file)
+
+    regenerated = generate()
+    assert regenerated != report
+    with open(regenerated, encoding="utf-8") as report_file:
+        assert "second" in report_file.read()
+
+
+def test_batch_job_naming_an_unknown_run_fails(tmp_path):
+    root = str(tmp_path / "telemetry_data")
+    for run in ("20240101000000", "20240102000000"):
+        write_run(root, run, [{"ID": "T0", "Duration": "1 sec"}])
+    jobs = [
+        {"root": root, "runs": ["20240102000000", "2024O101000000"], "output": str(tmp_path / "typo.html")},
+        {"root": root, "runs": ["20240102000000", "20240101000000"], "output": str(tmp_path / "named.html")},
+    ]
+
+    typo, named = generate_html_report.generate_batch_reports(jobs)
+    assert typo["status"] == "failed" and "2024O101000000" in typo["error"]
+    assert not os.path.exists(typo["output"])
+    assert (named["status"], named["runs"]) == ("written", 2)
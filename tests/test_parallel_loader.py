@@ -0,0 +1,78 @@
+import random
+import threading
+import time
+
+import pytest
+
+from parallel_loader import imap_ordered
+
+
+class Tracker:
+    """Records how much work is started but not yet consumed, to check imap_ordered's bounds."""
+
+    def __init__(self, sizes):
+        self.sizes = sizes
+        self.lock = threading.Lock()
+        self.started = []
+        self.outstanding = 0
+        self.outstanding_bytes = 0
+        self.max_outstanding = 0
+        self.max_outstanding_bytes = 0
+
+    def load(self, item):
+        with self.lock:
+            self.started.append(item)
+            self.outstanding += 1
+            self.outstanding_bytes += self.sizes[item]
+            self.max_outstanding = max(self.max_outstanding, self.outstanding)
+            self.max_outstanding_bytes = max(self.max_outstanding_bytes, self.outstanding_bytes)
+        time.sleep(random.uniform(0, 0.002))
+        return item * 10
+
+    def consume(self, results):
+        consumed = []
+        for result in results:
+            with self.lock:
+                self.outstanding -= 1
+                self.outstanding_bytes -= self.sizes[result // 10]
+            consumed.append(result)
+            time.sleep(0.001)  # ✅ A slow consumer, so the loader could run far ahead
+        return consumed
+
+
+@pytest.mark.parametrize("workers", [1, 2, 8])
+def test_results_keep_input_order(workers):
+    tracker = Tracker([1] * 100)
+    assert tracker.consume(imap_ordered(tracker.load, range(100), workers=workers)) == [i * 10 for i in range(100)]
+    assert tracker.max_outstanding <= max(1, 2 * workers + 1)
+
+
+def test_byte_budget_bounds_the_work_ahead_of_the_consumer():
+    sizes = [random.Random(item).choice([1, 10, 40]) for item in range(200)]
+    tracker = Tracker(sizes)
+    results = imap_ordered(tracker.load, range(200), workers=8, size_of=sizes.__getitem__, max_size=50)
+    assert tracker.consume(results) == [i * 10 for i in range(200)]
+    # ✅ The budget covers the loads in flight or buffered, plus the one result being handed over
+    assert tracker.max_outstanding_bytes <= 50 + max(sizes)
+    assert sorted(tracker.started) == list(range(200))
+
+
+def test_item_over_the_budget_still_loads_alone():
+    sizes = [5, 100, 5, 5]
+    tracker = Tracker(sizes)
+    results = imap_ordered(tracker.load, range(4), workers=4, size_of=sizes.__getitem__, max_size=20)
+    assert tracker.consume(results) == [0, 10, 20, 30]
+    # ✅ The large item loads alone; the budget refills once it is handed over
+    assert tracker.max_outstanding_bytes <= 100 + 20
+
+
+def test_errors_propagate_in_order():
+    def load(item):
+        if item == 3:
+            raise ValueError(item)
+        return item
+
+    results = imap_ordered(load, range(10), workers=4)
+    assert [next(results) for _ in range(3)] == [0, 1, 2]
+    with pytest.raises(ValueError):
+        next(results)
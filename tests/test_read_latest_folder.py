@@ -0,0 +1,64 @@
+import gzip
+import json
+import os
+
+import read_latest_folder
+from conftest import write_run
+
+
+def test_cached_page_gets_a_cursor_when_an_older_run_appears(tmp_path, monkeypatch):
+    root = str(tmp_path / "telemetry_data")
+    monkeypatch.setattr(read_latest_folder, "TELEMETRY_DATA_PATH", root)
+    for number in range(8):
+        write_run(os.path.join(root, "2024", "01", "01"), f"2024010100{number:02d}00", [{"ID": "T0", "Duration": "1"}])
+    client = read_latest_folder.app.test_client()
+
+    first = client.get("/api/telemetry?limit=8").get_json()
+    assert len(first["folders"]) == 8 and first["next_cursor"] is None
+
+    write_run(os.path.join(root, "2023", "12", "31"), "20231231000000", [{"ID": "T0", "Duration": "1"}])
+    second = client.get("/api/telemetry?limit=8").get_json()
+    assert second["folders"] == first["folders"]
+    assert second["next_cursor"] == first["folders"][-1]
+
+
+def telemetry_client(tmp_path, monkeypatch):
+    root = str(tmp_path / "telemetry_data")
+    monkeypatch.setattr(read_latest_folder, "TELEMETRY_DATA_PATH", root)
+    for number in range(3):
+        write_run(root, f"2024010100{number:02d}00", [{"ID": f"T{test}", "Duration": "1 sec"} for test in range(200)])
+    return root, read_latest_folder.app.test_client()
+
+
+def test_accept_encoding_picks_the_body_and_its_etag(tmp_path, monkeypatch):
+    _, client = telemetry_client(tmp_path, monkeypatch)
+    plain = client.get("/api/telemetry", headers={"Accept-Encoding": "identity"})
+    zipped = client.get("/api/telemetry", headers={"Accept-Encoding": "gzip, deflate"})
+    refused = client.get("/api/telemetry", headers={"Accept-Encoding": "gzip;q=0"})
+
+    assert "Content-Encoding" not in plain.headers and plain.headers["Vary"] == "Accept-Encoding"
+    assert zipped.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(zipped.get_data()) == plain.get_data()
+    assert zipped.headers["ETag"] == plain.headers["ETag"][:-1] + '-gzip"'  # ✅ Its own entity tag per encoding
+    assert "Content-Encoding" not in refused.headers and refused.headers["ETag"] == plain.headers["ETag"]
+
+
+def test_if_none_match_returns_304_until_the_data_changes(tmp_path, monkeypatch):
+    root, client = telemetry_client(tmp_path, monkeypatch)
+    first = client.get("/api/telemetry", headers={"Accept-Encoding": "gzip"})
+    etag = first.headers["ETag"]
+
+    again = client.get("/api/telemetry", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert again.status_code == 304 and again.get_data() == b"" and again.headers["ETag"] == etag
+    weak = client.get("/api/telemetry", headers={"Accept-Encoding": "gzip", "If-None-Match": f'"other", W/{etag}'})
+    assert weak.status_code == 304
+
+    # ✅ A tag for another encoding of the same data still validates the cached body
+    plain = client.get("/api/telemetry", headers={"Accept-Encoding": "identity", "If-None-Match": etag})
+    assert plain.status_code == 304 and "Content-Encoding" not in plain.headers
+    assert plain.headers["ETag"] != etag
+
+    write_run(root, "20240101000300", [{"ID": "T0", "Duration": "2 sec"}])
+    changed = client.get("/api/telemetry", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["ETag"] != etag
+    assert json.loads(gzip.decompress(changed.get_data()))["folders"][0] == "20240101000300"
@@ -0,0 +1,90 @@
+import random
+
+import pytest
+
+import regressions
+from duration_matrix import DurationMatrix
+from regressions import MIN_SAMPLES, detect_regressions
+
+
+def matrix_of(rows):
+    """DurationMatrix with one row per test: {test_id: [newest duration, older durations...]}."""
+    builds = max(len(durations) for durations in rows.values())
+    matrix = DurationMatrix([f"build{build}" for build in range(builds)])
+    for test_id, durations in rows.items():
+        for build, duration in enumerate(durations):
+            matrix.add_record(build, {"ID": test_id, "Duration": duration})
+    return matrix
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    if request.param == "python":
+        monkeypatch.setattr(regressions, "np", None)
+    elif regressions.np is None:
+        pytest.skip("NumPy is not installed")
+    return request.param
+
+
+def flagged(rows, **options):
+    return {hit["ID"]: hit for hit in detect_regressions(matrix_of(rows), **options)}
+
+
+def test_numpy_and_python_agree(monkeypatch):
+    if regressions.np is None:
+        pytest.skip("NumPy is not installed")
+    generator = random.Random(7)
+    rows = {}
+    for test in range(300):
+        base = generator.choice([0.0, 0.004, 0.5, 3.0, 40.0])
+        durations = [f"{base * generator.uniform(0.9, 1.1):.2f} sec" for _ in range(25)]
+        durations[0] = f"{base * generator.choice([1.0, 1.3, 2.0, 5.0]):.2f} sec"
+        for build in generator.sample(range(25), generator.randint(0, 22)):
+            durations[build] = generator.choice(["$timeout", "N/A"])  # ✅ FAIL and N/A cells are ignored
+        rows[f"T{test}"] = durations
+    matrix = matrix_of(rows)
+
+    for window in (3, 5, 20, 100):
+        expected = detect_regressions(matrix, window=window)
+        monkeypatch.setattr(regressions, "np", None)
+        assert detect_regressions(matrix, window=window) == pytest.approx(expected)
+        monkeypatch.undo()
+    assert expected  # ✅ The data does have regressions to agree on
+
+
+def test_too_few_baseline_samples_are_not_judged(backend):
+    durations = ["9 sec"] + ["1 sec"] * (MIN_SAMPLES - 1) + ["N/A", "$timeout"] * 3
+    assert flagged({"few": durations}) == {}
+    assert list(flagged({"enough": durations[:1] + ["1 sec"] + durations[1:]})) == ["enough"]
+
+
+def test_flat_baseline_uses_the_relative_and_absolute_noise_floors(backend):
+    hits = flagged({
+        "relative": ["12 sec"] + ["10 sec"] * 10,   # ✅ MAD 0: noise is 1% of 10 s
+        "absolute": ["0.6 sec"] + ["0.5 sec"] * 10,  # ✅ 1% of 0.5 s is below the 0.01 s floor
+        "small": ["11.9 sec"] + ["10 sec"] * 10,    # ✅ Far outside the noise, but under MIN_SLOWDOWN
+        "zero": ["1 sec"] + ["0 sec"] * 10,
+    })
+    assert sorted(hits) == ["absolute", "relative"]
+    assert hits["relative"]["z"] == 20.0 and hits["relative"]["mad"] == 0.0
+    assert hits["absolute"]["z"] == 10.0
+
+
+def test_z_threshold_is_inclusive(backend):
+    baseline = ["100 sec"] * 10  # ✅ Noise scale 1 s
+    hits = flagged({"at": ["103.5 sec"] + baseline, "below": ["103.4 sec"] + baseline}, min_slowdown=1.0)
+    assert list(hits) == ["at"] and hits["at"]["z"] == 3.5
+
+
+def test_mad_of_a_noisy_baseline(backend):
+    # ✅ Median 10, MAD 1 -> scale 1.4826: z = 6 / 1.4826
+    hits = flagged({"noisy": ["16 sec", "9 sec", "11 sec", "10 sec", "8 sec", "12 sec", "10 sec"]})
+    assert hits["noisy"]["baseline"] == 10.0 and hits["noisy"]["mad"] == 1.0
+    assert hits["noisy"]["z"] == round(6 / 1.4826, 2) and hits["noisy"]["samples"] == 6
+
+
+def test_worst_first_and_window(backend):
+    rows = {"mild": ["2 sec"] + ["1 sec"] * 10, "worst": ["9 sec"] + ["1 sec"] * 10}
+    assert [hit["ID"] for hit in detect_regressions(matrix_of(rows))] == ["worst", "mild"]
+    # ✅ Only the 'window' builds after the newest form the baseline
+    assert flagged({"old": ["2 sec"] + ["2 sec"] * 5 + ["1 sec"] * 10}, window=5) == {}
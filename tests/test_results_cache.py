@@ -0,0 +1,77 @@
+import json
+import os
+
+from conftest import write_run
+from results_cache import ResultsCache, estimate_size
+
+RECORDS = [{"ID": f"T{number}", "Duration": "1 sec"} for number in range(10)]
+
+
+def counting_cache(max_bytes):
+    parsed = []
+
+    def parse(path):
+        parsed.append(os.path.basename(os.path.dirname(path)))
+        with open(path, encoding="utf-8") as results_file:
+            return json.load(results_file)
+
+    return ResultsCache(max_bytes, parse=parse), parsed
+
+
+def test_least_recently_used_run_is_evicted(tmp_path):
+    paths = {run: write_run(str(tmp_path), run, RECORDS) for run in ("a", "b", "c")}
+    cache, parsed = counting_cache(int(estimate_size(RECORDS) * 2.5))  # ✅ Room for two runs
+
+    cache.load(paths["a"])
+    cache.load(paths["b"])
+    cache.load(paths["a"])  # ✅ Now "b" is the least recently used
+    cache.load(paths["c"])
+    assert cache.stats()["evictions"] == 1 and cache.stats()["entries"] == 2
+
+    cache.load(paths["a"])
+    cache.load(paths["c"])
+    cache.load(paths["b"])
+    assert parsed == ["a", "b", "c", "b"]
+    assert cache.stats()["bytes"] <= cache.max_bytes
+
+
+def test_entry_larger_than_the_budget_is_not_kept(tmp_path):
+    path = write_run(str(tmp_path), "a", RECORDS)
+    cache, parsed = counting_cache(estimate_size(RECORDS) // 2)
+    assert cache.load(path) == RECORDS
+    assert cache.load(path) == RECORDS
+    assert parsed == ["a", "a"] and cache.stats()["entries"] == 0
+
+
+def test_changed_file_signature_invalidates_the_entry(tmp_path):
+    path = write_run(str(tmp_path), "a", RECORDS)
+    cache, parsed = counting_cache(1 << 20)
+    first = cache.load(path)
+    assert cache.load(path) is first and parsed == ["a"]
+
+    write_run(str(tmp_path), "a", RECORDS + [{"ID": "new", "Duration": "2 sec"}])  # ✅ New size
+    assert cache.load(path)[-1]["ID"] == "new"
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))  # ✅ Same size, new mtime
+    cache.load(path)
+    assert parsed == ["a", "a", "a"]
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 3
+
+    os.remove(path)
+    assert cache.load(path) is None and cache.stats()["entries"] == 0
+
+
+def test_derived_structures_are_rebuilt_with_their_entry(tmp_path):
+    path = write_run(str(tmp_path), "a", RECORDS)
+    cache, _ = counting_cache(1 << 20)
+    built = []
+
+    def build(records):
+        built.append(len(records))
+        return {record["ID"]: record for record in records}
+
+    assert cache.derive(path, "by_id", build)[1]["T0"]["Duration"] == "1 sec"
+    cache.derive(path, "by_id", build)
+    write_run(str(tmp_path), "a", RECORDS[:3])
+    assert sorted(cache.derive(path, "by_id", build)[1]) == ["T0", "T1", "T2"]
+    assert built == [10, 3]
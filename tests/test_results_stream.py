@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+from results_stream import iter_results
+
+RECORDS = [{"ID": f"T{number}", "description": "x" * number, "Duration": number * 1.5, "extra": [1, 2]}
+           for number in range(20)]
+
+
+def write_results(tmp_path, text):
+    path = tmp_path / "results.json"
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 1 << 20])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_values_split_across_chunks(tmp_path, chunk_size, indent):
+    path = write_results(tmp_path, json.dumps(RECORDS, indent=indent))
+    expected = [{field: record[field] for field in ("ID", "description", "Duration")} for record in RECORDS]
+    assert list(iter_results(path, chunk_size=chunk_size)) == expected
+
+
+@pytest.mark.parametrize("text", ["[]", " [ ] ", "[\n]"])
+def test_empty_array(tmp_path, text):
+    assert list(iter_results(write_results(tmp_path, text), chunk_size=1)) == []
+
+
+@pytest.mark.parametrize("text", [
+    '[{"ID": "a"} {"ID": "b"}]',   # missing comma
+    '[{"ID": "a"},]',              # trailing comma
+    '[{"ID": "a"},,{"ID": "b"}]',  # repeated comma
+    '[,{"ID": "a"}]',              # leading comma
+    '[,]',
+    '{"ID": "a"}',                 # not an array
+    '',
+])
+@pytest.mark.parametrize("chunk_size", [1, 4, 1 << 20])
+def test_malformed_separators(tmp_path, text, chunk_size):
+    with pytest.raises(ValueError):
+        list(iter_results(write_results(tmp_path, text), chunk_size=chunk_size))
+
+
+@pytest.mark.parametrize("cut", [1, 10, 25, -1, -2])
+@pytest.mark.parametrize("chunk_size", [3, 1 << 20])
+def test_truncated_file(tmp_path, cut, chunk_size):
+    text = json.dumps([{"ID": "a", "Duration": 12345}, {"ID": "b", "Duration": 6789}])
+    with pytest.raises(ValueError):
+        list(iter_results(write_results(tmp_path, text[:cut]), chunk_size=chunk_size))
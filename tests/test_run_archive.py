@@ -0,0 +1,107 @@
+import io
+import json
+import os
+import tarfile
+import zipfile
+
+import pytest
+
+from run_archive import archive_results_path, open_results, results_exist, scan_archive
+
+RECORDS = [{"ID": f"TC_{number:03d}", "description": "Login ✔ flow", "Duration": f"{number / 7:.2f} sec"}
+           for number in range(2000)]
+PADDING = os.urandom(300000)  # ✅ Incompressible: the results.json starts well into the (gzip) stream
+
+
+@pytest.fixture
+def results_file(tmp_path):
+    path = tmp_path / "results.json"
+    path.write_text(json.dumps(RECORDS), encoding="utf-8")
+    return path
+
+
+def expected(results_file):
+    with open(results_file, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def read(archive):
+    with open_results(archive_results_path(str(archive))) as file:
+        return json.load(file)
+
+
+def make_zip(path, results_file, member, compression, force_zip64=False):
+    with zipfile.ZipFile(path, "w", compression) as zip_file:
+        zip_file.writestr("logs/padding.bin", PADDING)
+        with open(results_file, "rb") as source, zip_file.open(member, "w", force_zip64=force_zip64) as target:
+            target.write(source.read())
+    return path
+
+
+def make_tar(path, results_file, member, mode):
+    with tarfile.open(path, mode) as tar_file:
+        padding = tarfile.TarInfo("logs/padding.bin")
+        padding.size = len(PADDING)
+        tar_file.addfile(padding, io.BytesIO(PADDING))
+        tar_file.add(results_file, member)
+    return path
+
+
+@pytest.mark.parametrize("compression", [zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED])
+@pytest.mark.parametrize("member", ["results.json", "20240101000000/results.json"])
+def test_zip(tmp_path, results_file, compression, member):
+    archive = make_zip(tmp_path / "20240101000000.zip", results_file, member, compression)
+    assert scan_archive(str(archive))["name"] == member
+    assert read(archive) == expected(results_file)
+
+
+def test_zip_local_extra_field_differs_from_central_directory(tmp_path, results_file):
+    # ✅ force_zip64 writes a zip64 extra field in the local header only
+    archive = make_zip(tmp_path / "20240101000000.zip", results_file, "results.json", zipfile.ZIP_DEFLATED,
+                       force_zip64=True)
+    with zipfile.ZipFile(archive) as zip_file:
+        assert zip_file.getinfo("results.json").extra == b""
+    assert read(archive) == expected(results_file)
+
+
+@pytest.mark.parametrize("extension, mode", [(".tar", "w:"), (".tar.gz", "w:gz"), (".tgz", "w:gz")])
+@pytest.mark.parametrize("member", ["results.json", "20240101000000/results.json"])
+def test_tar(tmp_path, results_file, extension, mode, member):
+    archive = make_tar(tmp_path / f"20240101000000{extension}", results_file, member, mode)
+    assert scan_archive(str(archive))["name"] == member
+    assert read(archive) == expected(results_file)
+
+
+def test_deeper_members_are_not_results(tmp_path, results_file):
+    archive = make_tar(tmp_path / "20240101000000.tar", results_file, "run/nested/results.json", "w:")
+    assert scan_archive(str(archive)) is None
+    assert not results_exist(archive_results_path(str(archive)))
+    with pytest.raises(FileNotFoundError):
+        read(archive)
+
+
+@pytest.mark.parametrize("name, make", [
+    ("run.zip", lambda path, source: make_zip(path, source, "results.json", zipfile.ZIP_DEFLATED)),
+    ("run.tar", lambda path, source: make_tar(path, source, "results.json", "w:")),
+    ("run.tar.gz", lambda path, source: make_tar(path, source, "results.json", "w:gz")),
+])
+def test_truncated_archive(tmp_path, results_file, name, make):
+    complete = make(tmp_path / name, results_file)
+    data = complete.read_bytes()
+    truncated = tmp_path / f"truncated_{name}"
+
+    if name.endswith(".zip"):
+        cut = len(data) * 3 // 4  # ✅ No central directory: the scan fails
+    elif name.endswith(".tar"):
+        cut = scan_archive(str(complete))["offset"] + 1000
+    else:
+        cut = len(data) - 3000  # ✅ Inside the compressed results.json, before the gzip trailer
+    truncated.write_bytes(data[:cut])
+    if not name.endswith(".zip"):
+        assert scan_archive(str(truncated))["name"] == "results.json"  # ✅ Its header is still there
+    with pytest.raises(ValueError):
+        read(truncated)
+
+    truncated.write_bytes(data[:200])
+    with pytest.raises(ValueError):
+        read(truncated)
@@ -0,0 +1,164 @@
+import json
+import os
+import time
+
+import pytest
+
+from conftest import write_run
+from partition_runs import partition_runs
+from run_index import RunIndex, partition_for, run_name_time
+
+
+def test_results_rewritten_in_place_are_restatted(tmp_path):
+    root = str(tmp_path / "root")
+    path = write_run(root, "20240101000000", [{"ID": "a", "Duration": "1 sec"}])
+    index = RunIndex(root)
+    assert index.runs()["20240101000000"][2] == os.path.getsize(path)
+
+    with open(path, "r+", encoding="utf-8") as results_file:
+        results_file.truncate(0)
+        json.dump([{"ID": str(number), "Duration": "1 sec"} for number in range(300)], results_file)
+
+    assert index.runs()["20240101000000"][2] == os.path.getsize(path)
+    assert RunIndex(root).runs()["20240101000000"][2] == os.path.getsize(path)  # ✅ Also from the saved manifest
+
+
+def test_latest_restats_returned_runs_and_the_rest_periodically(tmp_path, monkeypatch):
+    root = str(tmp_path / "root")
+    older = write_run(root, "20240101000000", [{"ID": "a", "Duration": "1 sec"}])
+    write_run(root, "20240102000000", [{"ID": "a", "Duration": "1 sec"}])
+    earlier = time.time() - 60  # ✅ Outside the racy window, so unchanged folders aren't re-listed
+    for directory in (os.path.join(root, "20240101000000"), os.path.join(root, "20240102000000"), root):
+        os.utime(directory, (earlier, earlier))
+    index = RunIndex(root)
+    assert index.latest(2) == ["20240102000000", "20240101000000"]
+    monkeypatch.setattr("run_index.RESULTS_RESTAT_SECONDS", 3600)
+
+    later = time.time() + 1000
+    os.utime(older, (later, later))  # ✅ As if rewritten in place: its folder's mtime doesn't change
+    assert index.latest(1) == ["20240102000000"]  # ✅ Not returned, not re-stat'ed yet
+    assert index.latest(2) == ["20240101000000", "20240102000000"]  # ✅ Returned, so re-stat'ed
+
+    os.utime(older, (later - 2000, later - 2000))
+    monkeypatch.setattr("run_index.RESULTS_RESTAT_SECONDS", 0)
+    assert index.latest(1) == ["20240102000000"]
+
+
+def write_timed_run(directory, run):
+    """A run folder with results.json, its mtimes set to the time in its name (as if written then)."""
+    folder = os.path.join(directory, run)
+    os.makedirs(folder, exist_ok=True)
+    results_path = os.path.join(folder, "results.json")
+    with open(results_path, "w", encoding="utf-8") as results_file:
+        json.dump([{"ID": "T0", "Duration": "1 sec"}], results_file)
+    started = run_name_time(run)
+    os.utime(results_path, (started, started))
+    os.utime(folder, (started, started))
+
+
+def partitioned(root, run):
+    return os.path.join(root, *partition_for(run_name_time(run)).split("/"))
+
+
+# ✅ Three days, with month and year boundaries, several runs a day
+RUNS = [f"{day}{hour:02d}0000" for day in ("20231231", "20240101", "20240201") for hour in (1, 9, 17, 23)]
+NEWEST_FIRST = sorted(RUNS, reverse=True)
+
+
+@pytest.fixture
+def root(tmp_path):
+    root = str(tmp_path / "telemetry_data")
+    for run in RUNS:
+        write_timed_run(partitioned(root, run), run)
+    return root
+
+
+def all_pages(index, limit, **range_):
+    folders, cursor = index.page(limit, **range_)
+    pages = [folders]
+    while cursor is not None:
+        folders, cursor = index.page(limit, cursor, **range_)
+        pages.append(folders)
+    return pages
+
+
+def test_latest_walks_partitions_newest_first(root):
+    index = RunIndex(root)
+    assert index.latest(5) == NEWEST_FIRST[:5]
+    assert len(index) < len(RUNS)  # ✅ Older partitions are not read for the newest runs
+    index.refresh()
+    assert len(index) == len(RUNS)
+    assert index.partition("20231231010000") == "2023/12/31"
+    assert index.run_path("20231231010000") == os.path.join(root, "2023", "12", "31", "20231231010000")
+
+
+@pytest.mark.parametrize("limit", [1, 3, 4, 5, 12, 20])
+def test_cursor_paging_across_partition_boundaries(root, limit):
+    pages = all_pages(RunIndex(root), limit)
+    assert [run for page in pages for run in page] == NEWEST_FIRST
+    assert all(len(page) == limit for page in pages[:-1]) and 0 < len(pages[-1]) <= limit
+
+
+def test_date_range_pages(root):
+    index = RunIndex(root)
+    since, until = run_name_time("20240101000000"), run_name_time("20240101235959")
+    pages = all_pages(index, 3, since=since, until=until)
+    assert [run for page in pages for run in page] == [run for run in NEWEST_FIRST if run.startswith("20240101")]
+    assert index.page(10, since=run_name_time("20240201170000"))[0] == ["20240201230000", "20240201170000"]
+
+
+def test_new_partition_is_found(root):
+    index = RunIndex(root)
+    index.latest(3)
+    write_timed_run(partitioned(root, "20240302080000"), "20240302080000")
+    assert index.latest(2) == ["20240302080000", NEWEST_FIRST[0]]
+
+
+def test_recent_runs_cover_the_newest_partitions_and_pending_runs(root):
+    index = RunIndex(root)
+    in_progress = os.path.join(partitioned(root, "20231231120000"), "20231231120000")
+    os.makedirs(in_progress)
+    index.refresh()
+    assert index.pending() == ["20231231120000"]
+
+    # ✅ The newest day, and the day still waiting for a run; not 2024/01/01
+    assert sorted(index.recent_runs()) == [run for run in RUNS if not run.startswith("20240101")]
+    with open(os.path.join(in_progress, "results.json"), "w", encoding="utf-8") as results_file:
+        json.dump([{"ID": "T0", "Duration": "1 sec"}], results_file)
+    assert "20231231120000" in index.recent_runs()  # ✅ An older partition, refreshed for its pending run
+
+
+def test_runs_left_in_the_root_sort_after_partitioned_runs(root):
+    # ✅ Documented: newer partitions first, runs directly in the root last (whatever their time)
+    write_timed_run(root, "20250101000000")
+    write_timed_run(root, "20220101000000")
+    index = RunIndex(root)
+    runs = [run for page in all_pages(index, 5) for run in page]
+    assert runs[:len(RUNS)] == NEWEST_FIRST
+    assert sorted(runs[len(RUNS):]) == ["20220101000000", "20250101000000"]
+
+
+def test_mixed_root_is_migrated_by_partition_runs(root):
+    write_timed_run(root, "20250101000000")
+    write_timed_run(root, "20220101000000")
+    index = RunIndex(root)
+    index.refresh()
+    moved = partition_runs(root)
+    assert sorted(moved) == [("20220101000000", "2022/01/01"), ("20250101000000", "2025/01/01")]
+    assert [run for page in all_pages(index, 4) for run in page] == ["20250101000000"] + NEWEST_FIRST + ["20220101000000"]
+    assert os.path.isdir(os.path.join(root, "2025", "01", "01", "20250101000000"))
+
+
+def test_cursor_of_a_removed_run_is_rejected(root):
+    index = RunIndex(root)
+    _, cursor = index.page(2)
+    folder = index.run_path(cursor)
+    os.rename(folder, folder + "_gone")
+    time.sleep(0.01)
+    with pytest.raises(KeyError):
+        index.page(2, cursor)
+
+
+def test_index_reloaded_from_its_manifest(root):
+    RunIndex(root).latest(3)
+    assert [run for page in all_pages(RunIndex(root), 5) for run in page] == NEWEST_FIRST
@@ -0,0 +1,73 @@
+import re
+
+import pytest
+
+import read_latest_folder
+from stage_metrics import StageMetrics
+
+SAMPLE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{[a-zA-Z_][a-zA-Z0-9_]*="[^"]*"(,[a-zA-Z_][a-zA-Z0-9_]*="[^"]*")*\})? (\S+)$')
+
+
+def parse_exposition(text):
+    """{metric family: type} and [(name, labels, value)], checking each line of the text format."""
+    assert text.endswith("\n")
+    types, samples = {}, []
+    for line in text.splitlines():
+        if line.startswith("# TYPE "):
+            family, kind = line[len("# TYPE "):].split(" ")
+            assert family not in types and kind in ("counter", "gauge", "histogram")
+            types[family] = kind
+        elif line.startswith("# HELP "):
+            continue
+        else:
+            match = SAMPLE.match(line)
+            assert match, line
+            name, labels, value = match.group(1), match.group(2) or "", float(match.group(4))
+            base = re.sub(r"_(bucket|sum|count)$", "", name)
+            family = base if types.get(base) == "histogram" else name
+            assert family in types, f"sample before its # TYPE: {line}"
+            samples.append((name, labels, value))
+    return types, samples
+
+
+def test_histogram_buckets_are_cumulative():
+    metrics = StageMetrics(buckets=(0.01, 0.1, 1.0))
+    for seconds in (0.005, 0.05, 0.05, 0.5, 3.0):
+        metrics.observe("parse", seconds)
+    metrics.observe("scan", 0.01)  # ✅ On a bound: counted in that bucket (le)
+    metrics.count("bytes_read", 100)
+    metrics.count("bytes_read", 23)
+
+    types, samples = parse_exposition(metrics.prometheus("telemetry", [("sse_subscribers", "gauge", "Streams.", 2)]))
+    assert types == {"telemetry_stage_seconds": "histogram", "telemetry_bytes_read_total": "counter",
+                     "telemetry_sse_subscribers": "gauge"}
+    values = {(name, labels): value for name, labels, value in samples}
+    assert [values[("telemetry_stage_seconds_bucket", f'{{stage="parse",le="{le}"}}')]
+            for le in ("0.01", "0.1", "1.0", "+Inf")] == [1, 3, 4, 5]
+    assert values[("telemetry_stage_seconds_count", '{stage="parse"}')] == 5
+    assert values[("telemetry_stage_seconds_sum", '{stage="parse"}')] == pytest.approx(3.605)
+    assert values[("telemetry_stage_seconds_bucket", '{stage="scan",le="0.01"}')] == 1
+    assert values[("telemetry_bytes_read_total", "")] == 123
+    assert values[("telemetry_sse_subscribers", "")] == 2
+
+
+def test_disabled_metrics_record_nothing():
+    metrics = StageMetrics(enabled=False)
+    with metrics.stage("parse"):
+        pass
+    metrics.count("bytes_read", 5)
+    assert metrics.snapshot() == {"stages": {}, "counters": {}}
+    types, samples = parse_exposition(metrics.prometheus("telemetry"))
+    assert types == {"telemetry_stage_seconds": "histogram"} and samples == []
+
+
+def test_metrics_endpoint(tmp_path, monkeypatch):
+    monkeypatch.setattr(read_latest_folder, "TELEMETRY_DATA_PATH", str(tmp_path))
+    client = read_latest_folder.app.test_client()
+    client.get("/api/telemetry")
+    response = client.get("/metrics")
+    assert response.status_code == 200 and response.mimetype == "text/plain"
+    types, samples = parse_exposition(response.get_data(as_text=True))
+    assert types["telemetry_results_cache_hits_total"] == "counter"
+    assert types["telemetry_results_cache_bytes"] == "gauge"
+    assert any(name == "telemetry_stage_seconds_count" and 'stage="request"' in labels for name, labels, _ in samples)
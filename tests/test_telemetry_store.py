@@ -0,0 +1,57 @@
+import json
+import os
+
+from conftest import write_run
+from run_index import run_name_time
+from telemetry_store import TelemetryStore, bucket_start
+
+
+def stored_results(store):
+    return store._connection().execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+
+def test_results_rewritten_in_place_are_reingested(tmp_path):
+    root = str(tmp_path / "telemetry_data")
+    path = write_run(root, "20240101000000", [{"ID": "T0", "Duration": "1 sec"}])
+    store = TelemetryStore(root, str(tmp_path / "store.db"))
+    assert store.ingest() == 1
+    assert store.ingest() == 0
+
+    with open(path, "r+", encoding="utf-8") as results_file:
+        results_file.truncate(0)
+        json.dump([{"ID": f"T{number}", "Duration": "1 sec"} for number in range(50)], results_file)
+
+    assert store.ingest() == 1
+    assert stored_results(store) == 50
+
+
+def test_runs_are_bucketed_by_the_time_in_their_name(tmp_path):
+    root = str(tmp_path / "telemetry_data")
+    write_run(root, "20240105093000", [{"ID": "T0", "Duration": "1 sec"}])
+    write_run(root, "not_a_timestamp", [{"ID": "T0", "Duration": "2 sec"}])
+    store = TelemetryStore(root, str(tmp_path / "store.db"))
+    store.ingest()
+
+    run_times = dict(store._connection().execute("SELECT folder, run_time FROM runs"))
+    assert run_times["20240105093000"] == run_name_time("20240105093000")
+    assert run_times["not_a_timestamp"] == os.stat(os.path.join(root, "not_a_timestamp", "results.json")).st_mtime
+    days = [point["t"] for point in store.test_series("T0", period="day")["points"]]
+    assert bucket_start(run_name_time("20240105093000"), "day") in days
+
+
+def test_older_databases_move_runs_to_the_time_in_their_name(tmp_path):
+    root = str(tmp_path / "telemetry_data")
+    write_run(root, "20240105093000", [{"ID": "T0", "Duration": "1 sec"}])
+    db_path = str(tmp_path / "store.db")
+    store = TelemetryStore(root, db_path)
+    store.ingest()
+    connection = store._connection()
+    connection.execute("UPDATE runs SET run_time = 1e9")  # ✅ As stored before: the folder's update time
+    connection.execute("UPDATE results SET run_time = 1e9")
+    connection.execute("PRAGMA user_version = 0")
+
+    store = TelemetryStore(root, db_path)
+    assert store.ingest() == 0
+    started = run_name_time("20240105093000")
+    assert [point["t"] for point in store.test_series("T0")["points"]] == [started]
+    assert [point["t"] for point in store.test_series("T0", period="day")["points"]] == [bucket_start(started, "day")]